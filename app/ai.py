@@ -1,27 +1,122 @@
 # backend/app/ai.py
 import os
 import io
-from typing import Optional
+import asyncio
+import threading
+from pathlib import Path
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import AsyncIterator, Optional
+
+from backend.app import ai_cache
+from backend.app.ai_batch import MicroBatcher, build_batch_prompt, parse_batch_answer
+from backend.app.resilience import CircuitBreaker, hedged, OPEN
 
 # --- Optional providers ---
 USE_WEB = bool(os.getenv("GOOGLE_API_KEY"))
 USE_VERTEX = bool(os.getenv("GOOGLE_CLOUD_PROJECT"))
 
-# Web API (google-generativeai)
-genai = None
-if USE_WEB:
-    import google.generativeai as genai
-    genai.configure(api_key=os.environ["GOOGLE_API_KEY"])
-
-# Vertex AI
-vertexai = None
-if USE_VERTEX:
-    import vertexai
-    from vertexai.generative_models import GenerativeModel, Part
-    vertexai.init(
-        project=os.getenv("GOOGLE_CLOUD_PROJECT"),
-        location=os.getenv("GOOGLE_CLOUD_REGION", "us-central1"),
+# Pre-create model clients during startup, before the app reports ready.
+AI_WARMUP = os.getenv("AI_WARMUP", "0") == "1"
+
+# The SDKs are slow to import, so they are loaded by init_providers()
+# (from the app's lifespan, or on first use) rather than at import time.
+genai = None      # google.generativeai, when USE_WEB
+vertexai = None   # when USE_VERTEX
+GenerativeModel = Part = None  # vertexai.generative_models
+_init_lock = threading.Lock()
+_initialized = False
+
+def init_providers():
+    """Import and configure the configured provider SDKs (idempotent, blocking)."""
+    global genai, vertexai, GenerativeModel, Part, _initialized
+    if _initialized:
+        return
+    with _init_lock:
+        if _initialized:
+            return
+        if USE_WEB:
+            import google.generativeai as _genai
+            _genai.configure(api_key=os.environ["GOOGLE_API_KEY"])
+            genai = _genai
+        if USE_VERTEX:
+            import vertexai as _vertexai
+            from vertexai.generative_models import GenerativeModel as _GenerativeModel, Part as _Part
+            _vertexai.init(
+                project=os.getenv("GOOGLE_CLOUD_PROJECT"),
+                location=os.getenv("GOOGLE_CLOUD_REGION", "us-central1"),
+            )
+            vertexai, GenerativeModel, Part = _vertexai, _GenerativeModel, _Part
+        _initialized = True
+
+def warm_up():
+    """init_providers() plus the text model client, so the first request doesn't pay for them."""
+    init_providers()
+    provider = _provider()
+    if provider is not None:
+        _get_model(provider, _text_model_name())
+
+# ------------- Gateway -------------
+
+# Provider SDK calls are blocking, so they run on a dedicated, bounded pool
+# instead of the event loop (or Starlette's shared threadpool).
+AI_MAX_WORKERS = int(os.getenv("AI_MAX_WORKERS", "16"))
+AI_MAX_CONCURRENCY = {
+    "vertex": int(os.getenv("AI_MAX_CONCURRENCY_VERTEX", "8")),
+    "web": int(os.getenv("AI_MAX_CONCURRENCY_WEB", "8")),
+}
+
+# Deadline for one provider round-trip, including time spent queued for a slot.
+AI_TIMEOUT_SECONDS = float(os.getenv("AI_TIMEOUT_SECONDS", "8"))
+# Streams must produce their first chunk within AI_TIMEOUT_SECONDS and finish within this.
+AI_STREAM_TIMEOUT_SECONDS = float(os.getenv("AI_STREAM_TIMEOUT_SECONDS", "60"))
+# Start a second, hedged attempt for idempotent text prompts after this long (0 = off).
+AI_HEDGE_DELAY_SECONDS = float(os.getenv("AI_HEDGE_DELAY_SECONDS", "0"))
+
+# Opt-in: coalesce concurrent small prompts of one helper into a single call.
+AI_MICROBATCH = os.getenv("AI_MICROBATCH", "0") == "1"
+AI_MICROBATCH_WINDOW_MS = float(os.getenv("AI_MICROBATCH_WINDOW_MS", "20"))
+AI_MICROBATCH_MAX = int(os.getenv("AI_MICROBATCH_MAX", "16"))
+
+_breakers = {
+    p: CircuitBreaker(
+        p,
+        failure_threshold=int(os.getenv("AI_BREAKER_FAILURES", "5")),
+        reset_timeout=float(os.getenv("AI_BREAKER_RESET_SECONDS", "30")),
     )
+    for p in ("vertex", "web")
+}
+
+_executor = ThreadPoolExecutor(max_workers=AI_MAX_WORKERS, thread_name_prefix="ai")
+_semaphores: dict[str, asyncio.Semaphore] = {}
+
+# One client per (provider, model name); GenerativeModel objects are reusable.
+_models: dict[tuple[str, str], object] = {}
+_models_lock = threading.Lock()
+
+def _provider() -> Optional[str]:
+    if USE_VERTEX:
+        return "vertex"
+    if USE_WEB:
+        return "web"
+    return None
+
+def _semaphore(provider: str) -> asyncio.Semaphore:
+    sem = _semaphores.get(provider)
+    if sem is None:
+        sem = _semaphores.setdefault(provider, asyncio.Semaphore(AI_MAX_CONCURRENCY[provider]))
+    return sem
+
+def _get_model(provider: str, name: str):
+    key = (provider, name)
+    model = _models.get(key)
+    if model is None:
+        init_providers()
+        with _models_lock:
+            model = _models.get(key)
+            if model is None:
+                model = GenerativeModel(name) if provider == "vertex" else genai.GenerativeModel(name)
+                _models[key] = model
+    return model
 
 # ------------- Provider Abstraction -------------
 
@@ -29,74 +124,316 @@ def _text_model_name() -> str:
     # same name on both providers
     return os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
 
-def _get_text_response(parts: list) -> str:
+def _build_parts(provider: str, parts: list) -> list:
+    """Normalize strings and image bytes into provider-specific inputs."""
+    out = []
+    for p in parts:
+        if isinstance(p, bytes):
+            if provider == "vertex":
+                out.append(Part.from_data(mime_type="image/jpeg", data=p))
+            else:
+                out.append({"mime_type": "image/jpeg", "data": p})
+        else:
+            out.append(str(p))
+    return out
+
+def _generate_sync(provider: str, parts: list, timeout: float) -> str:
+    model = _get_model(provider, _text_model_name())
+    if provider == "web":
+        # Let the SDK give up too, so a timed-out call doesn't keep its worker thread.
+        resp = model.generate_content(_build_parts(provider, parts), request_options={"timeout": timeout})
+    else:
+        resp = model.generate_content(_build_parts(provider, parts))
+    return (resp.text or "").strip()
+
+async def _submit(provider: str, fn, *args) -> Future:
+    """
+    Run fn on the AI executor under the provider's concurrency cap. The slot is
+    freed when the worker thread finishes, not when the caller stops waiting,
+    so timed-out or out-hedged calls still count until they actually return.
+    """
+    sem = _semaphore(provider)
+    await sem.acquire()
+    loop = asyncio.get_running_loop()
+
+    def release(_):
+        try:
+            loop.call_soon_threadsafe(sem.release)
+        except RuntimeError:
+            pass  # event loop already closed
+
+    try:
+        fut = _executor.submit(fn, *args)
+    except BaseException:
+        sem.release()
+        raise
+    fut.add_done_callback(release)
+    return fut
+
+async def _attempt(provider: str, parts: list, timeout: float) -> str:
+    return await asyncio.wrap_future(await _submit(provider, _generate_sync, provider, parts, timeout))
+
+async def _get_text_response(parts: list, timeout: Optional[float] = None, hedge: bool = False) -> str:
     """
     parts: list of strings and/or image bytes (we'll normalize per provider)
     Returns plain text, with safe fallback.
+
+    Every call is bounded by a deadline (AI_TIMEOUT_SECONDS by default) and
+    goes through the provider's circuit breaker: while it is open we return ""
+    immediately so callers drop straight to their fallback. `hedge=True` marks
+    the prompt as idempotent and allows a hedged second attempt (text only).
     """
+    provider = _provider()
+    if provider is None:
+        # No provider configured
+        return ""
+    breaker = _breakers[provider]
+    if not breaker.allow():
+        return ""
+    timeout = timeout or AI_TIMEOUT_SECONDS
+    settled = False
     try:
-        if USE_VERTEX:
-            # Build Vertex inputs
-            vparts = []
-            for p in parts:
-                if isinstance(p, bytes):
-                    vparts.append(Part.from_data(mime_type="image/jpeg", data=p))
-                else:
-                    vparts.append(str(p))
-            model = GenerativeModel(_text_model_name())
-            resp = model.generate_content(vparts)
-            return (resp.text or "").strip()
-        elif USE_WEB:
-            # Build Web API inputs
-            wparts = []
-            for p in parts:
-                if isinstance(p, bytes):
-                    wparts.append({"mime_type": "image/jpeg", "data": p})
-                else:
-                    wparts.append(str(p))
-            model = genai.GenerativeModel(_text_model_name())
-            resp = model.generate_content(wparts)
-            return (resp.text or "").strip()
-        else:
-            # No provider configured
-            return ""
-    except Exception as e:
+        async with asyncio.timeout(timeout):
+            text_only = not any(isinstance(p, bytes) for p in parts)
+            if hedge and text_only and AI_HEDGE_DELAY_SECONDS > 0:
+                text = await hedged(lambda: _attempt(provider, parts, timeout), AI_HEDGE_DELAY_SECONDS)
+            else:
+                text = await _attempt(provider, parts, timeout)
+    except Exception:
         # Never crash the app on AI failure
+        breaker.record_failure()
+        settled = True
         return ""
+    else:
+        breaker.record_success()
+        settled = True
+    finally:
+        if not settled:
+            # Cancelled (CancelledError is not an Exception): don't hold a half-open probe forever.
+            breaker.release_probe()
+    return text
+
+_STREAM_END = object()
+
+def _stream_sync(provider: str, parts: list, timeout: float, emit, stop: threading.Event):
+    model = _get_model(provider, _text_model_name())
+    kwargs = {"stream": True}
+    if provider == "web":
+        kwargs["request_options"] = {"timeout": timeout}
+    for chunk in model.generate_content(_build_parts(provider, parts), **kwargs):
+        if stop.is_set():
+            break
+        try:
+            text = chunk.text
+        except ValueError:
+            # Chunks without text parts (e.g. safety metadata) raise on .text
+            continue
+        if text:
+            emit(text)
+
+async def _stream_text_response(parts: list, timeout: Optional[float] = None) -> AsyncIterator[str]:
+    """
+    Streaming variant of _get_text_response: yields partial text as the
+    provider produces it. Same deadline, concurrency cap and circuit breaker,
+    but failures raise instead of returning "" because the caller may have
+    already sent part of the answer and has to decide how to recover.
+    """
+    provider = _provider()
+    if provider is None:
+        raise RuntimeError("no AI provider configured")
+    breaker = _breakers[provider]
+    if not breaker.allow():
+        raise RuntimeError(f"{provider} circuit open")
+    timeout = timeout or AI_TIMEOUT_SECONDS
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    stop = threading.Event()
+
+    def emit(item):
+        loop.call_soon_threadsafe(queue.put_nowait, item)
+
+    def run():
+        try:
+            _stream_sync(provider, parts, timeout, emit, stop)
+            emit(_STREAM_END)
+        except Exception as e:
+            emit(e)
+
+    settled = False
+    try:
+        await _submit(provider, run)
+        deadline = loop.time() + AI_STREAM_TIMEOUT_SECONDS
+        first = True
+        while True:
+            wait = timeout if first else deadline - loop.time()
+            item = await asyncio.wait_for(queue.get(), max(wait, 0))
+            if item is _STREAM_END:
+                break
+            if isinstance(item, Exception):
+                raise item
+            first = False
+            yield item
+    except GeneratorExit:
+        # Consumer went away (client disconnected); not the provider's fault.
+        raise
+    except Exception:
+        breaker.record_failure()
+        settled = True
+        raise
+    else:
+        breaker.record_success()
+        settled = True
+    finally:
+        stop.set()
+        if not settled:
+            # Disconnect or cancellation: no verdict, but free a half-open probe slot.
+            breaker.release_probe()
+
+async def stream_with_fallback(parts: list, fallback: str, cache_helper: Optional[str] = None) -> AsyncIterator[dict]:
+    """
+    Yields {"event": "delta", "text": ...} chunks, then {"event": "done"}.
+    If the provider is unavailable or the stream breaks mid-way, a
+    {"event": "fallback", "text": fallback} replaces whatever was sent.
+    With cache_helper set, cached answers are replayed in one chunk and a
+    completed stream is written back to the cache.
+    """
+    key = None
+    if cache_helper and ai_cache.AI_CACHE_ENABLED and _provider() is not None:
+        key = ai_cache.make_key(_text_model_name(), parts)
+        hit = await ai_cache.cache.get(cache_helper, key)
+        if hit is not None:
+            yield {"event": "delta", "text": hit}
+            yield {"event": "done"}
+            return
+    chunks = []
+    try:
+        async for text in _stream_text_response(parts):
+            chunks.append(text)
+            yield {"event": "delta", "text": text}
+    except Exception:
+        yield {"event": "fallback", "text": fallback}
+        yield {"event": "done"}
+        return
+    full = "".join(chunks).strip()
+    if not full:
+        yield {"event": "fallback", "text": fallback}
+    elif key is not None:
+        await ai_cache.cache.put(cache_helper, key, full)
+    yield {"event": "done"}
+
+def provider_configured() -> bool:
+    """False when no provider is set up, i.e. the helpers' fallbacks are the intended answers."""
+    return _provider() is not None
+
+def provider_healthy() -> bool:
+    """False while the active provider's circuit is open (helpers would only return fallbacks)."""
+    provider = _provider()
+    return provider is None or _breakers[provider].snapshot()["state"] != OPEN
+
+def provider_status() -> dict:
+    return {
+        "provider": _provider(),
+        "model": _text_model_name(),
+        "timeout_seconds": AI_TIMEOUT_SECONDS,
+        "hedge_delay_seconds": AI_HEDGE_DELAY_SECONDS,
+        "breakers": {p: b.snapshot() for p, b in _breakers.items()},
+        "microbatch": {name: b.stats for name, b in _batchers.items()} if AI_MICROBATCH else None,
+    }
+
+# ------------- Micro-batching -------------
+
+async def _run_prompt_batch(prompts: list[str]) -> list[Optional[str]]:
+    if len(prompts) == 1:
+        return [await _get_text_response(prompts, hedge=True)]
+    # A batch generates several answers, so give it a longer deadline.
+    text = await _get_text_response([build_batch_prompt(prompts)], timeout=AI_TIMEOUT_SECONDS * 2)
+    if not text:
+        # Provider failed outright: retrying item by item won't help, use fallbacks.
+        return [""] * len(prompts)
+    return parse_batch_answer(text, len(prompts))
+
+_batchers = {
+    name: MicroBatcher(name, _run_prompt_batch, window=AI_MICROBATCH_WINDOW_MS / 1000, max_batch=AI_MICROBATCH_MAX)
+    for name in ("generate_description", "recommend_price", "suggest_hashtags")
+}
+
+async def _batched_text_response(helper: str, parts: list) -> str:
+    batcher = _batchers.get(helper) if AI_MICROBATCH else None
+    if batcher is None or len(parts) != 1 or not isinstance(parts[0], str):
+        return await _get_text_response(parts, hedge=True)
+    text = await batcher.submit(parts[0])
+    if text is None:
+        # Per-item fallback when the batched answer couldn't be split.
+        text = await _get_text_response(parts, hedge=True)
+    return text
+
+async def _cached_text_response(helper: str, parts: list) -> str:
+    """
+    _get_text_response behind the content-addressed response cache.
+    Empty answers (provider down / no provider) are never cached so the
+    caller's fallback runs and the next call retries the provider.
+    """
+    if _provider() is None:
+        return ""
+    if not ai_cache.AI_CACHE_ENABLED:
+        return await _batched_text_response(helper, parts)
+    key = ai_cache.make_key(_text_model_name(), parts)
+    hit = await ai_cache.cache.get(helper, key)
+    if hit is not None:
+        return hit
+    text = await _batched_text_response(helper, parts)
+    if text:
+        await ai_cache.cache.put(helper, key, text)
+    return text
 
 # ------------- Public Helpers -------------
 
-def generate_description(title: str, details: Optional[str] = None) -> str:
-    prompt = f"""Write a short, engaging e-commerce description for a handmade artwork titled "{title}".
+def _description_prompt(title: str, details: Optional[str] = None) -> str:
+    return f"""Write a short, engaging e-commerce description for a handmade artwork titled "{title}".
 Keep it under 80 words, friendly, and descriptive. {('Details: '+details) if details else ''}"""
-    text = _get_text_response([prompt])
-    return text or f"{title}: a handcrafted original piece with care and detail."
 
-def recommend_price(title: str, description: str = "") -> float:
+def _description_fallback(title: str) -> str:
+    return f"{title}: a handcrafted original piece with care and detail."
+
+async def generate_description(title: str, details: Optional[str] = None, fallback: bool = True) -> Optional[str]:
+    """fallback=False returns None instead of the canned text when the provider gave nothing."""
+    text = await _cached_text_response("generate_description", [_description_prompt(title, details)])
+    return text or (_description_fallback(title) if fallback else None)
+
+def stream_description(title: str, details: Optional[str] = None) -> AsyncIterator[dict]:
+    return stream_with_fallback(
+        [_description_prompt(title, details)], _description_fallback(title), cache_helper="generate_description"
+    )
+
+async def recommend_price(title: str, description: str = "", fallback: bool = True) -> Optional[float]:
     prompt = f"""Suggest a fair INR price (number only) for the handmade artwork below.
 Title: {title}
 Description: {description}
 Only return a number."""
-    text = _get_text_response([prompt])
+    text = await _cached_text_response("recommend_price", [prompt])
     # Extract first number
     import re
     m = re.search(r"\d+(?:\.\d+)?", text or "")
-    return float(m.group(0)) if m else 999.0
+    if m:
+        return float(m.group(0))
+    return 999.0 if fallback else None
 
-def suggest_hashtags(description: str) -> list[str]:
+async def suggest_hashtags(description: str, fallback: bool = True) -> list[str]:
     prompt = f"""Suggest up to 5 concise hashtags (no # symbols, comma-separated)
 for this handmade artwork description: {description}"""
-    text = _get_text_response([prompt])
+    text = await _cached_text_response("suggest_hashtags", [prompt])
     tags = [t.strip().lstrip("#") for t in (text or "").split(",") if t.strip()]
-    return tags[:5] if tags else ["handmade","art","local","craft","unique"]
+    if tags:
+        return tags[:5]
+    return ["handmade","art","local","craft","unique"] if fallback else []
 
-def summarize_artwork(description: str) -> str:
+async def summarize_artwork(description: str) -> str:
     prompt = f"Summarize this artwork in one friendly sentence: {description}"
-    return _get_text_response([prompt]) or description[:120]
+    return await _cached_text_response("summarize_artwork", [prompt]) or description[:120]
 
-def suggest_trending_designs() -> list[str]:
+async def suggest_trending_designs() -> list[str]:
     prompt = "List 5 trending handmade design ideas, comma-separated."
-    text = _get_text_response([prompt])
+    text = await _cached_text_response("suggest_trending_designs", [prompt])
     ideas = [x.strip() for x in (text or "").split(",") if x.strip()]
     return ideas[:5] or [
         "Block-printed scarves", "Minimal line art", "Terracotta vases",
@@ -105,42 +442,69 @@ def suggest_trending_designs() -> list[str]:
 
 # --- Image quality & enhancement ---
 
-from PIL import Image, ImageFilter, ImageOps
+QUALITY_PROMPT = ("Analyze this product image quality (blur, lighting, composition). "
+                  "Return only APPROVE or REJECT_QUALITY_ISSUE.")
 
-def check_image_quality(image_bytes: bytes) -> str:
+async def _model_quality_verdict(image, report: dict) -> str:
+    if report["decision"] == "accept":
+        return "APPROVE"
+    if report["decision"] == "reject":
+        return "REJECT_QUALITY_ISSUE"
+    # Borderline only: ask the model, fall back to the local score.
+    image_bytes = image if isinstance(image, bytes) else await asyncio.to_thread(Path(image).read_bytes)
+    text = await _get_text_response([image_bytes, QUALITY_PROMPT])
+    if text in ("APPROVE", "REJECT_QUALITY_ISSUE"):
+        return text
+    return "APPROVE" if report["score"] >= 0.5 else "REJECT_QUALITY_ISSUE"
+
+async def check_image_quality(image) -> str:
     """
-    Ask the model to approve/reject quality. Falls back to heuristic if AI unavailable.
+    Local blur/exposure/resolution check first (image_quality.assess);
+    only borderline images are sent to the model. `image` is bytes or a
+    path (stored uploads are only read fully if the model is needed).
     Returns 'APPROVE' or 'REJECT_QUALITY_ISSUE'
     """
-    prompt = ("Analyze this product image quality (blur, lighting, composition). "
-              "Return only APPROVE or REJECT_QUALITY_ISSUE.")
-    text = _get_text_response([image_bytes, prompt])
-    if text in ("APPROVE", "REJECT_QUALITY_ISSUE"):
-        return text
+    from backend.app import image_quality  # Pillow/NumPy/OpenCV load on first use
 
-    # Heuristic fallback if AI failed
     try:
-        im = Image.open(io.BytesIO(image_bytes)).convert("L")
-        var = ImageStat.Stat(im).var  # lazy variance check
+        report = await asyncio.to_thread(image_quality.assess, image)
     except Exception:
-        var = 150.0
-    return "APPROVE" if var > 100 else "REJECT_QUALITY_ISSUE"
-
-def enhance_image(image_bytes: bytes) -> bytes:
-    """Basic enhancement: auto-contrast + sharpen."""
-    im = Image.open(io.BytesIO(image_bytes)).convert("RGB")
-    im = ImageOps.autocontrast(im)
-    im = im.filter(ImageFilter.UnsharpMask(radius=2, percent=150, threshold=3))
-    out = io.BytesIO()
-    im.save(out, format="JPEG", quality=92)
-    return out.getvalue()
+        return "REJECT_QUALITY_ISSUE"  # not a decodable image
+    return await _model_quality_verdict(image, report)
+
+async def check_image_quality_batch(images: list[bytes]) -> list[dict]:
+    """
+    Bulk variant: scores every image locally in parallel, then sends only the
+    borderline ones to the model concurrently. Returns one dict per image
+    with 'result' plus the local metrics.
+    """
+    from backend.app import image_quality
+
+    reports = await asyncio.to_thread(image_quality.assess_many, images)
+    verdicts = await asyncio.gather(*[
+        _model_quality_verdict(b, r) for b, r in zip(images, reports)
+    ])
+    return [{"result": v, **r} for v, r in zip(verdicts, reports)]
+
+async def enhance_image(image) -> bytes:
+    """Basic enhancement: auto-contrast + sharpen (in the image process pool). Bytes or path in, JPEG bytes out."""
+    from backend.app import image_pipeline
+
+    return await image_pipeline.run(image_pipeline.enhance_bytes, image)
 
 # --- Optional: simple text chat for chatbot ---
 
-def chat_reply(question: str, catalog_text: str) -> str:
-    prompt = f"""You are a friendly shopping assistant for a handmade local art marketplace.
+CHAT_FALLBACK = "You can explore our latest pieces in the catalog!"
+
+def _chat_prompt(question: str, catalog_text: str) -> str:
+    return f"""You are a friendly shopping assistant for a handmade local art marketplace.
 User question: {question}
 Catalog:
 {catalog_text}
 Recommend suitable items briefly."""
-    return _get_text_response([prompt]) or "You can explore our latest pieces in the catalog!"
+
+async def chat_reply(question: str, catalog_text: str) -> str:
+    return await _get_text_response([_chat_prompt(question, catalog_text)], hedge=True) or CHAT_FALLBACK
+
+def stream_chat_reply(question: str, catalog_text: str) -> AsyncIterator[dict]:
+    return stream_with_fallback([_chat_prompt(question, catalog_text)], CHAT_FALLBACK)
@@ -0,0 +1,107 @@
+# backend/app/ai_batch.py
+"""
+Opt-in micro-batching for small, independent AI prompts.
+
+Concurrent prompts for the same helper that arrive within a short window
+are sent to the provider as one numbered-task prompt and the JSON answer
+is split back to the callers. Items that can't be recovered from the
+batched answer resolve to None so the caller can retry them on their own.
+"""
+import re
+import json
+import asyncio
+from typing import Awaitable, Callable, Optional
+
+BATCH_HEADER = """You will receive {n} independent tasks. Answer each one on its own, exactly as instructed in that task.
+Return ONLY a JSON array of {n} strings, where element i is the complete answer to task i. No commentary."""
+
+def build_batch_prompt(prompts: list[str]) -> str:
+    tasks = "\n\n".join(f"### Task {i + 1}\n{p}" for i, p in enumerate(prompts))
+    return f"{BATCH_HEADER.format(n=len(prompts))}\n\n{tasks}"
+
+def parse_batch_answer(text: str, n: int) -> list[Optional[str]]:
+    """Split a batched answer; any shape mismatch yields None for every item."""
+    text = (text or "").strip()
+    text = re.sub(r"^```(?:json)?\s*|\s*```$", "", text)
+    start, end = text.find("["), text.rfind("]")
+    if start < 0 or end <= start:
+        return [None] * n
+    try:
+        items = json.loads(text[start:end + 1])
+    except ValueError:
+        return [None] * n
+    if not isinstance(items, list) or len(items) != n:
+        # Can't trust the alignment of answers to tasks.
+        return [None] * n
+    out = []
+    for item in items:
+        if isinstance(item, list):
+            item = ", ".join(str(x) for x in item)
+        if isinstance(item, (int, float)) and not isinstance(item, bool):
+            item = str(item)
+        out.append(item.strip() if isinstance(item, str) and item.strip() else None)
+    return out
+
+
+class MicroBatcher:
+    """
+    Collects submit() calls for up to `window` seconds (or `max_batch` items)
+    and hands them to `run_batch` in one go.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        run_batch: Callable[[list[str]], Awaitable[list[Optional[str]]]],
+        window: float = 0.02,
+        max_batch: int = 16,
+    ):
+        self.name = name
+        self.run_batch = run_batch
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: list[tuple[str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # The loop only keeps weak references to tasks; hold in-flight batches here.
+        self._tasks: set[asyncio.Task] = set()
+        self.stats = {"batches": 0, "items": 0, "unparsed_items": 0}
+
+    async def submit(self, prompt: str) -> Optional[str]:
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._pending.append((prompt, fut))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await fut
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list[tuple[str, asyncio.Future]]):
+        prompts = [p for p, _ in batch]
+        try:
+            try:
+                answers = await self.run_batch(prompts)
+            except Exception:
+                answers = [None] * len(batch)
+            self.stats["batches"] += 1
+            self.stats["items"] += len(batch)
+            for (_, fut), answer in zip(batch, answers):
+                if answer is None:
+                    self.stats["unparsed_items"] += 1
+                if not fut.done():
+                    fut.set_result(answer)
+        finally:
+            # Short answer list or cancellation: None sends the rest to their per-item fallback.
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_result(None)
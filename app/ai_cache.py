@@ -0,0 +1,184 @@
+# backend/app/ai_cache.py
+"""
+Content-addressed cache for AI text responses.
+
+Keys are a SHA-256 over the model name and every prompt part (strings and
+raw image bytes), so identical prompts hit regardless of which helper or
+request produced them. Two tiers:
+  - in-memory LRU with per-entry TTL (always on)
+  - optional SQLite tier that survives restarts (AI_CACHE_DB=path); every
+    AI_CACHE_PURGE_EVERY writes it drops expired rows and trims itself to
+    AI_CACHE_DB_MAX_ROWS (soonest-expiring first), so it can't grow forever
+"""
+import os
+import time
+import asyncio
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+AI_CACHE_ENABLED = os.getenv("AI_CACHE_ENABLED", "1") != "0"
+AI_CACHE_MAX_ENTRIES = int(os.getenv("AI_CACHE_MAX_ENTRIES", "2048"))
+AI_CACHE_DB = os.getenv("AI_CACHE_DB")  # e.g. ./ai_cache.db; unset = memory only
+AI_CACHE_DB_MAX_ROWS = int(os.getenv("AI_CACHE_DB_MAX_ROWS", "100000"))
+AI_CACHE_PURGE_EVERY = int(os.getenv("AI_CACHE_PURGE_EVERY", "256"))
+
+# Seconds each helper's answers stay fresh. Override with AI_CACHE_TTL_<HELPER>.
+DEFAULT_TTLS = {
+    "generate_description": 7 * 24 * 3600,
+    "recommend_price": 24 * 3600,
+    "suggest_hashtags": 7 * 24 * 3600,
+    "summarize_artwork": 7 * 24 * 3600,
+    "suggest_trending_designs": 3600,
+}
+
+def ttl_for(helper: str) -> int:
+    env = os.getenv(f"AI_CACHE_TTL_{helper.upper()}")
+    if env is not None:
+        return int(env)
+    return DEFAULT_TTLS.get(helper, 3600)
+
+def make_key(model: str, parts: list) -> str:
+    h = hashlib.sha256()
+    h.update(model.encode())
+    for p in parts:
+        # Tag + length prefix so ("ab", "c") never collides with ("a", "bc").
+        data = p if isinstance(p, bytes) else str(p).encode()
+        h.update(b"\x00b" if isinstance(p, bytes) else b"\x00s")
+        h.update(len(data).to_bytes(8, "big"))
+        h.update(data)
+    return h.hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int = AI_CACHE_MAX_ENTRIES, db_path: Optional[str] = AI_CACHE_DB):
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self._mem: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._puts_since_purge = 0
+        self.stats = {}
+
+    # ---- counters ----
+    def _count(self, helper: str, field: str):
+        with self._lock:
+            s = self.stats.setdefault(helper, {"hits": 0, "disk_hits": 0, "misses": 0})
+            s[field] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            per_helper = {k: dict(v) for k, v in self.stats.items()}
+            size = len(self._mem)
+        hits = sum(v["hits"] + v["disk_hits"] for v in per_helper.values())
+        misses = sum(v["misses"] for v in per_helper.values())
+        return {
+            "enabled": AI_CACHE_ENABLED,
+            "persistent": bool(self.db_path),
+            "entries": size,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "helpers": per_helper,
+            "ttls": {h: ttl_for(h) for h in DEFAULT_TTLS},
+        }
+
+    # ---- memory tier ----
+    def _mem_get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            item = self._mem.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires < now:
+                del self._mem[key]
+                return None
+            self._mem.move_to_end(key)
+            return value
+
+    def _mem_put(self, key: str, value: str, expires: float):
+        with self._lock:
+            self._mem[key] = (expires, value)
+            self._mem.move_to_end(key)
+            while len(self._mem) > self.max_entries:
+                self._mem.popitem(last=False)
+
+    # ---- SQLite tier ----
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=5)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS ai_cache ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS ix_ai_cache_expires_at ON ai_cache (expires_at)")
+            self._disk_purge(self._conn)  # whatever expired while the process was down
+        return self._conn
+
+    def _disk_get(self, key: str) -> Optional[tuple[float, str]]:
+        with self._db_lock:
+            row = self._db().execute(
+                "SELECT expires_at, value FROM ai_cache WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        return row
+
+    def _disk_put(self, key: str, value: str, expires: float):
+        with self._db_lock:
+            conn = self._db()
+            conn.execute(
+                "INSERT OR REPLACE INTO ai_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires),
+            )
+            self._puts_since_purge += 1
+            if self._puts_since_purge >= AI_CACHE_PURGE_EVERY:
+                self._disk_purge(conn)
+            conn.commit()
+
+    def _disk_purge(self, conn: sqlite3.Connection):
+        """Drop expired rows, then the soonest-expiring ones beyond the row cap (caller holds _db_lock)."""
+        self._puts_since_purge = 0
+        conn.execute("DELETE FROM ai_cache WHERE expires_at <= ?", (time.time(),))
+        excess = conn.execute("SELECT COUNT(*) FROM ai_cache").fetchone()[0] - AI_CACHE_DB_MAX_ROWS
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM ai_cache WHERE key IN (SELECT key FROM ai_cache ORDER BY expires_at LIMIT ?)",
+                (excess,),
+            )
+        conn.commit()
+
+    # ---- public API ----
+    async def get(self, helper: str, key: str) -> Optional[str]:
+        value = self._mem_get(key)
+        if value is not None:
+            self._count(helper, "hits")
+            return value
+        if self.db_path:
+            try:
+                row = await asyncio.to_thread(self._disk_get, key)
+            except sqlite3.Error:
+                row = None
+            if row:
+                expires, value = row
+                self._mem_put(key, value, expires)
+                self._count(helper, "disk_hits")
+                return value
+        self._count(helper, "misses")
+        return None
+
+    async def put(self, helper: str, key: str, value: str):
+        expires = time.time() + ttl_for(helper)
+        self._mem_put(key, value, expires)
+        if self.db_path:
+            try:
+                await asyncio.to_thread(self._disk_put, key, value, expires)
+            except sqlite3.Error:
+                pass
+
+
+cache = ResponseCache()
@@ -0,0 +1,102 @@
+# backend/app/ar_preview.py
+"""
+Local "try it on my wall" previews: composite an artwork onto a wall photo
+with Pillow. Placement is either a centered rectangle (scale, cx, cy) with
+an optional horizontal tilt, or four explicit corner points for full
+perspective. No AI involved.
+"""
+import io
+from typing import Optional, Sequence
+
+import numpy as np
+from PIL import Image, ImageFilter, ImageOps
+
+MAX_WALL_SIDE = 1600
+MIN_QUAD_AREA = 1e-4  # fraction of the wall; anything smaller renders nothing useful
+FORMATS = {"webp": ("WEBP", "image/webp", ".webp"), "png": ("PNG", "image/png", ".png")}
+
+
+def _open_rgb(src) -> Image.Image:
+    im = Image.open(io.BytesIO(src) if isinstance(src, (bytes, bytearray)) else src)
+    return ImageOps.exif_transpose(im).convert("RGB")
+
+
+def parse_quad(quad: Optional[str]) -> Optional[list[tuple[float, float]]]:
+    """'x1,y1,...,x4,y4' in 0..1 wall coordinates (TL, TR, BR, BL) -> points."""
+    if not quad:
+        return None
+    vals = [float(v) for v in quad.split(",")]
+    if len(vals) != 8 or not all(-0.5 <= v <= 1.5 for v in vals):
+        raise ValueError("quad must be 8 comma-separated numbers (TL, TR, BR, BL) in wall coordinates 0..1")
+    pts = [(vals[i], vals[i + 1]) for i in range(0, 8, 2)]
+    # Turn direction at each corner; a convex quad turns the same way at all four.
+    # Repeated or collinear points give 0, a self-intersecting (bow-tie) one mixed signs.
+    turns = []
+    for i in range(4):
+        (x0, y0), (x1, y1), (x2, y2) = pts[i], pts[(i + 1) % 4], pts[(i + 2) % 4]
+        turns.append((x1 - x0) * (y2 - y1) - (y1 - y0) * (x2 - x1))
+    area = abs(sum(x0 * y1 - x1 * y0 for (x0, y0), (x1, y1) in zip(pts, pts[1:] + pts[:1]))) / 2
+    if area < MIN_QUAD_AREA or not (all(t > 0 for t in turns) or all(t < 0 for t in turns)):
+        raise ValueError("quad must be a convex, non-degenerate quadrilateral (TL, TR, BR, BL)")
+    return pts
+
+
+def _perspective_coeffs(dst: Sequence[tuple[float, float]], src: Sequence[tuple[float, float]]) -> list[float]:
+    """Coefficients mapping output (dst) pixels back to input (src) pixels, as Image.transform expects."""
+    rows, rhs = [], []
+    for (x, y), (u, v) in zip(dst, src):
+        rows.append([x, y, 1, 0, 0, 0, -u * x, -u * y])
+        rows.append([0, 0, 0, x, y, 1, -v * x, -v * y])
+        rhs.extend([u, v])
+    return np.linalg.solve(np.array(rows, dtype=np.float64), np.array(rhs, dtype=np.float64)).tolist()
+
+
+def _default_quad(W: int, H: int, aspect: float, scale: float, cx: float, cy: float, tilt: float):
+    w = scale * W
+    h = w / aspect
+    x0, x1 = cx * W - w / 2, cx * W + w / 2
+    y0, y1 = cy * H - h / 2, cy * H + h / 2
+    # tilt > 0 turns the right edge away from the viewer (shorter), < 0 the left edge.
+    shrink_r = h * max(tilt, 0) / 2
+    shrink_l = h * max(-tilt, 0) / 2
+    return [(x0, y0 + shrink_l), (x1, y0 + shrink_r), (x1, y1 - shrink_r), (x0, y1 - shrink_l)]
+
+
+def render_preview(
+    wall_src,
+    art_src,
+    scale: float = 0.35,
+    cx: float = 0.5,
+    cy: float = 0.4,
+    tilt: float = 0.0,
+    quad: Optional[list[tuple[float, float]]] = None,
+    fmt: str = "webp",
+) -> bytes:
+    wall = _open_rgb(wall_src)
+    wall.thumbnail((MAX_WALL_SIDE, MAX_WALL_SIDE))
+    W, H = wall.size
+    art = _open_rgb(art_src)
+    art.thumbnail((MAX_WALL_SIDE, MAX_WALL_SIDE))
+    aw, ah = art.size
+
+    if quad:
+        dst = [(x * W, y * H) for x, y in quad]
+    else:
+        dst = _default_quad(W, H, aw / ah, scale, cx, cy, tilt)
+    coeffs = _perspective_coeffs(dst, [(0, 0), (aw, 0), (aw, ah), (0, ah)])
+
+    warped = art.transform((W, H), Image.PERSPECTIVE, coeffs, Image.BICUBIC)
+    mask = Image.new("L", (aw, ah), 255).transform((W, H), Image.PERSPECTIVE, coeffs, Image.BILINEAR)
+
+    # Soft drop shadow so the piece sits on the wall instead of floating.
+    offset = max(2, W // 200)
+    shadow = Image.new("L", (W, H), 0)
+    shadow.paste(mask, (offset, offset))
+    shadow = shadow.filter(ImageFilter.GaussianBlur(offset * 2)).point(lambda v: v * 0.45)
+    wall.paste(Image.new("RGB", (W, H), (0, 0, 0)), (0, 0), shadow)
+    wall.paste(warped, (0, 0), mask)
+
+    pil_fmt = FORMATS[fmt][0]
+    out = io.BytesIO()
+    wall.save(out, format=pil_fmt, **({"quality": 85, "method": 4} if pil_fmt == "WEBP" else {"optimize": True}))
+    return out.getvalue()
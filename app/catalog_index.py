@@ -0,0 +1,163 @@
+# backend/app/catalog_index.py
+"""
+In-process BM25 index over artwork title + description.
+
+Used by the chatbot so only the top-K relevant artworks go into the prompt
+instead of the whole catalog. The index is built from the DB in a thread
+at startup (refresh()) and kept current incrementally: create_artwork adds new rows directly, and
+sync() picks up rows inserted by other worker processes (id > last seen)
+and re-reads rows that were still waiting for AI enrichment when indexed.
+"""
+import os
+import re
+import math
+import heapq
+import threading
+from collections import Counter
+from typing import Optional
+
+from sqlalchemy import and_, or_
+
+import backend.app.models as models
+
+CHATBOT_TOP_K = int(os.getenv("CHATBOT_TOP_K", "12"))
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "i", "in", "is",
+    "it", "me", "my", "of", "on", "or", "show", "some", "that", "the", "this", "to",
+    "want", "with", "you", "any", "do", "have", "looking", "need", "please",
+}
+TITLE_WEIGHT = 2  # title terms count double
+PENDING = "pending_enrichment"
+# Hidden from the public catalog; owners still see their own pending/failed rows.
+UNLISTED = (PENDING, "failed", "rejected")
+OWNER_ONLY = (PENDING, "failed")
+
+
+def listed(viewer_id: Optional[int] = None):
+    """WHERE clause for artworks a viewer may see in listings, nearby and search."""
+    Artwork = models.Artwork
+    cond = or_(Artwork.enrichment_status.is_(None), Artwork.enrichment_status.notin_(UNLISTED))
+    if viewer_id is not None:
+        cond = or_(cond, and_(Artwork.owner_id == viewer_id, Artwork.enrichment_status.in_(OWNER_ONLY)))
+    return cond
+
+
+def tokenize(text: str) -> list[str]:
+    return [t for t in TOKEN_RE.findall((text or "").lower()) if t not in STOPWORDS]
+
+
+class CatalogIndex:
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: dict[str, dict[int, int]] = {}
+        self._doc_terms: dict[int, Counter] = {}
+        self._doc_len: dict[int, int] = {}
+        self._total_len = 0
+        self._max_id = 0
+        self._pending: set[int] = set()  # indexed before enrichment filled in the description
+        self._lock = threading.RLock()
+        self._sync_lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._doc_terms)
+
+    def add(self, artwork_id: int, title: str, description: str | None, pending: bool = False):
+        terms = Counter(tokenize(title) * TITLE_WEIGHT + tokenize(description))
+        with self._lock:
+            self.remove(artwork_id)
+            for term, tf in terms.items():
+                self._postings.setdefault(term, {})[artwork_id] = tf
+            self._doc_terms[artwork_id] = terms
+            self._doc_len[artwork_id] = sum(terms.values())
+            self._total_len += self._doc_len[artwork_id]
+            self._max_id = max(self._max_id, artwork_id)
+            if pending:
+                self._pending.add(artwork_id)
+            else:
+                self._pending.discard(artwork_id)
+
+    def remove(self, artwork_id: int):
+        with self._lock:
+            self._pending.discard(artwork_id)
+            terms = self._doc_terms.pop(artwork_id, None)
+            if terms is None:
+                return
+            for term in terms:
+                docs = self._postings.get(term)
+                if docs is not None:
+                    docs.pop(artwork_id, None)
+                    if not docs:
+                        del self._postings[term]
+            self._total_len -= self._doc_len.pop(artwork_id)
+
+    def sync(self, db, batch_size: int = 1000):
+        """
+        Index artworks added since the last sync and re-index ones enriched since.
+        The first call tokenizes the whole catalog, so run it off the event
+        loop (refresh()). Queries run without the index lock; concurrent syncs
+        are serialized on their own lock so they don't both build the index.
+        """
+        Artwork = models.Artwork
+        with self._sync_lock:
+            with self._lock:
+                pending, max_id = list(self._pending), self._max_id
+            if pending:
+                done = (
+                    db.query(Artwork.id, Artwork.title, Artwork.description, Artwork.enrichment_status)
+                    .filter(Artwork.id.in_(pending), Artwork.enrichment_status != PENDING)
+                    .all()
+                )
+                for art_id, title, description, status in done:
+                    if status == "rejected":
+                        self.remove(art_id)
+                    else:
+                        self.add(art_id, title, description)
+            rows = (
+                db.query(Artwork.id, Artwork.title, Artwork.description, Artwork.enrichment_status)
+                .filter(Artwork.id > max_id)
+                .order_by(Artwork.id)
+                .yield_per(batch_size)
+            )
+            for art_id, title, description, status in rows:
+                if status == "rejected":
+                    with self._lock:
+                        self._max_id = max(self._max_id, art_id)
+                    continue
+                self.add(art_id, title, description, pending=status == PENDING)
+
+    def search(self, query: str, k: int = CHATBOT_TOP_K) -> list[tuple[int, float]]:
+        """Return up to k (artwork_id, score) pairs, best first."""
+        terms = set(tokenize(query))
+        with self._lock:
+            n = len(self._doc_terms)
+            if not n or not terms:
+                return []
+            avg_len = self._total_len / n
+            scores: dict[int, float] = {}
+            for term in terms:
+                docs = self._postings.get(term)
+                if not docs:
+                    continue
+                idf = math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+                for doc_id, tf in docs.items():
+                    dl = self._doc_len[doc_id]
+                    norm = tf * (self.k1 + 1) / (tf + self.k1 * (1 - self.b + self.b * dl / avg_len))
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * norm
+        return heapq.nlargest(k, scores.items(), key=lambda kv: kv[1])
+
+
+index = CatalogIndex()
+
+
+def refresh():
+    """index.sync() on its own read session; call through asyncio.to_thread()."""
+    from backend.app.database import ReadSessionLocal
+
+    db = ReadSessionLocal()
+    try:
+        index.sync(db)
+    finally:
+        db.close()
@@ -1,13 +1,89 @@
-from sqlalchemy import create_engine
+import os
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./localartist.db"
+SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./localartist.db")
+# GET routes read through their own pool; point this at a replica if there is one
+READ_DATABASE_URL = os.getenv("READ_DATABASE_URL", SQLALCHEMY_DATABASE_URL)
+
+# "production": WAL + tuned pragmas (below). "default": SQLite's own settings.
+DB_PROFILE = os.getenv("DB_PROFILE", "production")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_MMAP_MB = int(os.getenv("SQLITE_MMAP_MB", "256"))
+SQLITE_CACHE_MB = int(os.getenv("SQLITE_CACHE_MB", "64"))  # per connection
+DB_READ_POOL_SIZE = int(os.getenv("DB_READ_POOL_SIZE", "8"))
+
+def _is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+def _sqlite_pragmas(read_only: bool):
+    """
+    Connect hook for SQLite. WAL lets readers run while a writer commits
+    (no more "database is locked" for GETs); synchronous=NORMAL is durable
+    across app crashes in WAL mode and skips an fsync per commit;
+    busy_timeout makes writers wait for the lock instead of failing.
+    """
+    def on_connect(dbapi_conn, _record):
+        cur = dbapi_conn.cursor()
+        cur.execute(f"PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS}")
+        if DB_PROFILE == "production":
+            if not read_only:
+                cur.execute("PRAGMA journal_mode = WAL")  # persistent; stored in the file
+            cur.execute("PRAGMA synchronous = NORMAL")
+            cur.execute(f"PRAGMA mmap_size = {SQLITE_MMAP_MB * 1024 * 1024}")
+            cur.execute(f"PRAGMA cache_size = -{SQLITE_CACHE_MB * 1024}")
+            cur.execute("PRAGMA temp_store = MEMORY")
+        if read_only:
+            cur.execute("PRAGMA query_only = ON")
+        cur.close()
+    return on_connect
+
+def _make_engine(url: str, read_only: bool = False, **kw):
+    if not _is_sqlite(url):
+        return create_engine(url, pool_pre_ping=True, **kw)
+    eng = create_engine(url, connect_args={"check_same_thread": False}, **kw)
+    event.listen(eng, "connect", _sqlite_pragmas(read_only))
+    return eng
+
+# Routers use the async engines below. The sync ones remain for code that
+# runs outside the event loop: migrations, the job worker, image pipeline
+# bookkeeping and AsyncSession.run_sync() helpers.
+engine = _make_engine(SQLALCHEMY_DATABASE_URL)
+read_engine = _make_engine(READ_DATABASE_URL, read_only=True, pool_size=DB_READ_POOL_SIZE)
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# ------------- Async (routers) -------------
+
+def _async_url(url: str) -> str:
+    """sqlite:///x.db -> sqlite+aiosqlite:///x.db (other URLs: set ASYNC_DATABASE_URL)."""
+    if url.startswith("sqlite:"):
+        return "sqlite+aiosqlite:" + url[len("sqlite:"):]
+    return url
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", _async_url(SQLALCHEMY_DATABASE_URL))
+ASYNC_READ_DATABASE_URL = os.getenv("ASYNC_READ_DATABASE_URL", _async_url(READ_DATABASE_URL))
+
+def _make_async_engine(url: str, read_only: bool = False, **kw):
+    if not _is_sqlite(url):
+        return create_async_engine(url, pool_pre_ping=True, **kw)
+    # Keep aiosqlite connections pooled (some SQLAlchemy versions default to
+    # NullPool, which would reopen the file and rerun the pragmas per request).
+    eng = create_async_engine(url, poolclass=AsyncAdaptedQueuePool, **kw)
+    event.listen(eng.sync_engine, "connect", _sqlite_pragmas(read_only))
+    return eng
+
+async_engine = _make_async_engine(ASYNC_DATABASE_URL)
+async_read_engine = _make_async_engine(ASYNC_READ_DATABASE_URL, read_only=True, pool_size=DB_READ_POOL_SIZE)
+
+# expire_on_commit=False: attributes stay loaded after commit, since lazy
+# loads can't happen implicitly on an AsyncSession.
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+AsyncReadSessionLocal = async_sessionmaker(async_read_engine, expire_on_commit=False, autoflush=False)
 
 Base = declarative_base()
 
@@ -17,3 +93,20 @@ def get_db():
         yield db
     finally:
         db.close()
+
+def get_read_db():
+    """Session on the read-only pool, for GET routes; writes raise an error."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_async_read_db():
+    """AsyncSession on the read-only pool, for GET routes; writes raise an error."""
+    async with AsyncReadSessionLocal() as db:
+        yield db
@@ -0,0 +1,100 @@
+# backend/app/disk_cache.py
+"""
+Size-bounded on-disk cache of rendered files.
+
+Entries live at <dir>/<key[:2]>/<key><ext>. A hit bumps the file's mtime,
+so eviction (oldest mtime first) is least-recently-used. The running total
+is kept in memory and re-scanned from disk on first use and on eviction,
+which keeps several worker processes sharing one directory roughly honest.
+"""
+import os
+import time
+import threading
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+
+class DiskCache:
+    def __init__(self, directory: str | Path, max_bytes: int, low_water: float = 0.9):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.low_water = low_water
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def path(self, key: str, ext: str) -> Path:
+        return self.directory / key[:2] / f"{key}{ext}"
+
+    def get(self, key: str, ext: str) -> Optional[Path]:
+        p = self.path(key, ext)
+        try:
+            now = time.time()
+            os.utime(p, (now, now))
+        except FileNotFoundError:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return p
+
+    def put(self, key: str, ext: str, data: bytes) -> Path:
+        p = self.path(key, ext)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so readers never see a partial file.
+        fd, tmp = tempfile.mkstemp(dir=p.parent, prefix=".tmp-")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, p)
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(data)
+            over = self._size > self.max_bytes
+        if over:
+            self.evict()
+        return p
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        out = []
+        if not self.directory.exists():
+            return out
+        for sub in self.directory.iterdir():
+            if not sub.is_dir():
+                continue
+            for f in sub.iterdir():
+                if f.name.startswith(".tmp-"):
+                    continue
+                try:
+                    st = f.stat()
+                except FileNotFoundError:
+                    continue
+                out.append((st.st_mtime, st.st_size, f))
+        return out
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """Delete least-recently-used entries until below low_water * max_bytes."""
+        with self._lock:
+            entries = sorted(self._entries(), key=lambda e: e[0])
+            total = sum(size for _, size, _ in entries)
+            target = self.max_bytes * self.low_water
+            for _, size, f in entries:
+                if total <= target:
+                    break
+                try:
+                    f.unlink()
+                except FileNotFoundError:
+                    pass
+                total -= size
+                self.stats["evictions"] += 1
+            self._size = total
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            return {"bytes": self._size, "max_bytes": self.max_bytes, **self.stats}
@@ -0,0 +1,148 @@
+# backend/app/enrichment.py
+"""
+"enrich_artwork" job: everything create_artwork used to wait for.
+
+  1) quality check; a reject is auto-enhanced and re-checked, and if it is
+     still too unclear the listing is marked rejected and the seller notified
+  2) responsive variants + AR features (image_pipeline.process_artwork)
+  3) description, price and hashtags for whatever the seller left empty
+
+Each step is saved as soon as it finishes, so a retry resumes where the
+previous attempt stopped instead of calling the model again.
+
+"artwork_features" job: AR features for artworks uploaded before they
+existed (enqueued by the artwork_feature_backfill migration).
+"""
+import asyncio
+from pathlib import Path
+from typing import Optional
+
+import backend.app.models as models
+import backend.app.ai as ai
+from backend.app import jobs, storage
+from backend.app.database import SessionLocal
+from backend.app.catalog_index import index as catalog_index, PENDING
+
+REJECTED_MESSAGE = (
+    'Your artwork "{title}" could not be published: the photo is too unclear even after '
+    "automatic enhancement. Please upload a clearer, well-lit photo."
+)
+
+
+def _load(artwork_id: int) -> Optional[dict]:
+    db = SessionLocal()
+    try:
+        art = db.query(models.Artwork).filter(models.Artwork.id == artwork_id).first()
+        if art is None:
+            return None
+        return {
+            "title": art.title, "description": art.description, "price": art.price,
+            "image_url": art.image_url, "image_status": art.image_status,
+            "quality_status": art.quality_status, "hashtags": art.hashtags,
+            "owner_id": art.owner_id,
+        }
+    finally:
+        db.close()
+
+
+def _save(artwork_id: int, notify_owner: Optional[str] = None, **fields):
+    db = SessionLocal()
+    try:
+        art = db.query(models.Artwork).filter(models.Artwork.id == artwork_id).first()
+        if art is None:
+            return
+        for k, v in fields.items():
+            setattr(art, k, v)
+        if notify_owner:
+            db.add(models.Notification(user_id=art.owner_id, message=notify_owner))
+        db.commit()
+    finally:
+        db.close()
+
+
+@jobs.handler("enrich_artwork")
+async def enrich_artwork(job: dict):
+    artwork_id = job["payload"]["artwork_id"]
+    final_attempt = job["attempts"] >= job["max_attempts"]
+    # While the provider's circuit is open every answer would be a canned
+    # fallback; wait for it to recover without spending an attempt.
+    if not ai.provider_healthy():
+        raise jobs.RetryLater("AI provider circuit open", count_attempt=False)
+    try:
+        await _enrich(artwork_id)
+    except Exception:
+        if final_attempt:
+            await asyncio.to_thread(_save, artwork_id, enrichment_status="failed")
+        raise
+
+
+async def _enrich(artwork_id: int):
+    # Imaging modules (Pillow, NumPy) load with the first job, not at API startup.
+    from backend.app import image_pipeline
+    from backend.app.image_features import local_image_path
+
+    art = await asyncio.to_thread(_load, artwork_id)
+    if art is None:
+        return
+    path = local_image_path(art["image_url"])
+    if path is None:
+        raise RuntimeError(f"image for artwork {artwork_id} is missing: {art['image_url']}")
+
+    # 1) Quality check; if bad -> auto-enhance -> recheck
+    if art["quality_status"] in (None, "pending"):
+        qc = await ai.check_image_quality(path)
+        if qc == "REJECT_QUALITY_ISSUE":
+            improved = await ai.enhance_image(path)
+            if await ai.check_image_quality(improved) == "REJECT_QUALITY_ISSUE":
+                await asyncio.to_thread(
+                    _save, artwork_id, notify_owner=REJECTED_MESSAGE.format(title=art["title"]),
+                    quality_status="rejected", enrichment_status="rejected", image_status=None,
+                )
+                catalog_index.remove(artwork_id)
+                return
+            stored = await asyncio.to_thread(storage.store_bytes, improved, "artwork", ".jpg")
+            path = stored.path
+            await asyncio.to_thread(_save, artwork_id, quality_status="enhanced", image_url=stored.url)
+        else:
+            await asyncio.to_thread(_save, artwork_id, quality_status="passed")
+    elif art["quality_status"] == "rejected":
+        return
+
+    # 2) Orientation, responsive variants and AR features in the image process pool
+    if art["image_status"] != "ready":
+        await image_pipeline.process_artwork(artwork_id, str(path), Path(path).stem)
+
+    # 3) AI description/price/hashtags for whatever the seller left empty.
+    # Canned fallbacks are only used when no provider is configured; a failing
+    # provider leaves the row pending and the job retries (then "failed").
+    fallback = not ai.provider_configured()
+    description = art["description"] or await ai.generate_description(art["title"], fallback=fallback)
+    if not description:
+        raise jobs.RetryLater("AI description unavailable")
+    price = art["price"] if art["price"] and art["price"] > 0 else await ai.recommend_price(art["title"], description, fallback=fallback)
+    hashtags = art["hashtags"] or await ai.suggest_hashtags(description, fallback=fallback)
+    if price is None or not hashtags:
+        # Keep the description so the retry doesn't ask for it again.
+        await asyncio.to_thread(_save, artwork_id, description=description)
+        raise jobs.RetryLater("AI price/hashtags unavailable")
+    await asyncio.to_thread(
+        _save, artwork_id,
+        description=description, price=price, hashtags=hashtags, enrichment_status="enriched",
+    )
+    catalog_index.add(artwork_id, art["title"], description)
+
+
+@jobs.handler("artwork_features")
+async def artwork_features(job: dict):
+    from backend.app import image_pipeline, image_features
+
+    artwork_id = job["payload"]["artwork_id"]
+    art = await asyncio.to_thread(_load, artwork_id)
+    if art is None or art["image_status"] == "ready":  # the image pipeline already stored them
+        return
+    path = image_features.local_image_path(art["image_url"])
+    if path is None:
+        return
+    vec = await image_pipeline.run(image_features.compute_features, str(path))
+    await asyncio.to_thread(_save, artwork_id, visual_features=image_features.encode(vec))
+    image_features.index.add(artwork_id, vec)
@@ -0,0 +1,137 @@
+# backend/app/geo.py
+"""
+Geohash prefilter + vectorized haversine for "near me" queries.
+
+Every user with a location gets users.geohash (indexed, set by a mapper
+event in models.py). A radius query picks the geohash precision whose
+cells are about the size of the radius, enumerates the few cells that
+cover the bounding box, and turns each into an index range
+(geohash >= cell AND geohash < cell + "{"). Only users in those cells are
+loaded; exact distances are then computed for them in one NumPy pass.
+Cost grows with the number of candidates, not with the users table.
+"""
+import os
+import math
+from typing import Optional
+
+from sqlalchemy import and_, or_, text
+
+GEOHASH_PRECISION = 9  # ~5 m cells; stored precision, queries use shorter prefixes
+MAX_COVER_CELLS = 16
+EARTH_RADIUS_KM = 6371.0088
+NEARBY_MAX_RADIUS_KM = float(os.getenv("NEARBY_MAX_RADIUS_KM", "200"))
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+RANGE_END = "{"  # sorts after every base32 character
+
+
+def encode(lat: float, lon: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_lo, lat_hi, lon_lo, lon_hi = -90.0, 90.0, -180.0, 180.0
+    out, bits, ch, even = [], 0, 0, True
+    while len(out) < precision:
+        if even:
+            mid = (lon_lo + lon_hi) / 2
+            ch = (ch << 1) | (lon >= mid)
+            lon_lo, lon_hi = (mid, lon_hi) if lon >= mid else (lon_lo, mid)
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            ch = (ch << 1) | (lat >= mid)
+            lat_lo, lat_hi = (mid, lat_hi) if lat >= mid else (lat_lo, mid)
+        even = not even
+        bits += 1
+        if bits == 5:
+            out.append(_BASE32[ch])
+            bits, ch = 0, 0
+    return "".join(out)
+
+
+def encode_optional(lat: Optional[float], lon: Optional[float]) -> Optional[str]:
+    if lat is None or lon is None:
+        return None
+    return encode(lat, lon)
+
+
+def cell_size(precision: int) -> tuple[float, float]:
+    """(height, width) of a geohash cell in degrees."""
+    bits = 5 * precision
+    lon_bits = (bits + 1) // 2
+    return 180.0 / 2 ** (bits - lon_bits), 360.0 / 2 ** lon_bits
+
+
+def bounding_box(lat: float, lon: float, radius_km: float) -> tuple[float, float, float, float]:
+    """(min_lat, max_lat, min_lon, max_lon) containing the circle; lon may cross ±180."""
+    dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = max(-90.0, lat - dlat), min(90.0, lat + dlat)
+    if min_lat <= -90.0 or max_lat >= 90.0:
+        return min_lat, max_lat, -180.0, 180.0
+    dlon = math.degrees(radius_km / (EARTH_RADIUS_KM * math.cos(math.radians(max(abs(min_lat), abs(max_lat))))))
+    if dlon >= 180.0:
+        return min_lat, max_lat, -180.0, 180.0
+    return min_lat, max_lat, lon - dlon, lon + dlon
+
+
+def cover(lat: float, lon: float, radius_km: float) -> list[str]:
+    """Geohash prefixes whose cells together cover the radius' bounding box."""
+    min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius_km)
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        h, w = cell_size(precision)
+        rows = math.floor(max_lat / h) - math.floor(min_lat / h) + 1
+        cols = math.floor(max_lon / w) - math.floor(min_lon / w) + 1
+        if rows * cols <= MAX_COVER_CELLS:
+            break
+    else:
+        return [""]  # whole world
+    cells = set()
+    for r in range(rows):
+        cell_lat = min(89.999999, (math.floor(min_lat / h) + r + 0.5) * h)
+        for c in range(cols):
+            cell_lon = (math.floor(min_lon / w) + c + 0.5) * w
+            cell_lon = (cell_lon + 180.0) % 360.0 - 180.0  # wrap across the antimeridian
+            cells.add(encode(cell_lat, cell_lon, precision))
+    return sorted(cells)
+
+
+def haversine_km(lat: float, lon: float, lats: "np.ndarray", lons: "np.ndarray") -> "np.ndarray":
+    """Great-circle distances from (lat, lon) to every (lats[i], lons[i])."""
+    import numpy as np  # loaded on first radius query; models imports this module at startup
+
+    lat1, lon1 = math.radians(lat), math.radians(lon)
+    lat2, lon2 = np.radians(lats), np.radians(lons)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def nearby_users(db, lat: float, lon: float, radius_km: float, query=None) -> list[tuple[int, float]]:
+    """
+    (user_id, distance_km) for users within radius_km, nearest first.
+    `query` narrows the candidates (e.g. sellers only); defaults to all users.
+    """
+    import numpy as np
+    import backend.app.models as models  # models imports this module for its mapper events
+
+    User = models.User
+    q = query if query is not None else db.query(User.id, User.latitude, User.longitude)
+    ranges = [and_(User.geohash >= cell, User.geohash < cell + RANGE_END) for cell in cover(lat, lon, radius_km)]
+    rows = q.filter(or_(*ranges), User.latitude.isnot(None), User.longitude.isnot(None)).all()
+    if not rows:
+        return []
+    ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+    lats = np.fromiter((r[1] for r in rows), dtype=np.float64, count=len(rows))
+    lons = np.fromiter((r[2] for r in rows), dtype=np.float64, count=len(rows))
+    dist = haversine_km(lat, lon, lats, lons)
+    keep = np.flatnonzero(dist <= radius_km)
+    keep = keep[np.argsort(dist[keep], kind="stable")]
+    return [(int(ids[i]), float(dist[i])) for i in keep]
+
+
+def backfill(conn):
+    """Fill users.geohash for rows that have coordinates but no hash yet."""
+    rows = conn.execute(text(
+        "SELECT id, latitude, longitude FROM users "
+        "WHERE geohash IS NULL AND latitude IS NOT NULL AND longitude IS NOT NULL"
+    )).fetchall()
+    if rows:
+        conn.execute(
+            text("UPDATE users SET geohash = :g WHERE id = :id"),
+            [{"id": r[0], "g": encode(r[1], r[2])} for r in rows],
+        )
@@ -0,0 +1,196 @@
+# backend/app/image_features.py
+"""
+Compact visual features for artworks and wall photos (Pillow + NumPy).
+
+Each image becomes one float32 vector:
+  [0:64)   RGB color histogram, 4x4x4 bins, sums to 1
+  [64:79)  5 dominant palette colors, RGB in 0..1
+  [79:84)  share of the image covered by each palette color
+  [84]     mean brightness (luma, 0..1)
+  [85]     mean saturation (0..1)
+The vector is stored on Artwork.visual_features and loaded into VisualIndex,
+so a wall photo is ranked against the whole catalog with a few array ops.
+"""
+import io
+import threading
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+from sqlalchemy import or_
+
+import backend.app.models as models
+
+HIST_BINS = 4
+PALETTE_SIZE = 5
+FEATURE_DIM = HIST_BINS ** 3 + PALETTE_SIZE * 4 + 2
+_HIST = slice(0, 64)
+_PALETTE = slice(64, 79)
+_WEIGHTS = slice(79, 84)
+_BRIGHTNESS = 84
+_SATURATION = 85
+
+# Relative weight of each similarity term in the final score.
+W_HIST, W_PALETTE, W_BRIGHTNESS = 0.55, 0.30, 0.15
+
+# Enrichment states after which no job will ever fill in visual_features.
+NEVER_COMPUTED = ("rejected", "failed")
+
+
+def _open(src) -> Image.Image:
+    im = Image.open(io.BytesIO(src) if isinstance(src, (bytes, bytearray)) else src)
+    # JPEG can decode at reduced scale directly, which is most of the cost.
+    im.draft("RGB", (192, 192))
+    im = im.convert("RGB")
+    im.thumbnail((96, 96))
+    return im
+
+
+def compute_features(src) -> np.ndarray:
+    """Feature vector for image bytes or a path."""
+    im = _open(src)
+    px = np.asarray(im, dtype=np.uint8).reshape(-1, 3)
+
+    q = (px // (256 // HIST_BINS)).astype(np.int32)
+    bins = q[:, 0] * HIST_BINS * HIST_BINS + q[:, 1] * HIST_BINS + q[:, 2]
+    hist = np.bincount(bins, minlength=HIST_BINS ** 3).astype(np.float32)
+    hist /= hist.sum()
+
+    pal_im = im.quantize(colors=PALETTE_SIZE, method=Image.Quantize.MEDIANCUT)
+    counts = np.bincount(np.asarray(pal_im).ravel(), minlength=PALETTE_SIZE)[:PALETTE_SIZE]
+    palette = np.array(pal_im.getpalette()[:PALETTE_SIZE * 3], dtype=np.float32).reshape(-1, 3)
+    if len(palette) < PALETTE_SIZE:
+        palette = np.vstack([palette, np.repeat(palette[-1:], PALETTE_SIZE - len(palette), axis=0)])
+    weights = counts.astype(np.float32) / max(counts.sum(), 1)
+
+    f = px.astype(np.float32) / 255.0
+    luma = f @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    mx, mn = f.max(axis=1), f.min(axis=1)
+    sat = np.where(mx > 0, (mx - mn) / np.maximum(mx, 1e-6), 0.0)
+
+    vec = np.empty(FEATURE_DIM, dtype=np.float32)
+    vec[_HIST] = hist
+    vec[_PALETTE] = (palette / 255.0).ravel()
+    vec[_WEIGHTS] = weights
+    vec[_BRIGHTNESS] = luma.mean()
+    vec[_SATURATION] = sat.mean()
+    return vec
+
+
+def encode(vec: np.ndarray) -> bytes:
+    return np.asarray(vec, dtype=np.float32).tobytes()
+
+
+def decode(blob: bytes) -> np.ndarray:
+    return np.frombuffer(blob, dtype=np.float32)
+
+
+def local_image_path(image_url: str | None) -> Path | None:
+    """Map a /static/... URL to the file on disk, if it is one of ours."""
+    if not image_url or not image_url.startswith("/static/"):
+        return None
+    path = Path(image_url.lstrip("/"))
+    return path if path.is_file() else None
+
+
+def score(wall: np.ndarray, feats: np.ndarray) -> np.ndarray:
+    """Similarity of one wall vector against an (N, FEATURE_DIM) matrix, 0..1."""
+    hist_sim = np.minimum(feats[:, _HIST], wall[_HIST]).sum(axis=1)
+
+    wall_pal = wall[_PALETTE].reshape(PALETTE_SIZE, 3)
+    art_pal = feats[:, _PALETTE].reshape(-1, PALETTE_SIZE, 3)
+    # For each wall color, distance to the closest color in each artwork's palette.
+    # One wall slot at a time keeps the temporary at (N, k, 3) instead of (N, k, k, 3).
+    pal_dist = np.zeros(len(feats), dtype=np.float32)
+    for color, weight in zip(wall_pal, wall[_WEIGHTS]):
+        pal_dist += weight * np.linalg.norm(art_pal - color, axis=-1).min(axis=1)
+    pal_sim = 1.0 - pal_dist / np.sqrt(3.0)
+
+    bright_sim = 1.0 - np.abs(feats[:, _BRIGHTNESS] - wall[_BRIGHTNESS])
+    return W_HIST * hist_sim + W_PALETTE * pal_sim + W_BRIGHTNESS * bright_sim
+
+
+class VisualIndex:
+    """Array-backed index of artwork feature vectors (grows by doubling)."""
+
+    def __init__(self, capacity: int = 256):
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._feats = np.zeros((capacity, FEATURE_DIM), dtype=np.float32)
+        self._pos: dict[int, int] = {}
+        self._n = 0
+        self._max_id = 0
+        self._missing: set[int] = set()  # local images whose features aren't computed yet
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return self._n
+
+    def add(self, artwork_id: int, vec: np.ndarray):
+        with self._lock:
+            i = self._pos.get(artwork_id)
+            if i is None:
+                if self._n == len(self._ids):
+                    self._ids = np.resize(self._ids, self._n * 2)
+                    self._feats = np.resize(self._feats, (self._n * 2, FEATURE_DIM))
+                i = self._n
+                self._n += 1
+                self._pos[artwork_id] = i
+                self._ids[i] = artwork_id
+            self._feats[i] = vec
+            self._max_id = max(self._max_id, artwork_id)
+
+    def remove(self, artwork_id: int):
+        with self._lock:
+            self._missing.discard(artwork_id)
+            i = self._pos.pop(artwork_id, None)
+            if i is None:
+                return
+            last = self._n - 1
+            if i != last:
+                # Move the last row into the hole to keep the arrays dense.
+                self._ids[i] = self._ids[last]
+                self._feats[i] = self._feats[last]
+                self._pos[int(self._ids[i])] = i
+            self._n = last
+
+    def sync(self, db):
+        """
+        Load artworks added since the last sync, plus earlier rows that had no
+        features yet and have them now (image pipeline or the artwork_features
+        backfill job). Only reads rows; nothing is computed here.
+        """
+        A = models.Artwork
+        with self._lock:
+            cond = A.id > self._max_id
+            if self._missing:
+                cond = or_(cond, A.id.in_(self._missing))
+        # Query outside the lock: on an AsyncSession.run_sync the I/O yields to the event loop.
+        rows = (
+            db.query(A.id, A.visual_features, A.image_url, A.enrichment_status)
+            .filter(cond).order_by(A.id).all()
+        )
+        with self._lock:
+            for art_id, blob, image_url, status in rows:
+                self._max_id = max(self._max_id, art_id)
+                if blob is not None:
+                    self._missing.discard(art_id)
+                    self.add(art_id, decode(blob))
+                elif status in NEVER_COMPUTED or not (image_url and image_url.startswith("/static/")):
+                    self._missing.discard(art_id)
+                else:
+                    self._missing.add(art_id)
+
+    def rank(self, wall: np.ndarray, k: int = 8) -> list[tuple[int, float]]:
+        """Top-k (artwork_id, score) for a wall feature vector."""
+        with self._lock:
+            if not self._n:
+                return []
+            ids = self._ids[:self._n].copy()
+            scores = score(wall, self._feats[:self._n])
+        k = min(k, len(ids))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(ids[i]), float(scores[i])) for i in top]
+
+
+index = VisualIndex()
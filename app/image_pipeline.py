@@ -0,0 +1,137 @@
+# backend/app/image_pipeline.py
+"""
+CPU-heavy Pillow work for uploaded artwork images, run in a process pool
+so it never competes with request handling (GIL or event loop).
+
+process_image(): decode -> EXIF orient -> optional enhance -> responsive
+WebP + JPEG variants (thumb / card / full) and the AR visual features.
+process_artwork() is scheduled after create_artwork responds and records
+the result on the Artwork row (image_variants, image_status).
+"""
+import io
+import os
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from PIL import Image, ImageFilter, ImageOps
+
+VARIANT_DIR = Path("static/artworks/variants")
+VARIANTS = {"thumb": 320, "card": 800, "full": 1600}  # longest side in px
+FORMATS = (
+    ("webp", "WEBP", {"quality": 80, "method": 4}),
+    ("jpeg", "JPEG", {"quality": 85, "optimize": True, "progressive": True}),
+)
+
+IMAGE_PIPELINE_WORKERS = int(os.getenv("IMAGE_PIPELINE_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+_pool: ProcessPoolExecutor | None = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn, not fork: the parent has live threads (uvicorn, AI pool, DB).
+        _pool = ProcessPoolExecutor(
+            max_workers=IMAGE_PIPELINE_WORKERS, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _pool
+
+
+async def run(fn, *args):
+    """Run a picklable, module-level function in the image process pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_pool(), fn, *args)
+
+
+# ------------- Worker-side functions (must stay module-level) -------------
+
+def _enhance(im: Image.Image) -> Image.Image:
+    im = ImageOps.autocontrast(im)
+    return im.filter(ImageFilter.UnsharpMask(radius=2, percent=150, threshold=3))
+
+
+def enhance_bytes(image) -> bytes:
+    """Basic enhancement: auto-contrast + sharpen, re-encoded as JPEG (bytes or path in)."""
+    src = io.BytesIO(image) if isinstance(image, (bytes, bytearray)) else image
+    im = ImageOps.exif_transpose(Image.open(src)).convert("RGB")
+    out = io.BytesIO()
+    _enhance(im).save(out, format="JPEG", quality=92)
+    return out.getvalue()
+
+
+def process_image(src_path: str, stem: str, enhance: bool = False) -> dict:
+    from backend.app.image_features import compute_features, encode
+
+    im = ImageOps.exif_transpose(Image.open(src_path)).convert("RGB")
+    if enhance:
+        im = _enhance(im)
+    VARIANT_DIR.mkdir(parents=True, exist_ok=True)
+
+    variants = {}
+    for name, side in VARIANTS.items():
+        v = im.copy()
+        v.thumbnail((side, side), Image.LANCZOS)
+        entry = {"width": v.width, "height": v.height}
+        for ext, fmt, opts in FORMATS:
+            dest = VARIANT_DIR / f"{stem}_{name}.{ext}"
+            v.save(dest, fmt, **opts)
+            entry[ext] = f"/{dest.as_posix()}"
+        variants[name] = entry
+        if name == "thumb":
+            features = encode(compute_features(dest.with_suffix(".jpeg")))
+    return {"variants": variants, "features": features}
+
+
+RESIZE_FORMATS = {
+    "avif": ("AVIF", {"quality": 60}),
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", {"quality": 85, "optimize": True, "progressive": True}),
+}
+
+
+def resize_image(src_path: str, width: int, height: int, fmt: str) -> bytes:
+    """Fit inside width x height (0 = unconstrained), never upscaling, and re-encode."""
+    im = ImageOps.exif_transpose(Image.open(src_path))
+    im = im.convert("RGBA" if fmt != "jpeg" and im.mode in ("RGBA", "LA", "P") else "RGB")
+    im.thumbnail((width or im.width, height or im.height), Image.LANCZOS)
+    pil_fmt, opts = RESIZE_FORMATS[fmt]
+    out = io.BytesIO()
+    im.save(out, pil_fmt, **opts)
+    return out.getvalue()
+
+
+# ------------- Parent-side orchestration -------------
+
+def _record(artwork_id: int, result: dict | None):
+    from backend.app.database import SessionLocal
+    import backend.app.models as models
+
+    db = SessionLocal()
+    try:
+        art = db.query(models.Artwork).filter(models.Artwork.id == artwork_id).first()
+        if art is None:
+            return
+        if result is None:
+            art.image_status = "failed"
+        else:
+            art.image_variants = result["variants"]
+            art.visual_features = result["features"]
+            art.image_status = "ready"
+        db.commit()
+    finally:
+        db.close()
+
+
+async def process_artwork(artwork_id: int, src_path: str, stem: str, enhance: bool = False):
+    """Background task: build variants + features, then update the row and AR index."""
+    from backend.app import image_features
+
+    try:
+        result = await run(process_image, src_path, stem, enhance)
+    except Exception:
+        result = None
+    await asyncio.to_thread(_record, artwork_id, result)
+    if result is not None:
+        image_features.index.add(artwork_id, image_features.decode(result["features"]))
@@ -0,0 +1,116 @@
+# backend/app/image_quality.py
+"""
+Fast local image-quality scoring (blur, exposure, resolution).
+
+assess() decides clear cases in a few milliseconds:
+  - "accept":     sharp, well exposed, big enough
+  - "reject":     obviously blurry, dark/blown out or tiny
+  - "borderline": everything else; ai.check_image_quality asks the model
+OpenCV is used for the Laplacian when it imports (it needs system GL libs
+on slim images); otherwise the same 3x3 kernel is applied with NumPy.
+"""
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PIL import Image, ImageOps
+
+try:
+    import cv2
+except ImportError:  # opencv missing or its shared libs unavailable
+    cv2 = None
+
+ANALYSIS_SIDE = 512  # blur is measured at a fixed scale so thresholds mean the same for every upload
+
+BLUR_REJECT = float(os.getenv("QUALITY_BLUR_REJECT", "25"))
+BLUR_ACCEPT = float(os.getenv("QUALITY_BLUR_ACCEPT", "120"))
+MIN_SIDE_REJECT = int(os.getenv("QUALITY_MIN_SIDE_REJECT", "200"))
+MIN_SIDE_ACCEPT = int(os.getenv("QUALITY_MIN_SIDE_ACCEPT", "600"))
+CLIP_REJECT = 0.5    # fraction of pixels crushed to black / blown to white
+CLIP_ACCEPT = 0.15
+MEAN_REJECT = (20, 240)
+MEAN_ACCEPT = (45, 210)
+
+
+def _gray(src) -> tuple[np.ndarray, tuple[int, int]]:
+    im = Image.open(io.BytesIO(src) if isinstance(src, (bytes, bytearray)) else src)
+    size = im.size
+    im.draft("L", (ANALYSIS_SIDE * 2, ANALYSIS_SIDE * 2))
+    im = ImageOps.exif_transpose(im).convert("L")
+    im.thumbnail((ANALYSIS_SIDE, ANALYSIS_SIDE))
+    return np.asarray(im, dtype=np.float32), size
+
+
+def laplacian_variance(gray: np.ndarray) -> float:
+    if cv2 is not None:
+        return float(cv2.Laplacian(gray, cv2.CV_32F).var())
+    lap = (
+        gray[:-2, 1:-1] + gray[2:, 1:-1] + gray[1:-1, :-2] + gray[1:-1, 2:]
+        - 4.0 * gray[1:-1, 1:-1]
+    )
+    return float(lap.var())
+
+
+def assess(src) -> dict:
+    """Quality metrics and a decision for image bytes or a path."""
+    gray, (width, height) = _gray(src)
+    blur = laplacian_variance(gray)
+    hist = np.bincount(gray.astype(np.uint8).ravel(), minlength=256) / gray.size
+    mean = float(gray.mean())
+    dark = float(hist[:10].sum())
+    bright = float(hist[246:].sum())
+    short_side = min(width, height)
+
+    reasons = []
+    if short_side < MIN_SIDE_REJECT:
+        reasons.append("resolution too low")
+    if blur < BLUR_REJECT:
+        reasons.append("blurry")
+    if mean < MEAN_REJECT[0] or dark > CLIP_REJECT:
+        reasons.append("too dark")
+    if mean > MEAN_REJECT[1] or bright > CLIP_REJECT:
+        reasons.append("overexposed")
+
+    if reasons:
+        decision = "reject"
+    elif (
+        short_side >= MIN_SIDE_ACCEPT
+        and blur >= BLUR_ACCEPT
+        and MEAN_ACCEPT[0] <= mean <= MEAN_ACCEPT[1]
+        and max(dark, bright) <= CLIP_ACCEPT
+    ):
+        decision = "accept"
+    else:
+        decision = "borderline"
+
+    # 0..1 summary used to settle borderline images when the model can't.
+    sharp = np.clip((blur - BLUR_REJECT) / (BLUR_ACCEPT - BLUR_REJECT), 0, 1)
+    res = np.clip((short_side - MIN_SIDE_REJECT) / (MIN_SIDE_ACCEPT - MIN_SIDE_REJECT), 0, 1)
+    expo = 1.0 - np.clip(max(dark, bright) / CLIP_REJECT, 0, 1)
+    score = float(0.5 * sharp + 0.25 * res + 0.25 * expo)
+
+    return {
+        "decision": decision,
+        "score": round(score, 3),
+        "blur_variance": round(blur, 1),
+        "mean_brightness": round(mean, 1),
+        "dark_fraction": round(dark, 3),
+        "bright_fraction": round(bright, 3),
+        "width": width,
+        "height": height,
+        "reasons": reasons,
+    }
+
+
+_pool = ThreadPoolExecutor(max_workers=int(os.getenv("QUALITY_WORKERS", "4")), thread_name_prefix="quality")
+
+
+def assess_many(srcs: list) -> list[dict]:
+    """assess() over many images in parallel (decoding and NumPy release the GIL)."""
+    def safe(src):
+        try:
+            return assess(src)
+        except Exception:
+            return {"decision": "reject", "score": 0.0, "reasons": ["unreadable image"]}
+    return list(_pool.map(safe, srcs))
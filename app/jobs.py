@@ -0,0 +1,200 @@
+# backend/app/jobs.py
+"""
+Durable background jobs stored in the SQLite `jobs` table.
+
+enqueue() adds a row in the caller's session, so the job commits (or rolls
+back) together with the data it refers to. Workers lease one job at a time
+with a single UPDATE ... RETURNING, which SQLite serializes, so two workers
+never get the same job. A lease expires after JOB_LEASE_SECONDS; a job whose
+worker died is picked up again. Failures are retried with exponential
+backoff (plus jitter) until max_attempts, then the job is marked "dead".
+
+Handlers are registered with @handler("kind") and receive the leased job
+as a dict (id, kind, payload, attempts, max_attempts). Workers run either
+inside the API process (JOB_WORKERS, default 1) or standalone with
+`python -m backend.worker`.
+"""
+import os
+import json
+import time
+import uuid
+import random
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+
+from sqlalchemy import text, func
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import backend.app.models as models
+from backend.app.database import engine
+
+log = logging.getLogger(__name__)
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "1"))  # in-process workers; 0 when running backend.worker
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "300"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+JOB_BACKOFF_BASE_SECONDS = float(os.getenv("JOB_BACKOFF_BASE_SECONDS", "5"))
+JOB_BACKOFF_MAX_SECONDS = float(os.getenv("JOB_BACKOFF_MAX_SECONDS", "600"))
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "1"))
+
+HANDLERS: dict[str, Callable[[dict], Awaitable[None]]] = {}
+
+_wake: Optional[asyncio.Event] = None
+
+
+class RetryLater(Exception):
+    """
+    Raise from a handler to retry with backoff without logging a traceback.
+    count_attempt=False gives the attempt back (e.g. while a dependency's
+    circuit is open), so waiting never uses up max_attempts.
+    """
+
+    def __init__(self, message: str = "", count_attempt: bool = True):
+        super().__init__(message)
+        self.count_attempt = count_attempt
+
+
+def handler(kind: str):
+    def register(fn):
+        HANDLERS[kind] = fn
+        return fn
+    return register
+
+
+# ------------- Producer side -------------
+
+def enqueue(db: AsyncSession, kind: str, payload: dict, delay: float = 0.0, max_attempts: int = JOB_MAX_ATTEMPTS) -> models.Job:
+    """Add a job to `db`; it becomes visible to workers when the caller commits."""
+    now = time.time()
+    job = models.Job(
+        kind=kind, payload=payload, status="queued", attempts=0,
+        max_attempts=max_attempts, run_at=now + delay, created_at=now,
+    )
+    db.add(job)
+    return job
+
+
+def notify():
+    """Wake in-process workers now instead of at their next poll."""
+    if _wake is not None:
+        _wake.set()
+
+
+def stats(db: Session) -> dict:
+    counts = dict(db.query(models.Job.status, func.count()).group_by(models.Job.status).all())
+    oldest = (
+        db.query(func.min(models.Job.run_at))
+        .filter(models.Job.status == "queued", models.Job.run_at <= time.time())
+        .scalar()
+    )
+    return {
+        "counts": counts,
+        "oldest_ready_age_seconds": round(time.time() - oldest, 1) if oldest else 0.0,
+        "in_process_workers": JOB_WORKERS,
+    }
+
+
+# ------------- Worker side -------------
+
+_LEASE_SQL = text("""
+    UPDATE jobs
+       SET status = 'running', attempts = attempts + 1, locked_by = :worker, locked_until = :until
+     WHERE id = (
+            SELECT id FROM jobs
+             WHERE (status = 'queued' AND run_at <= :now)
+                OR (status = 'running' AND locked_until < :now)
+             ORDER BY run_at, id
+             LIMIT 1)
+    RETURNING id, kind, payload, attempts, max_attempts
+""")
+
+
+def lease(worker_id: str) -> Optional[dict]:
+    """Claim the next runnable job (or one whose lease expired), or None."""
+    now = time.time()
+    with engine.begin() as conn:
+        row = conn.execute(_LEASE_SQL, {"worker": worker_id, "now": now, "until": now + JOB_LEASE_SECONDS}).first()
+    if row is None:
+        return None
+    payload = row.payload
+    return {
+        "id": row.id, "kind": row.kind,
+        "payload": json.loads(payload) if isinstance(payload, str) else payload,
+        "attempts": row.attempts, "max_attempts": row.max_attempts,
+    }
+
+
+def complete(job_id: int, worker_id: str):
+    with engine.begin() as conn:
+        conn.execute(
+            text("UPDATE jobs SET status = 'done', finished_at = :now, locked_by = NULL, locked_until = NULL "
+                 "WHERE id = :id AND locked_by = :worker"),
+            {"id": job_id, "worker": worker_id, "now": time.time()},
+        )
+
+
+def backoff(attempts: int) -> float:
+    delay = min(JOB_BACKOFF_MAX_SECONDS, JOB_BACKOFF_BASE_SECONDS * 2 ** (attempts - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+
+def fail(job: dict, worker_id: str, error: str, count_attempt: bool = True):
+    """Reschedule with backoff, or mark dead once attempts are used up."""
+    now = time.time()
+    dead = count_attempt and job["attempts"] >= job["max_attempts"]
+    with engine.begin() as conn:
+        conn.execute(
+            text("UPDATE jobs SET status = :status, run_at = :run_at, last_error = :error, "
+                 "attempts = attempts - :refund, "
+                 "finished_at = :finished, locked_by = NULL, locked_until = NULL "
+                 "WHERE id = :id AND locked_by = :worker"),
+            {
+                "id": job["id"], "worker": worker_id, "error": error[:2000], "refund": 0 if count_attempt else 1,
+                "status": "dead" if dead else "queued",
+                "run_at": now if dead else now + backoff(job["attempts"]),
+                "finished": now if dead else None,
+            },
+        )
+
+
+async def run_one(worker_id: str) -> bool:
+    """Lease and run a single job. Returns False when the queue is empty."""
+    job = await asyncio.to_thread(lease, worker_id)
+    if job is None:
+        return False
+    fn = HANDLERS.get(job["kind"])
+    try:
+        if fn is None:
+            raise RuntimeError(f"No handler registered for job kind {job['kind']!r}")
+        await fn(job)
+    except RetryLater as e:
+        await asyncio.to_thread(fail, job, worker_id, f"retry: {e}", e.count_attempt)
+    except Exception as e:
+        log.exception("job %s (%s) attempt %s failed", job["id"], job["kind"], job["attempts"])
+        await asyncio.to_thread(fail, job, worker_id, f"{type(e).__name__}: {e}")
+    else:
+        await asyncio.to_thread(complete, job["id"], worker_id)
+    return True
+
+
+async def work(stop: Optional[asyncio.Event] = None, worker_id: Optional[str] = None):
+    """Run jobs until `stop` is set, polling every JOB_POLL_SECONDS when idle."""
+    global _wake
+    if _wake is None:
+        _wake = asyncio.Event()
+    worker_id = worker_id or f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+    stop = stop or asyncio.Event()
+    while not stop.is_set():
+        try:
+            ran = await run_one(worker_id)
+        except Exception:
+            log.exception("job worker %s: queue unavailable", worker_id)
+            ran = False
+        if not ran:
+            _wake.clear()
+            try:
+                await asyncio.wait_for(_wake.wait(), timeout=JOB_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
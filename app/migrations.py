@@ -0,0 +1,227 @@
+# backend/app/migrations.py
+"""
+Versioned schema migrations for the SQLite database.
+
+Each step in STEPS has a version number and runs once, in order; the
+versions applied so far are recorded in `schema_version`. Steps are
+idempotent (they check before adding a column, use IF NOT EXISTS, ...) so
+databases created by the old run_light_migrations() simply record them.
+
+upgrade() first reads the current version with a plain SELECT and returns
+immediately when nothing is pending, so API and worker processes pay one
+query at startup. Otherwise every step runs in its own BEGIN IMMEDIATE
+transaction: a second process starting at the same time waits on the
+write lock (busy_timeout) and then sees the step already recorded. In WAL
+mode readers keep working while a step holds the lock, e.g. during a
+CREATE INDEX on a live database; other writers wait until it commits.
+
+    python -m backend.app.migrations [upgrade | status]
+"""
+import time
+import logging
+from typing import Callable
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+import backend.app.models as models
+from backend.app import search as fts, geo, rollups, jobs
+from backend.app.database import engine
+
+log = logging.getLogger(__name__)
+
+
+def _columns(conn, table: str) -> set[str]:
+    return {r[1] for r in conn.execute(text(f"PRAGMA table_info({table})")).fetchall()}
+
+
+def add_columns(conn, table: str, columns: dict[str, str]):
+    """ALTER TABLE ... ADD COLUMN for each name -> type/default that is missing."""
+    existing = _columns(conn, table)
+    for name, ddl in columns.items():
+        if name not in existing:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}"))
+
+
+# ------------- Steps -------------
+
+def _create_tables(conn):
+    # New tables come with the indexes declared on their models.
+    models.Base.metadata.create_all(bind=conn)
+
+
+def _user_profile_columns(conn):
+    add_columns(conn, "users", {
+        "phone_number": "VARCHAR",
+        "preferred_language": "VARCHAR DEFAULT 'en'",
+        "latitude": "REAL",
+        "longitude": "REAL",
+        "address": "VARCHAR",
+        "proof_url": "VARCHAR",
+        "verification_status": "VARCHAR DEFAULT 'pending'",
+        "is_verified": "BOOLEAN DEFAULT 0",
+    })
+
+
+def _artwork_image_columns(conn):
+    add_columns(conn, "artworks", {
+        "visual_features": "BLOB",
+        "image_variants": "JSON",
+        "image_status": "VARCHAR",
+    })
+
+
+def _artwork_enrichment_columns(conn):
+    add_columns(conn, "artworks", {
+        "enrichment_status": "VARCHAR",
+        "quality_status": "VARCHAR",
+        "hashtags": "JSON",
+    })
+
+
+def _artwork_listing_indexes(conn):
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_artworks_owner_id_id ON artworks (owner_id, id)"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_artworks_price_id ON artworks (price, id)"))
+
+
+def _full_text_search(conn):
+    fts.ensure_fts(conn)
+
+
+def _user_geohash(conn):
+    add_columns(conn, "users", {"geohash": "VARCHAR"})
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_users_geohash ON users (geohash)"))
+    geo.backfill(conn)
+
+
+def _order_indexes(conn):
+    add_columns(conn, "orders", {"seller_id": "INTEGER REFERENCES users(id)"})
+    conn.execute(text(
+        "UPDATE orders SET seller_id = (SELECT owner_id FROM artworks WHERE artworks.id = orders.artwork_id) "
+        "WHERE seller_id IS NULL"
+    ))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_orders_customer_id_id ON orders (customer_id, id)"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_orders_seller_id_id ON orders (seller_id, id)"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_orders_artwork_id_id ON orders (artwork_id, id)"))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_orders_seller_summary ON orders (seller_id, status, artwork_id, quantity)"
+    ))
+
+
+def _sales_rollups(conn):
+    add_columns(conn, "orders", {"unit_price": "FLOAT", "created_at": "DATETIME"})
+    # Older orders get today's price and date; their real ones weren't recorded.
+    conn.execute(text(
+        "UPDATE orders SET unit_price = (SELECT price FROM artworks WHERE artworks.id = orders.artwork_id) "
+        "WHERE unit_price IS NULL"
+    ))
+    conn.execute(text("UPDATE orders SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL"))
+    # The summary is served from the rollups now, so its covering index only slows writes.
+    conn.execute(text("DROP INDEX IF EXISTS ix_orders_seller_summary"))
+    models.SalesRollup.__table__.create(bind=conn, checkfirst=True)
+    rollups.rebuild(conn)
+
+
+def _artwork_feature_backfill(conn):
+    # Legacy rows get their AR features from jobs: computing them here would
+    # hold the write lock (and startup) for the whole catalog.
+    now = time.time()
+    conn.execute(text(
+        "INSERT INTO jobs (kind, payload, status, attempts, max_attempts, run_at, created_at) "
+        "SELECT 'artwork_features', json_object('artwork_id', id), 'queued', 0, :max_attempts, :now, :now "
+        "FROM artworks WHERE visual_features IS NULL AND image_url LIKE '/static/%'"
+    ), {"max_attempts": jobs.JOB_MAX_ATTEMPTS, "now": now})
+
+
+# (version, name, step) -- append only; never renumber or edit an applied step.
+STEPS: list[tuple[int, str, Callable]] = [
+    (1, "create_tables", _create_tables),
+    (2, "user_profile_columns", _user_profile_columns),
+    (3, "artwork_image_columns", _artwork_image_columns),
+    (4, "artwork_enrichment_columns", _artwork_enrichment_columns),
+    (5, "artwork_listing_indexes", _artwork_listing_indexes),
+    (6, "full_text_search", _full_text_search),
+    (7, "user_geohash", _user_geohash),
+    (8, "order_indexes", _order_indexes),
+    (9, "sales_rollups", _sales_rollups),
+    (10, "artwork_feature_backfill", _artwork_feature_backfill),
+]
+LATEST = STEPS[-1][0]
+
+_VERSION_TABLE = text(
+    "CREATE TABLE IF NOT EXISTS schema_version ("
+    "version INTEGER PRIMARY KEY, name VARCHAR NOT NULL, applied_at REAL NOT NULL)"
+)
+
+
+# ------------- Runner -------------
+
+def _version(conn) -> int:
+    try:
+        return conn.execute(text("SELECT MAX(version) FROM schema_version")).scalar() or 0
+    except OperationalError:  # no schema_version table yet
+        return 0
+
+
+def current_version() -> int:
+    with engine.connect() as conn:
+        return _version(conn)
+
+
+def upgrade(target: int = LATEST) -> list[int]:
+    """Apply pending steps up to `target`; returns the versions applied here."""
+    if current_version() >= target:
+        return []
+    applied = []
+    # Manual BEGIN IMMEDIATE: take the write lock before reading the version.
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(_VERSION_TABLE)
+        for version, name, step in STEPS:
+            if version > target:
+                break
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+            try:
+                if _version(conn) >= version:
+                    conn.exec_driver_sql("COMMIT")
+                    continue
+                started = time.perf_counter()
+                step(conn)
+                conn.execute(
+                    text("INSERT INTO schema_version (version, name, applied_at) VALUES (:v, :n, :t)"),
+                    {"v": version, "n": name, "t": time.time()},
+                )
+                conn.exec_driver_sql("COMMIT")
+            except Exception:
+                conn.exec_driver_sql("ROLLBACK")
+                raise
+            log.info("migration %d %s applied in %.2fs", version, name, time.perf_counter() - started)
+            applied.append(version)
+    return applied
+
+
+def status() -> list[dict]:
+    with engine.connect() as conn:
+        done = {}
+        if _version(conn):
+            done = {r.version: r.applied_at for r in conn.execute(text("SELECT version, applied_at FROM schema_version"))}
+    return [
+        {"version": v, "name": name, "applied_at": done.get(v)}
+        for v, name, _ in STEPS
+    ]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Apply or inspect database schema migrations")
+    parser.add_argument("command", nargs="?", choices=["upgrade", "status"], default="upgrade")
+    parser.add_argument("--to", type=int, default=LATEST, help="target version (default: latest)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    if args.command == "status":
+        for s in status():
+            when = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(s["applied_at"])) if s["applied_at"] else "pending"
+            print(f"{s['version']:>4}  {s['name']:<32} {when}")
+    else:
+        applied = upgrade(args.to)
+        print(f"schema at version {current_version()} ({len(applied)} step(s) applied)")
@@ -1,8 +1,27 @@
 # backend/app/models.py
 
-from sqlalchemy import Column, Integer, String, Boolean, Float, Text, ForeignKey
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, String, Boolean, Float, Text, ForeignKey, LargeBinary, JSON, Index, DateTime, Date
+from sqlalchemy import event
+from sqlalchemy.types import TypeDecorator
 from sqlalchemy.orm import relationship
 from backend.app.database import Base
+from backend.app import geo
+
+
+class UTCDateTime(TypeDecorator):
+    """DateTime kept as naive UTC in SQLite (no time zones there), returned timezone-aware."""
+    impl = DateTime
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    def process_result_value(self, value, dialect):
+        return value.replace(tzinfo=timezone.utc) if value is not None else None
+
 
 # ---------------- USER ----------------
 class User(Base):
@@ -31,11 +50,19 @@ class User(Base):
     latitude = Column(Float, nullable=True)
     longitude = Column(Float, nullable=True)
     address = Column(String, nullable=True)
+    # Derived from latitude/longitude (see _set_geohash) for radius prefiltering
+    geohash = Column(String, index=True, nullable=True)
 
     # Relationship to artworks
     artworks = relationship("Artwork", back_populates="owner")
 
 
+@event.listens_for(User, "before_insert")
+@event.listens_for(User, "before_update")
+def _set_geohash(mapper, connection, target):
+    target.geohash = geo.encode_optional(target.latitude, target.longitude)
+
+
 # ---------------- ARTWORK ----------------
 class Artwork(Base):
     __tablename__ = "artworks"
@@ -45,10 +72,26 @@ class Artwork(Base):
     description = Column(Text)
     price = Column(Float, nullable=False, default=0.0)
     image_url = Column(String)
+    # float32 vector from app/image_features.py (colors/brightness) for AR matching
+    visual_features = Column(LargeBinary, nullable=True)
+    # {"thumb"|"card"|"full": {"width", "height", "webp", "jpeg"}} from app/image_pipeline.py
+    image_variants = Column(JSON, nullable=True)
+    image_status = Column(String, nullable=True)  # processing | ready | failed
+    # Filled in by the "enrich_artwork" job (app/enrichment.py) after upload
+    enrichment_status = Column(String, nullable=True)  # pending_enrichment | enriched | rejected | failed
+    quality_status = Column(String, nullable=True)  # pending | passed | enhanced | rejected
+    hashtags = Column(JSON, nullable=True)
 
     owner_id = Column(Integer, ForeignKey("users.id"))
     owner = relationship("User", back_populates="artworks")
 
+    # Keyset pagination for GET /artworks: (owner_id, id) serves per-seller
+    # "newest" pages, (price, id) serves price-sorted pages in either direction.
+    __table_args__ = (
+        Index("ix_artworks_owner_id_id", "owner_id", "id"),
+        Index("ix_artworks_price_id", "price", "id"),
+    )
+
 
 # ---------------- ORDER ----------------
 class Order(Base):
@@ -57,8 +100,42 @@ class Order(Base):
     id = Column(Integer, primary_key=True, index=True)
     customer_id = Column(Integer, ForeignKey("users.id"))
     artwork_id = Column(Integer, ForeignKey("artworks.id"))
+    # Copy of artworks.owner_id (artworks never change owner), so a seller's
+    # sales are one index range instead of a join through every artwork.
+    seller_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     quantity = Column(Integer, default=1)
     status = Column(String, default="pending")
+    # Artwork price when the order was placed; revenue is quantity * unit_price
+    unit_price = Column(Float, nullable=True)
+    created_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc), nullable=True)
+
+    # Keyset pagination: (customer_id, id) for /orders/my, (seller_id, id)
+    # for /orders/sales; (artwork_id, id) for per-artwork lookups.
+    __table_args__ = (
+        Index("ix_orders_customer_id_id", "customer_id", "id"),
+        Index("ix_orders_seller_id_id", "seller_id", "id"),
+        Index("ix_orders_artwork_id_id", "artwork_id", "id"),
+    )
+
+
+# ---------------- SALES ROLLUP ----------------
+class SalesRollup(Base):
+    """
+    Per (seller, UTC day the order was placed, artwork, current status)
+    counters, kept in step with orders by app/rollups.py.
+    """
+    __tablename__ = "sales_rollups"
+
+    seller_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    artwork_id = Column(Integer, ForeignKey("artworks.id"), primary_key=True)
+    status = Column(String, primary_key=True)
+    orders = Column(Integer, nullable=False, default=0)
+    units = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0.0)
+
+    # Clustered on the primary key: a seller's date range is one contiguous read.
+    __table_args__ = {"sqlite_with_rowid": False}
 
 
 # ---------------- REQUEST ----------------
@@ -78,3 +155,36 @@ class Notification(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     message = Column(Text)
+
+
+# ---------------- REFRESH TOKEN ----------------
+class RefreshToken(Base):
+    """One row per issued refresh token (by JWT id), so it can be rotated and revoked."""
+    __tablename__ = "refresh_tokens"
+
+    jti = Column(String, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True, nullable=False)
+    expires_at = Column(UTCDateTime, nullable=False)
+    revoked = Column(Boolean, default=False, nullable=False)
+    replaced_by = Column(String, nullable=True)  # jti of the token issued when this one was used
+
+
+# ---------------- JOB ----------------
+class Job(Base):
+    """Durable background job; see app/jobs.py for leasing and retries."""
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False)
+    status = Column(String, nullable=False, default="queued")  # queued | running | done | dead
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    run_at = Column(Float, nullable=False)  # epoch seconds; next time the job may run
+    locked_by = Column(String, nullable=True)
+    locked_until = Column(Float, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(Float, nullable=False)
+    finished_at = Column(Float, nullable=True)
+
+    __table_args__ = (Index("ix_jobs_status_run_at", "status", "run_at"),)
@@ -0,0 +1,32 @@
+# backend/app/pagination.py
+"""
+Opaque cursors for keyset pagination.
+
+A cursor is the sort key of the last row on a page (plus the sort name),
+as URL-safe base64 JSON. The next page is "rows after this key" on an
+index, so it costs the same on page 1000 as on page 1, and rows inserted
+meanwhile don't shift items between pages the way OFFSET does.
+"""
+import json
+import base64
+from typing import Optional
+
+from fastapi import HTTPException
+
+
+def encode_cursor(**key) -> str:
+    raw = json.dumps(key, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], sort: str) -> Optional[dict]:
+    """Decode a cursor from encode_cursor(sort=..., ...); 400 if it is malformed or for another sort."""
+    if not cursor:
+        return None
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(key, dict) or key.get("sort") != sort or not isinstance(key.get("id"), int):
+        raise HTTPException(status_code=400, detail="Cursor does not match this query; start again without it")
+    return key
@@ -0,0 +1,105 @@
+# backend/app/resilience.py
+"""
+Small resilience primitives for outbound provider calls:
+  - CircuitBreaker: fail fast while a provider is unhealthy
+  - hedged(): race a second attempt if the first one is slow
+"""
+import time
+import asyncio
+import threading
+from typing import Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures and rejects calls
+    for `reset_timeout` seconds. Then a single probe is let through
+    (half-open): success closes the circuit, failure re-opens it.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self._probing = False
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+            self._probing = False
+
+    def release_probe(self):
+        """End a call without a verdict (e.g. cancelled): frees the half-open probe slot, state unchanged."""
+        with self._lock:
+            self._probing = False
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "rejected": self.rejected,
+            }
+
+
+async def hedged(call: Callable[[], Awaitable[T]], delay: float, attempts: int = 2) -> T:
+    """
+    Start `call()`; if it hasn't finished after `delay` seconds (or failed)
+    start another, up to `attempts` in total. Returns the first successful
+    result and cancels the rest. Only use for idempotent calls.
+    """
+    tasks: list[asyncio.Task] = [asyncio.ensure_future(call())]
+    launched = 1
+    last_exc: BaseException | None = None
+    try:
+        while tasks:
+            timeout = delay if launched < attempts else None
+            done, _ = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                tasks.append(asyncio.ensure_future(call()))
+                launched += 1
+                continue
+            for t in done:
+                tasks.remove(t)
+                if t.exception() is None:
+                    return t.result()
+                last_exc = t.exception()
+            # A fast failure is retried right away rather than after `delay`.
+            if not tasks and launched < attempts:
+                tasks.append(asyncio.ensure_future(call()))
+                launched += 1
+        raise last_exc
+    finally:
+        for t in tasks:
+            t.cancel()
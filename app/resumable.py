@@ -0,0 +1,205 @@
+# backend/app/resumable.py
+"""
+Resumable chunked uploads.
+
+A session lives in cache/uploads/<upload_id>/ as data.part plus
+meta.json, outside the /static mount so partial files (seller proofs
+among them) and their owner ids are never served. The current offset is
+simply the size of data.part, so a client that lost its connection asks
+for the offset and continues from there instead of re-sending the whole
+file. finalize() moves the bytes
+into content-addressed storage (app/storage.py); the finalized upload_id
+can then be used once by create_artwork, register or
+upload_additional_proof in place of a multipart file: claim() before the
+row is written, then consume() after it commits or release() if the
+request fails, so the upload stays usable for a retry (or the TTL sweep).
+"""
+import os
+import json
+import time
+import uuid
+import shutil
+import asyncio
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+from fastapi import HTTPException
+
+from backend.app import storage
+
+SESSION_DIR = Path(os.getenv("UPLOAD_SESSION_DIR", "cache/uploads"))
+SESSION_TTL_SECONDS = float(os.getenv("UPLOAD_SESSION_TTL_HOURS", "24")) * 3600
+WRITE_BUFFER = storage.CHUNK_SIZE
+
+_locks: dict[str, asyncio.Lock] = {}
+
+
+def _dir(upload_id: str) -> Path:
+    try:
+        uuid.UUID(hex=upload_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return SESSION_DIR / upload_id
+
+
+def _read_meta(upload_id: str) -> dict:
+    try:
+        with open(_dir(upload_id) / "meta.json") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Upload not found or expired")
+
+
+def _write_meta(upload_id: str, meta: dict):
+    d = _dir(upload_id)
+    tmp = d / "meta.json.tmp"
+    with open(tmp, "w") as f:
+        json.dump(meta, f)
+    os.replace(tmp, d / "meta.json")
+
+
+def _offset(upload_id: str) -> int:
+    try:
+        return (_dir(upload_id) / "data.part").stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def sweep_expired():
+    if not SESSION_DIR.exists():
+        return
+    cutoff = time.time() - SESSION_TTL_SECONDS
+    for d in SESSION_DIR.iterdir():
+        part = d / "data.part"
+        try:
+            last_write = max(d.stat().st_mtime, part.stat().st_mtime if part.exists() else 0)
+        except FileNotFoundError:
+            continue
+        if last_write < cutoff:
+            shutil.rmtree(d, ignore_errors=True)
+
+
+def create(kind: str, filename: str, size: Optional[int], owner_id: Optional[int]) -> dict:
+    if kind not in storage.KINDS:
+        raise HTTPException(status_code=400, detail=f"kind must be one of: {', '.join(storage.KINDS)}")
+    ext = storage.extension_for(kind, filename)
+    limit = storage.max_bytes(kind)
+    if size is not None and (size < 0 or size > limit):
+        raise HTTPException(status_code=413, detail=f"{kind} uploads are limited to {limit} bytes")
+    sweep_expired()
+    upload_id = uuid.uuid4().hex
+    _dir(upload_id).mkdir(parents=True)
+    (_dir(upload_id) / "data.part").touch()
+    meta = {
+        "kind": kind, "ext": ext, "size": size, "owner_id": owner_id,
+        "status": "open", "created_at": time.time(),
+    }
+    _write_meta(upload_id, meta)
+    return {"upload_id": upload_id, "offset": 0, "max_bytes": limit, "chunk_size": storage.CHUNK_SIZE}
+
+
+def status(upload_id: str) -> dict:
+    meta = _read_meta(upload_id)
+    out = {"upload_id": upload_id, "kind": meta["kind"], "size": meta["size"], "status": meta["status"]}
+    if meta["status"] == "complete":
+        out.update({"offset": meta["stored_size"], "url": meta["url"], "sha256": meta["sha256"]})
+    else:
+        out["offset"] = _offset(upload_id)
+    return out
+
+
+async def append(upload_id: str, offset: int, chunks: AsyncIterator[bytes]) -> dict:
+    """
+    Append a chunk that starts at `offset`. A mismatched offset is a 409 with
+    the real offset so the client can resume. Bytes are persisted as they
+    arrive, so even an interrupted PUT advances the offset.
+    """
+    lock = _locks.setdefault(upload_id, asyncio.Lock())
+    async with lock:
+        meta = _read_meta(upload_id)
+        if meta["status"] != "open":
+            raise HTTPException(status_code=409, detail="Upload already finalized")
+        current = _offset(upload_id)
+        if offset != current:
+            raise HTTPException(status_code=409, detail={"message": "Offset mismatch", "offset": current})
+        limit = meta["size"] if meta["size"] is not None else storage.max_bytes(meta["kind"])
+        written = current
+        buf = bytearray()
+        with open(_dir(upload_id) / "data.part", "ab") as f:
+            try:
+                async for chunk in chunks:
+                    if written + len(buf) + len(chunk) > limit:
+                        raise HTTPException(status_code=413, detail=f"Upload exceeds {limit} bytes")
+                    buf.extend(chunk)
+                    if len(buf) >= WRITE_BUFFER:
+                        await asyncio.to_thread(f.write, bytes(buf))
+                        written += len(buf)
+                        buf.clear()
+            finally:
+                # Keep whatever arrived, even if the client dropped mid-chunk.
+                if buf:
+                    await asyncio.to_thread(f.write, bytes(buf))
+                    written += len(buf)
+        return {"upload_id": upload_id, "offset": written}
+
+
+async def finalize(upload_id: str) -> dict:
+    lock = _locks.setdefault(upload_id, asyncio.Lock())
+    async with lock:
+        meta = _read_meta(upload_id)
+        if meta["status"] == "complete":
+            return status(upload_id)
+        part = _dir(upload_id) / "data.part"
+        received = _offset(upload_id)
+        if meta["size"] is not None and received != meta["size"]:
+            raise HTTPException(status_code=409, detail={"message": "Upload incomplete", "offset": received})
+        if received == 0:
+            raise HTTPException(status_code=400, detail="Upload is empty")
+        stored = await asyncio.to_thread(storage.store_file, part, meta["kind"], meta["ext"])
+        part.unlink(missing_ok=True)
+        meta.update({"status": "complete", "sha256": stored.sha256, "url": stored.url, "stored_size": stored.size})
+        _write_meta(upload_id, meta)
+    _locks.pop(upload_id, None)
+    return status(upload_id)
+
+
+def _claimed(upload_id: str) -> Path:
+    return _dir(upload_id).with_name(f"{upload_id}.claimed")
+
+
+def claim(upload_id: str, kind: str, user_id: Optional[int] = None) -> storage.StoredFile:
+    """
+    Reserve a finalized upload for one request and return its stored file.
+    The session directory is renamed, which is atomic across processes, so
+    of two concurrent claims only one succeeds. consume() it after the
+    commit, release() it if the request fails.
+    """
+    meta = _read_meta(upload_id)
+    if meta["status"] != "complete":
+        raise HTTPException(status_code=409, detail="Upload not finalized yet")
+    if meta["kind"] != kind:
+        raise HTTPException(status_code=400, detail=f"Upload {upload_id} is a {meta['kind']} upload, expected {kind}")
+    if meta["owner_id"] is not None and meta["owner_id"] != user_id:
+        raise HTTPException(status_code=403, detail="Upload belongs to another user")
+    stored = storage.find(kind, meta["sha256"])
+    if stored is None:
+        raise HTTPException(status_code=410, detail="Uploaded file no longer available")
+    try:
+        os.rename(_dir(upload_id), _claimed(upload_id))
+    except FileNotFoundError:
+        raise HTTPException(status_code=409, detail="Upload is already being used")
+    return stored
+
+
+def release(upload_id: str):
+    """Undo claim() after a failed request, so the upload can be used by a retry."""
+    try:
+        os.rename(_claimed(upload_id), _dir(upload_id))
+    except OSError:
+        pass  # swept meanwhile; the client has to upload again
+
+
+def consume(upload_id: str):
+    """Drop a claimed session once the row using it has committed (single use)."""
+    shutil.rmtree(_claimed(upload_id), ignore_errors=True)
+    _locks.pop(upload_id, None)
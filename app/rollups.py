@@ -0,0 +1,98 @@
+# backend/app/rollups.py
+"""
+Seller sales rollups: orders, units and revenue per (seller, day, artwork,
+status) in `sales_rollups`, so dashboards read a few rows per day instead
+of scanning orders.
+
+Routes call order_created() / status_changed() and execute the returned
+upsert in the same session as the order change, so the counters commit or
+roll back with it. A status change moves the order's counts from the old
+status to the new one on the day the order was placed. Revenue uses the
+order's unit_price snapshot, which is why rebuild() reproduces the
+incremental counters exactly.
+
+    python -m backend.app.rollups rebuild [--seller ID]
+"""
+import logging
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.dialects.sqlite import insert
+
+import backend.app.models as models
+
+_KEY = ("seller_id", "day", "artwork_id", "status")
+
+
+def _row(order: models.Order, status: str, sign: int) -> dict:
+    units = order.quantity or 0
+    return {
+        "seller_id": order.seller_id,
+        "day": order.created_at.date(),
+        "artwork_id": order.artwork_id,
+        "status": status,
+        "orders": sign,
+        "units": sign * units,
+        "revenue": sign * units * (order.unit_price or 0.0),
+    }
+
+
+def _upsert(rows: list[dict]):
+    stmt = insert(models.SalesRollup).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=list(_KEY),
+        set_={
+            "orders": models.SalesRollup.orders + stmt.excluded.orders,
+            "units": models.SalesRollup.units + stmt.excluded.units,
+            "revenue": models.SalesRollup.revenue + stmt.excluded.revenue,
+        },
+    )
+
+
+def order_created(order: models.Order):
+    """Upsert adding a new order to its bucket, or None if it has no seller."""
+    if order.seller_id is None or order.created_at is None:
+        return None
+    return _upsert([_row(order, order.status, +1)])
+
+
+def status_changed(order: models.Order, old_status: str):
+    """Upsert moving the order from old_status to order.status (None if nothing changes)."""
+    if order.seller_id is None or order.created_at is None or old_status == order.status:
+        return None
+    return _upsert([_row(order, old_status, -1), _row(order, order.status, +1)])
+
+
+_REBUILD_SQL = """
+    INSERT INTO sales_rollups (seller_id, day, artwork_id, status, orders, units, revenue)
+    SELECT seller_id, date(created_at), artwork_id, status,
+           COUNT(*), COALESCE(SUM(quantity), 0), COALESCE(SUM(quantity * COALESCE(unit_price, 0)), 0)
+      FROM orders
+     WHERE seller_id IS NOT NULL AND created_at IS NOT NULL {where}
+     GROUP BY seller_id, date(created_at), artwork_id, status
+"""
+
+
+def rebuild(conn, seller_id: Optional[int] = None) -> int:
+    """Recompute the rollups from orders (all sellers, or one); returns the rows written."""
+    if seller_id is None:
+        conn.execute(text("DELETE FROM sales_rollups"))
+        result = conn.execute(text(_REBUILD_SQL.format(where="")))
+    else:
+        conn.execute(text("DELETE FROM sales_rollups WHERE seller_id = :s"), {"s": seller_id})
+        result = conn.execute(text(_REBUILD_SQL.format(where="AND seller_id = :s")), {"s": seller_id})
+    return result.rowcount
+
+
+if __name__ == "__main__":
+    import argparse
+    from backend.app.database import engine
+
+    parser = argparse.ArgumentParser(description="Rebuild seller sales rollups from the orders table")
+    parser.add_argument("command", choices=["rebuild"])
+    parser.add_argument("--seller", type=int, default=None, help="only this seller (default: all)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    with engine.begin() as conn:
+        rows = rebuild(conn, args.seller)
+    print(f"rebuilt {rows} rollup row(s)")
@@ -1,6 +1,7 @@
 # backend/app/schemas.py
 from pydantic import BaseModel
 from typing import Optional
+from datetime import date
 
 # ------------------ USERS ------------------
 class UserCreate(BaseModel):
@@ -31,6 +32,13 @@ class UserResponse(BaseModel):
     class Config:
         orm_mode = True
 
+class NearbySeller(BaseModel):
+    id: int
+    username: str
+    address: Optional[str] = None
+    is_verified: bool
+    distance_km: float
+
 # ------------------ ARTWORKS ------------------
 class ArtworkBase(BaseModel):
     title: str
@@ -44,9 +52,24 @@ class ArtworkCreate(ArtworkBase):
 class ArtworkResponse(ArtworkBase):
     id: int
     owner_id: int
+    # Responsive variants, filled in after upload; fall back to image_url while None
+    image_variants: Optional[dict] = None
+    image_status: Optional[str] = None
+    # AI enrichment runs after upload; description/price are final once "enriched"
+    enrichment_status: Optional[str] = None
+    quality_status: Optional[str] = None
+    hashtags: Optional[list[str]] = None
     class Config:
         orm_mode = True
 
+class NearbyArtwork(ArtworkResponse):
+    distance_km: float  # from the query point to the seller's location
+
+class ArtworkPage(BaseModel):
+    items: list[ArtworkResponse]
+    # pass back as ?cursor= for the next page; None on the last page
+    next_cursor: Optional[str] = None
+
 # ------------------ ORDERS ------------------
 class OrderResponse(BaseModel):
     id: int
@@ -57,6 +80,33 @@ class OrderResponse(BaseModel):
     class Config:
         orm_mode = True
 
+class OrderPage(BaseModel):
+    items: list[OrderResponse]
+    next_cursor: Optional[str] = None
+
+class SalesTotals(BaseModel):
+    orders: int
+    units: int
+    revenue: float
+
+class SalesStatusSummary(SalesTotals):
+    status: str
+
+class SalesSummary(SalesTotals):
+    by_status: list[SalesStatusSummary]
+
+class DailySales(SalesTotals):
+    day: date
+
+class ArtworkSales(SalesTotals):
+    artwork_id: int
+
+class SalesReport(SalesTotals):
+    start: date
+    end: date
+    days: list[DailySales]
+    artworks: list[ArtworkSales]
+
 # ------------------ NOTIFICATIONS ------------------
 class NotificationResponse(BaseModel):
     id: int
@@ -78,3 +128,6 @@ class RequestResponse(BaseModel):
 class UserLogin(BaseModel):
     phone_number: str
     password: str
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
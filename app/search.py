@@ -0,0 +1,148 @@
+# backend/app/search.py
+"""
+SQLite FTS5 full-text search over artworks and art requests.
+
+artworks_fts / art_requests_fts are external-content FTS5 tables: they
+store only the inverted index and read title/description from the base
+tables, so the text isn't duplicated. Triggers keep them in sync on
+INSERT / DELETE / UPDATE OF title, description (other column updates,
+e.g. image_status, don't touch the index). ensure_fts() creates
+everything and backfills with 'rebuild' the first time it runs.
+
+Queries are ranked with bm25 (title weighted over description, stored as
+the tables' default `rank` so FTS5 can sort inside the index), the last
+word is prefix-matched as the user types ("terra" finds "terracotta"),
+and snippets mark hits with <mark> after HTML-escaping the stored text.
+"""
+import re
+import html
+import logging
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+log = logging.getLogger(__name__)
+
+TITLE_WEIGHT = 5.0
+DESCRIPTION_WEIGHT = 1.0
+SNIPPET_TOKENS = 12
+MIN_PREFIX_CHARS = 3  # shorter prefixes match most of the catalog and can't be ranked quickly
+MAX_TERMS = 16
+
+# scope -> (fts table, base table); both index (title, description)
+FTS_TABLES = {
+    "artworks": ("artworks_fts", "artworks"),
+    "requests": ("art_requests_fts", "art_requests"),
+}
+
+# Private-use markers survive the escaping, then become <mark> tags.
+_OPEN, _CLOSE = "\ue000", "\ue001"
+TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+available = True
+
+
+def _ddl(fts: str, base: str) -> list[str]:
+    return [
+        f"""CREATE VIRTUAL TABLE {fts} USING fts5(
+                title, description, content='{base}', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2', prefix='2 3')""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {base} BEGIN
+                INSERT INTO {fts}(rowid, title, description) VALUES (new.id, new.title, new.description);
+            END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {base} BEGIN
+                INSERT INTO {fts}({fts}, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+            END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF title, description ON {base} BEGIN
+                INSERT INTO {fts}({fts}, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+                INSERT INTO {fts}(rowid, title, description) VALUES (new.id, new.title, new.description);
+            END""",
+    ]
+
+
+def ensure_fts(conn):
+    """Create the FTS tables + triggers if missing and backfill them (idempotent)."""
+    global available
+    for fts, base in FTS_TABLES.values():
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": fts}
+        ).first()
+        if exists:
+            continue
+        try:
+            create, *triggers = _ddl(fts, base)
+            conn.execute(text(create))
+        except OperationalError as e:  # SQLite built without FTS5
+            log.warning("full-text search disabled: %s", e)
+            available = False
+            return
+        for stmt in triggers:
+            conn.execute(text(stmt))
+        conn.execute(text(f"INSERT INTO {fts}({fts}, rank) VALUES ('rank', 'bm25({TITLE_WEIGHT}, {DESCRIPTION_WEIGHT})')"))
+        conn.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+
+
+def match_expression(query: str) -> Optional[str]:
+    """User text -> FTS5 MATCH expression: all words ANDed, the last one as a prefix."""
+    terms = TERM_RE.findall(query or "")[:MAX_TERMS]
+    if not terms:
+        return None
+    quoted = [f'"{t}"' for t in terms]
+    if len(terms[-1]) >= MIN_PREFIX_CHARS:
+        quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def _mark(fragment: Optional[str]) -> str:
+    return html.escape(fragment or "").replace(_OPEN, "<mark>").replace(_CLOSE, "</mark>")
+
+
+_ARTWORKS_SQL = f"""
+    SELECT a.id, a.price, a.image_url, a.owner_id,
+           highlight(artworks_fts, 0, :open, :close) AS title,
+           snippet(artworks_fts, 1, :open, :close, '…', {SNIPPET_TOKENS}) AS snippet,
+           artworks_fts.rank AS score
+      FROM artworks_fts JOIN artworks a ON a.id = artworks_fts.rowid
+     WHERE artworks_fts MATCH :match
+       AND (a.enrichment_status IS NULL
+            OR a.enrichment_status NOT IN ('pending_enrichment', 'failed', 'rejected')
+            OR (a.owner_id = :viewer AND a.enrichment_status IN ('pending_enrichment', 'failed')))
+     ORDER BY artworks_fts.rank LIMIT :limit
+"""
+
+_REQUESTS_SQL = f"""
+    SELECT r.id, r.requester_id,
+           highlight(art_requests_fts, 0, :open, :close) AS title,
+           snippet(art_requests_fts, 1, :open, :close, '…', {SNIPPET_TOKENS}) AS snippet,
+           art_requests_fts.rank AS score
+      FROM art_requests_fts JOIN art_requests r ON r.id = art_requests_fts.rowid
+     WHERE art_requests_fts MATCH :match
+     ORDER BY art_requests_fts.rank LIMIT :limit
+"""
+
+
+def search(db, query: str, scope: str = "all", limit: int = 20, viewer_id: Optional[int] = None) -> dict:
+    """
+    Ranked hits for `query`; scope is "all", "artworks" or "requests".
+    Artworks awaiting (or failed) enrichment only match for their owner.
+    """
+    out = {"artworks": [], "requests": []}
+    match = match_expression(query)
+    if match is None:
+        return out
+    params = {"match": match, "limit": limit, "open": _OPEN, "close": _CLOSE, "viewer": viewer_id}
+    if scope in ("all", "artworks"):
+        for r in db.execute(text(_ARTWORKS_SQL), params).mappings():
+            out["artworks"].append({
+                "id": r["id"], "title": _mark(r["title"]), "snippet": _mark(r["snippet"]),
+                "price": r["price"], "image_url": r["image_url"], "owner_id": r["owner_id"],
+                "score": round(-r["score"], 4),  # bm25() is lower-is-better
+            })
+    if scope in ("all", "requests"):
+        for r in db.execute(text(_REQUESTS_SQL), params).mappings():
+            out["requests"].append({
+                "id": r["id"], "title": _mark(r["title"]), "snippet": _mark(r["snippet"]),
+                "requester_id": r["requester_id"], "score": round(-r["score"], 4),
+            })
+    return out
@@ -0,0 +1,197 @@
+# backend/app/storage.py
+"""
+Content-addressed storage for uploaded files.
+
+Uploads are streamed to disk in fixed-size chunks while being hashed, so
+memory per upload is bounded no matter how big the file is, and each
+kind of upload has its own size cap. Files are stored as
+<kind dir>/<sha256><ext>: identical uploads are stored once and always
+get the same stable URL, and user-supplied names never reach the disk.
+The first bytes must match the extension (magic-number sniffing), so a
+renamed file can't be stored as an image. RequestSizeLimit refuses
+oversized request bodies before Starlette spools a multipart form.
+"""
+import os
+import asyncio
+import hashlib
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+from fastapi import HTTPException, UploadFile
+from fastapi.responses import JSONResponse
+
+CHUNK_SIZE = 1024 * 1024
+
+IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".webp"}
+
+KINDS = {
+    "artwork": {"dir": Path("static/artworks"), "max_mb": float(os.getenv("MAX_UPLOAD_MB_ARTWORK", "15")), "exts": IMAGE_EXTS},
+    "proof": {"dir": Path("static/proofs"), "max_mb": float(os.getenv("MAX_UPLOAD_MB_PROOF", "10")), "exts": IMAGE_EXTS | {".pdf"}},
+    "wall": {"dir": Path("static/ar_uploads"), "max_mb": float(os.getenv("MAX_UPLOAD_MB_WALL", "15")), "exts": IMAGE_EXTS},
+}
+
+# Largest per-kind cap plus room for the other multipart form fields.
+MAX_REQUEST_BYTES = int(
+    float(os.getenv("MAX_REQUEST_MB", str(max(k["max_mb"] for k in KINDS.values()) + 1))) * 1024 * 1024
+)
+
+
+@dataclass
+class StoredFile:
+    sha256: str
+    size: int
+    path: Path
+    url: str
+    deduplicated: bool = False
+
+
+def max_bytes(kind: str) -> int:
+    return int(KINDS[kind]["max_mb"] * 1024 * 1024)
+
+
+def extension_for(kind: str, filename: str | None) -> str:
+    ext = Path(filename or "").suffix.lower()
+    if ext not in KINDS[kind]["exts"]:
+        allowed = ", ".join(sorted(KINDS[kind]["exts"]))
+        raise HTTPException(status_code=415, detail=f"Unsupported file type for {kind}; allowed: {allowed}")
+    return ".jpg" if ext == ".jpeg" else ext
+
+
+def sniff_ext(head: bytes) -> str | None:
+    """Extension matching a file's magic number, or None if it isn't a type we store."""
+    if head.startswith(b"\xff\xd8\xff"):
+        return ".jpg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return ".png"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return ".webp"
+    if head.startswith(b"%PDF-"):
+        return ".pdf"
+    return None
+
+
+def _check_type(head: bytes, ext: str):
+    if sniff_ext(head) != ext:
+        raise HTTPException(status_code=415, detail=f"File content is not a valid {ext.lstrip('.')} file")
+
+
+def _too_large(kind: str) -> HTTPException:
+    return HTTPException(status_code=413, detail=f"File too large; {kind} uploads are limited to {KINDS[kind]['max_mb']:g} MB")
+
+
+def _commit(tmp: str, kind: str, digest: str, size: int, ext: str) -> StoredFile:
+    directory = KINDS[kind]["dir"]
+    dest = directory / f"{digest}{ext}"
+    deduplicated = dest.exists()
+    if deduplicated:
+        os.unlink(tmp)
+    else:
+        os.replace(tmp, dest)
+    return StoredFile(sha256=digest, size=size, path=dest, url=f"/{dest.as_posix()}", deduplicated=deduplicated)
+
+
+def store_stream(src: BinaryIO, kind: str, ext: str) -> StoredFile:
+    """Copy a file object into storage chunk by chunk (blocking; run off the loop)."""
+    directory = KINDS[kind]["dir"]
+    directory.mkdir(parents=True, exist_ok=True)
+    limit = max_bytes(kind)
+    h = hashlib.sha256()
+    size = 0
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".upload-")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = src.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                if not size:
+                    _check_type(chunk, ext)
+                size += len(chunk)
+                if size > limit:
+                    raise _too_large(kind)
+                h.update(chunk)
+                out.write(chunk)
+        if not size:
+            _check_type(b"", ext)  # empty upload
+        return _commit(tmp, kind, h.hexdigest(), size, ext)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def store_file(path: str | Path, kind: str, ext: str) -> StoredFile:
+    with open(path, "rb") as src:
+        return store_stream(src, kind, ext)
+
+
+def store_bytes(data: bytes, kind: str, ext: str) -> StoredFile:
+    """Store bytes produced server-side (e.g. an enhanced image)."""
+    if len(data) > max_bytes(kind):
+        raise _too_large(kind)
+    _check_type(data[:16], ext)
+    directory = KINDS[kind]["dir"]
+    directory.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".upload-")
+    with os.fdopen(fd, "wb") as out:
+        out.write(data)
+    return _commit(tmp, kind, hashlib.sha256(data).hexdigest(), len(data), ext)
+
+
+async def save_upload(upload: UploadFile, kind: str) -> StoredFile:
+    """
+    Stream an UploadFile into content-addressed storage without loading it
+    into memory. store_stream enforces the cap while copying; upload.size
+    only lets an oversized part fail before the copy starts.
+    """
+    ext = extension_for(kind, upload.filename)
+    if upload.size is not None and upload.size > max_bytes(kind):
+        raise _too_large(kind)
+    return await asyncio.to_thread(store_stream, upload.file, kind, ext)
+
+
+def find(kind: str, digest: str) -> StoredFile | None:
+    """Look up a stored file by its hash (any allowed extension)."""
+    if len(digest or "") != 64 or any(c not in "0123456789abcdef" for c in digest):
+        return None
+    directory = KINDS[kind]["dir"]
+    for ext in KINDS[kind]["exts"]:
+        p = directory / f"{digest}{ext}"
+        if p.exists():
+            return StoredFile(sha256=digest, size=p.stat().st_size, path=p, url=f"/{p.as_posix()}", deduplicated=True)
+    return None
+
+
+class RequestSizeLimit:
+    """
+    ASGI middleware: 413 for request bodies over `max_bytes`. A declared
+    Content-Length is checked before anything is read; chunked bodies are
+    counted as they arrive, so a huge upload is never spooled to disk.
+    """
+
+    def __init__(self, app, max_bytes: int = MAX_REQUEST_BYTES):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        declared = dict(scope["headers"]).get(b"content-length", b"")
+        if declared.isdigit() and int(declared) > self.max_bytes:
+            response = JSONResponse({"detail": f"Request body too large; limit is {self.max_bytes} bytes"}, status_code=413)
+            return await response(scope, receive, send)
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    raise HTTPException(status_code=413, detail=f"Request body too large; limit is {self.max_bytes} bytes")
+            return message
+
+        await self.app(scope, limited_receive, send)
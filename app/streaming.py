@@ -0,0 +1,20 @@
+# backend/app/streaming.py
+import json
+from typing import AsyncIterator
+
+from fastapi.responses import StreamingResponse
+
+async def _sse(events: AsyncIterator[dict]) -> AsyncIterator[str]:
+    async for ev in events:
+        name = ev.get("event", "message")
+        data = {k: v for k, v in ev.items() if k != "event"}
+        yield f"event: {name}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+def sse_response(events: AsyncIterator[dict]) -> StreamingResponse:
+    """Serve {"event": ..., ...} dicts as Server-Sent Events."""
+    return StreamingResponse(
+        _sse(events),
+        media_type="text/event-stream",
+        # Disable proxy buffering so the first chunk reaches the client immediately.
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,123 @@
+# backend/app/user_cache.py
+"""
+In-process cache for get_current_user: bearer token -> UserSnapshot.
+
+A hit skips both the JWT decode and the users SELECT. Entries live for
+USER_CACHE_TTL_SECONDS but never past the token's own `exp`, so an
+expired token can't be served from cache. Routes that change a user's
+auth-relevant fields call invalidate_user(); other API processes only see
+the change when their entry expires, which is why the TTL is short.
+Tokens are keyed by their SHA-256, so raw tokens are never kept in memory.
+"""
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, fields
+from typing import Optional
+
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "10000"))
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    """Read-only copy of the User columns routes read off current_user."""
+    id: int
+    username: str
+    role: str
+    is_verified: bool
+    verification_status: Optional[str]
+    phone_number: Optional[str]
+    email: Optional[str]
+    preferred_language: Optional[str]
+    proof_url: Optional[str]
+    latitude: Optional[float]
+    longitude: Optional[float]
+    address: Optional[str]
+
+    @classmethod
+    def from_user(cls, user) -> "UserSnapshot":
+        return cls(**{f.name: getattr(user, f.name) for f in fields(cls)})
+
+
+def token_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class UserCache:
+    def __init__(self, ttl: float = USER_CACHE_TTL_SECONDS, max_entries: int = USER_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, UserSnapshot]] = OrderedDict()
+        self._by_user: dict[int, set[str]] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "invalidations": 0, "evictions": 0}
+
+    def get(self, token: str) -> Optional[UserSnapshot]:
+        key = token_key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            expires_at, user = entry
+            if expires_at <= time.time():
+                self._drop(key)
+                self.stats["expired"] += 1
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return user
+
+    def put(self, token: str, user: UserSnapshot, token_exp: Optional[float] = None):
+        expires_at = time.time() + self.ttl
+        if token_exp is not None:
+            expires_at = min(expires_at, float(token_exp))
+        key = token_key(token)
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = (expires_at, user)
+            self._by_user.setdefault(user.id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self.stats["evictions"] += 1
+
+    def invalidate_user(self, user_id: int):
+        """Forget every cached token of a user whose row just changed."""
+        with self._lock:
+            for key in list(self._by_user.get(user_id, ())):
+                self._drop(key)
+            self.stats["invalidations"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+            self.stats["invalidations"] += 1
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._by_user.get(entry[1].id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[entry[1].id]
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+                **self.stats,
+            }
+
+
+cache = UserCache()
@@ -0,0 +1,99 @@
+# backend/benchmarks/chatbot_retrieval.py
+"""
+Chatbot catalog retrieval: latency and prompt size vs catalog size.
+
+Compares the old approach (load every artwork, concatenate into the prompt)
+against the BM25 index (top-K only). Uses an in-memory SQLite DB with a
+synthetic catalog, so it never touches localartist.db.
+
+    python -m backend.benchmarks.chatbot_retrieval [sizes...]
+"""
+import sys
+import time
+import random
+import statistics
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import backend.app.models as models
+from backend.app.catalog_index import CatalogIndex, CHATBOT_TOP_K
+
+WORDS = (
+    "terracotta vase block print scarf cotton silk madhubani painting warli brass lamp "
+    "wooden toy channapatna kalamkari saree jute bag bamboo basket pottery mural "
+    "handloom dhurrie rug embroidery phulkari mirror work lacquer bangle bidri "
+    "metal inlay tanjore gold leaf pattachitra blue red green ochre indigo floral "
+    "peacock elephant lotus minimal modern rustic traditional festive gift wall decor"
+).split()
+QUESTIONS = [
+    "terracotta vase for my living room",
+    "blue block print scarf",
+    "gift under 500 with peacock motif",
+    "traditional madhubani wall painting",
+    "something for diwali",
+]
+
+
+def _make_catalog(db, n: int):
+    rnd = random.Random(n)
+    db.bulk_insert_mappings(models.Artwork, [
+        {
+            "title": " ".join(rnd.choices(WORDS, k=3)).title(),
+            "description": " ".join(rnd.choices(WORDS, k=25)),
+            "price": float(rnd.randint(100, 5000)),
+            "owner_id": 1,
+        }
+        for _ in range(n)
+    ])
+    db.commit()
+
+
+def _ms(samples):
+    return statistics.median(samples) * 1000, max(samples) * 1000
+
+
+def run(sizes):
+    print(f"{'catalog':>8} | {'full scan p50/max ms':>21} {'prompt chars':>13} | "
+          f"{'index build ms':>14} {'top-K p50/max ms':>17} {'prompt chars':>13}")
+    for n in sizes:
+        engine = create_engine("sqlite://")
+        models.Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+        _make_catalog(db, n)
+
+        full, full_chars = [], 0
+        for q in QUESTIONS:
+            t = time.perf_counter()
+            arts = db.query(models.Artwork).all()
+            text = "\n".join(f"- {a.title}: {a.description} (₹{a.price})" for a in arts)
+            full.append(time.perf_counter() - t)
+            full_chars = len(text)
+            db.expunge_all()
+
+        idx = CatalogIndex()
+        t = time.perf_counter()
+        idx.sync(db)
+        build = time.perf_counter() - t
+
+        topk, topk_chars = [], []
+        for q in QUESTIONS * 5:
+            t = time.perf_counter()
+            ids = [i for i, _ in idx.search(q, k=CHATBOT_TOP_K)]
+            idx.sync(db)  # the per-request catch-up query
+            arts = db.query(models.Artwork).filter(models.Artwork.id.in_(ids)).all()
+            text = "\n".join(f"- {a.title}: {a.description} (₹{a.price})" for a in arts)
+            topk.append(time.perf_counter() - t)
+            topk_chars.append(len(text))
+            db.expunge_all()
+
+        f50, fmax = _ms(full)
+        k50, kmax = _ms(topk)
+        print(f"{n:>8} | {f50:>10.1f}/{fmax:<10.1f} {full_chars:>13} | "
+              f"{build * 1000:>14.1f} {k50:>8.2f}/{kmax:<8.2f} {max(topk_chars):>13}")
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    run([int(a) for a in sys.argv[1:]] or [100, 1_000, 10_000, 50_000])
@@ -0,0 +1,122 @@
+# backend/benchmarks/startup.py
+"""
+Cold start: import time of backend.main and time to first response.
+
+Each run is a fresh interpreter with an empty SQLite database in a temp
+directory, so it never touches localartist.db:
+
+  import    python -c "import backend.main" (modules only, no startup work)
+  first     spawn uvicorn, poll GET / until it answers (import + lifespan:
+            migrations on a new DB, provider init, job workers)
+
+Exits non-zero when a median exceeds its threshold, so CI can catch a
+heavy import sneaking back into the startup path.
+
+    python -m backend.benchmarks.startup [--runs 5] [--max-import-ms 1500] [--max-first-response-ms 4000]
+"""
+import os
+import sys
+import time
+import socket
+import argparse
+import tempfile
+import statistics
+import subprocess
+import urllib.request
+from pathlib import Path
+
+# Parent of the `backend` package, so `-m backend...` resolves in the child.
+PACKAGE_PARENT = str(Path(__file__).absolute().parents[2])
+
+MAX_IMPORT_MS = float(os.getenv("STARTUP_MAX_IMPORT_MS", "1500"))
+MAX_FIRST_RESPONSE_MS = float(os.getenv("STARTUP_MAX_FIRST_RESPONSE_MS", "4000"))
+HEAVY_MODULES = ("PIL.Image", "numpy", "cv2", "google.generativeai", "vertexai")
+
+_IMPORT_SNIPPET = """
+import sys, time
+t = time.perf_counter()
+import backend.main
+ms = (time.perf_counter() - t) * 1000
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(f"{{ms:.1f}} {{','.join(heavy)}}")
+"""
+
+
+def _env(workdir: str) -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [PACKAGE_PARENT, env.get("PYTHONPATH")]))
+    env["DATABASE_URL"] = f"sqlite:///{workdir}/startup.db"
+    env.pop("READ_DATABASE_URL", None)
+    env.pop("ASYNC_DATABASE_URL", None)
+    env.pop("ASYNC_READ_DATABASE_URL", None)
+    return env
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def measure_import() -> tuple[float, list[str]]:
+    with tempfile.TemporaryDirectory() as workdir:
+        out = subprocess.run(
+            [sys.executable, "-c", _IMPORT_SNIPPET.format(heavy=HEAVY_MODULES)],
+            cwd=workdir, env=_env(workdir), capture_output=True, text=True, check=True,
+        ).stdout.strip().splitlines()[-1]
+    ms, _, heavy = out.partition(" ")
+    return float(ms), [m for m in heavy.split(",") if m]
+
+
+def measure_first_response(timeout: float = 60.0) -> float:
+    with tempfile.TemporaryDirectory() as workdir:
+        port = _free_port()
+        started = time.perf_counter()
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(port), "--log-level", "warning"],
+            cwd=workdir, env=_env(workdir), stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        )
+        try:
+            while time.perf_counter() - started < timeout:
+                if proc.poll() is not None:
+                    raise RuntimeError(f"server exited during startup:\n{proc.stderr.read().decode()[-2000:]}")
+                try:
+                    with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=1) as resp:
+                        if resp.status == 200:
+                            return (time.perf_counter() - started) * 1000
+                except OSError:
+                    time.sleep(0.01)
+            raise TimeoutError(f"no response within {timeout}s")
+        finally:
+            proc.terminate()
+            proc.wait(timeout=10)
+
+
+def run(runs: int, max_import_ms: float, max_first_response_ms: float) -> bool:
+    measure_import()  # warm the bytecode cache so every run compares like with like
+    imports, heavy = [], set()
+    for _ in range(runs):
+        ms, loaded = measure_import()
+        imports.append(ms)
+        heavy.update(loaded)
+    first = [measure_first_response() for _ in range(runs)]
+
+    imp50, first50 = statistics.median(imports), statistics.median(first)
+    print(f"{'metric':<20} {'p50 ms':>8} {'max ms':>8} {'limit ms':>9}")
+    print(f"{'import backend.main':<20} {imp50:>8.1f} {max(imports):>8.1f} {max_import_ms:>9.0f}")
+    print(f"{'first response':<20} {first50:>8.1f} {max(first):>8.1f} {max_first_response_ms:>9.0f}")
+    if heavy:
+        print(f"loaded at import (should be lazy): {', '.join(sorted(heavy))}")
+
+    ok = imp50 <= max_import_ms and first50 <= max_first_response_ms
+    print("OK" if ok else "REGRESSION: startup exceeds its threshold")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure backend cold-start time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-import-ms", type=float, default=MAX_IMPORT_MS)
+    parser.add_argument("--max-first-response-ms", type=float, default=MAX_FIRST_RESPONSE_MS)
+    args = parser.parse_args()
+    sys.exit(0 if run(args.runs, args.max_import_ms, args.max_first_response_ms) else 1)
@@ -1,27 +1,42 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 import backend.app.models as models
 import backend.app.auth_utils as utils
 from backend.app import database
+from backend.app.user_cache import cache as user_cache, UserSnapshot
 
 # Use simple HTTP Bearer authentication
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 SECRET_KEY = utils.SECRET_KEY
 ALGORITHM = utils.ALGORITHM
 
-def get_current_user(
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(database.get_db),
+    db: AsyncSession = Depends(database.get_async_read_db),
 ):
+    """
+    The authenticated user as a read-only UserSnapshot (cached per token, see
+    app/user_cache.py). Routes that modify the user must load the row from db.
+    """
     token = credentials.credentials  # 👈 actual JWT string
 
+    cached = user_cache.get(token)
+    if cached is not None:
+        return cached
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id: str = payload.get("sub")
+        if payload.get("type", "access") != "access":
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Refresh tokens can only be used at /auth/refresh",
+            )
         if user_id is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -33,11 +48,22 @@ def get_current_user(
             detail=f"Token decode error: {str(e)}",
         )
 
-    user = db.query(models.User).filter(models.User.id == int(user_id)).first()
+    user = await db.get(models.User, int(user_id))
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
         )
 
-    return user
+    snapshot = UserSnapshot.from_user(user)
+    user_cache.put(token, snapshot, payload.get("exp"))
+    return snapshot
+
+async def get_optional_user(
+    credentials: HTTPAuthorizationCredentials | None = Depends(optional_security),
+    db: AsyncSession = Depends(database.get_async_read_db),
+):
+    """Like get_current_user, but anonymous requests get None instead of a 401."""
+    if credentials is None:
+        return None
+    return await get_current_user(credentials, db)
@@ -1,57 +1,61 @@
 # backend/main.py
-from fastapi import FastAPI, Depends
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 
-import backend.app.models as models
-from backend.app.database import engine
-from backend.routes import auth, artworks, requests, seller, admin, orders, notifications, seed, seller_ai, ai_routes, ar_routes, chatbot
-from backend.dependencies import get_current_user
-
-models.Base.metadata.create_all(bind=engine)
-
-app = FastAPI(title="Local Artisans Marketplace - Prototype")
+import backend.app.ai as ai
+from backend.app import database, migrations, jobs, enrichment, catalog_index, storage  # noqa: F401  (enrichment registers job handlers)
+from backend.routes import auth, artworks, requests, seller, admin, orders, notifications, seed, seller_ai, ai_routes, ar_routes, chatbot, uploads, images, search
+
+# Background jobs (AI enrichment). Set JOB_WORKERS=0 when running
+# `python -m backend.worker` processes instead.
+_job_stop = asyncio.Event()
+_job_tasks: list[asyncio.Task] = []
+_warm_tasks: list[asyncio.Task] = []
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Startup work happens here, not at import, so importing the app stays
+    cheap; uvicorn only accepts requests once this has yielded.
+    """
+    # Schema migrations (one SELECT when the database is already current)
+    await asyncio.to_thread(migrations.upgrade)
+    # Provider SDK import/init; AI_WARMUP=1 also creates the model clients
+    await asyncio.to_thread(ai.warm_up if ai.AI_WARMUP else ai.init_providers)
+    # Chatbot BM25 index: built off the loop in the background, so startup
+    # doesn't wait for it and no request tokenizes the catalog on the loop.
+    _warm_tasks.append(asyncio.create_task(asyncio.to_thread(catalog_index.refresh)))
+    _job_stop.clear()
+    for _ in range(jobs.JOB_WORKERS):
+        _job_tasks.append(asyncio.create_task(jobs.work(_job_stop)))
+    try:
+        yield
+    finally:
+        _job_stop.set()
+        jobs.notify()
+        for t in _job_tasks:
+            t.cancel()
+        await asyncio.gather(*_job_tasks, *_warm_tasks, return_exceptions=True)
+        _job_tasks.clear()
+        _warm_tasks.clear()
+        # Pooled aiosqlite connections each own a thread; close them so the process can exit.
+        await database.async_engine.dispose()
+        await database.async_read_engine.dispose()
+
+app = FastAPI(title="Local Artisans Marketplace - Prototype", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"], allow_credentials=True,
     allow_methods=["*"], allow_headers=["*"],
 )
-# main.py — add BEFORE app.include_router(...)
-from sqlalchemy import text
-from backend.app.database import engine
-
-def _colnames(conn, table):
-    rows = conn.execute(text(f"PRAGMA table_info({table})")).fetchall()
-    return {r[1] for r in rows}  # r[1] = column name
-
-def run_light_migrations():
-    with engine.begin() as conn:
-        cols = _colnames(conn, "users")
-
-        # add only what’s missing
-        if "phone_number" not in cols:
-            conn.execute(text("ALTER TABLE users ADD COLUMN phone_number VARCHAR"))
-        if "preferred_language" not in cols:
-            conn.execute(text("ALTER TABLE users ADD COLUMN preferred_language VARCHAR DEFAULT 'en'"))
-        if "latitude" not in cols:
-            conn.execute(text("ALTER TABLE users ADD COLUMN latitude REAL"))
-        if "longitude" not in cols:
-            conn.execute(text("ALTER TABLE users ADD COLUMN longitude REAL"))
-        if "address" not in cols:
-            conn.execute(text("ALTER TABLE users ADD COLUMN address VARCHAR"))
-        if "proof_url" not in cols:
-            conn.execute(text("ALTER TABLE users ADD COLUMN proof_url VARCHAR"))
-        if "verification_status" not in cols:
-            conn.execute(text("ALTER TABLE users ADD COLUMN verification_status VARCHAR DEFAULT 'pending'"))
-        if "is_verified" not in cols:
-            conn.execute(text("ALTER TABLE users ADD COLUMN is_verified BOOLEAN DEFAULT 0"))
-
-# call it right after creating tables:
-models.Base.metadata.create_all(bind=engine)
-run_light_migrations()
-
+# Oversized uploads get a 413 before their body is read (per-kind caps apply on top).
+app.add_middleware(storage.RequestSizeLimit)
 
 # Routers
 app.include_router(auth.router)
@@ -66,8 +70,11 @@ app.include_router(seller_ai.router)
 app.include_router(ai_routes.router)
 app.include_router(ar_routes.router)
 app.include_router(chatbot.router)
+app.include_router(uploads.router)
+app.include_router(images.router)
+app.include_router(search.router)
 
-# Static assets for uploads
+# Static assets for uploads (proofs, artworks)
 Path("static").mkdir(parents=True, exist_ok=True)
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
@@ -78,15 +85,3 @@ if Path("frontend").exists():
 @app.get("/")
 def root():
     return {"message": "Local Artisans Marketplace backend running"}
-
-# backend/main.py (add near the bottom)
-from pathlib import Path
-from fastapi.staticfiles import StaticFiles
-
-static_dir = Path("static")
-static_dir.mkdir(parents=True, exist_ok=True)  # for proofs/artworks
-
-frontend_dir = Path("frontend")
-if frontend_dir.exists():
-    app.mount("/", StaticFiles(directory="frontend", html=True), name="frontend")
-
@@ -1,57 +1,75 @@
 # backend/routes/admin.py
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 import backend.app.models as models
 import backend.app.schemas as schemas
-from backend.app.database import get_db
+from backend.app.database import get_async_db, get_async_read_db
 from backend.dependencies import get_current_user
+from backend.app import jobs
+from backend.app.user_cache import cache as user_cache
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 @router.get("/sellers", response_model=list[schemas.UserResponse])
-def list_sellers(
-    db: Session = Depends(get_db),
+async def list_sellers(
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: models.User = Depends(get_current_user),
 ):
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Only admins can view sellers")
-    return db.query(models.User).filter(models.User.role == "seller").all()
+    return (await db.scalars(select(models.User).where(models.User.role == "seller"))).all()
+
+async def _get_seller(db: AsyncSession, seller_id: int) -> models.User:
+    seller = await db.scalar(select(models.User).where(models.User.id == seller_id, models.User.role == "seller"))
+    if not seller:
+        raise HTTPException(status_code=404, detail="Seller not found")
+    return seller
 
 @router.post("/verify/{seller_id}")
-def verify_seller(
+async def verify_seller(
     seller_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user),
 ):
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Only admins can verify sellers")
 
-    seller = db.query(models.User).filter(models.User.id == seller_id, models.User.role == "seller").first()
-    if not seller:
-        raise HTTPException(status_code=404, detail="Seller not found")
-
+    seller = await _get_seller(db, seller_id)
     seller.is_verified = True
     seller.verification_status = "verified"
-    db.commit()
-    db.refresh(seller)
+    await db.commit()
+    user_cache.invalidate_user(seller.id)
     return {"message": f"Seller {seller.username} verified successfully"}
 
 @router.post("/reject/{seller_id}")
-def reject_seller(
+async def reject_seller(
     seller_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user),
 ):
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Only admins can reject sellers")
 
-    seller = db.query(models.User).filter(models.User.id == seller_id, models.User.role == "seller").first()
-    if not seller:
-        raise HTTPException(status_code=404, detail="Seller not found")
-
+    seller = await _get_seller(db, seller_id)
     seller.is_verified = False
     seller.verification_status = "rejected"
-    db.commit()
-    db.refresh(seller)
+    await db.commit()
+    user_cache.invalidate_user(seller.id)
     return {"message": f"Seller {seller.username} rejected"}
- 
\ No newline at end of file
+ 
+
+@router.get("/jobs")
+async def job_queue_stats(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Only admins can view the job queue")
+    return await db.run_sync(jobs.stats)
+
+@router.get("/user_cache")
+def user_cache_stats(current_user: models.User = Depends(get_current_user)):
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Only admins can view cache stats")
+    return user_cache.snapshot()
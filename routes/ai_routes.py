@@ -1,37 +1,63 @@
 # replace bodies to call helper functions
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from backend.dependencies import get_current_user
-from sqlalchemy.orm import Session
-from backend.app.database import get_db
 import backend.app.ai as ai
+from backend.app.streaming import sse_response
 
 router = APIRouter(prefix="/ai", tags=["ai"])
 
 @router.post("/translate")
-def translate_text_endpoint(text: str, target_lang: str = "en", current_user=Depends(get_current_user)):
+async def translate_text_endpoint(text: str, target_lang: str = "en", current_user=Depends(get_current_user)):
     # If you don't have translation implemented, reuse summarize as placeholder or add a translate prompt.
-    out = ai._get_text_response([f"Translate to {target_lang}: {text}"])
+    out = await ai._get_text_response([f"Translate to {target_lang}: {text}"])
     return {"original": text, "translated": out or text}
 
 @router.post("/describe")
-def describe_artwork(title: str, details: str = None, current_user=Depends(get_current_user)):
-    return {"description": ai.generate_description(title, details)}
+async def describe_artwork(title: str, details: str = None, stream: bool = False, current_user=Depends(get_current_user)):
+    if stream:
+        return sse_response(ai.stream_description(title, details))
+    return {"description": await ai.generate_description(title, details)}
 
 @router.post("/price")
-def recommend_price_endpoint(title: str, description: str = "", current_user=Depends(get_current_user)):
-    return {"recommended_price": ai.recommend_price(title, description)}
+async def recommend_price_endpoint(title: str, description: str = "", current_user=Depends(get_current_user)):
+    return {"recommended_price": await ai.recommend_price(title, description)}
 
 @router.post("/hashtags")
-def hashtags_endpoint(description: str, current_user=Depends(get_current_user)):
-    return {"hashtags": ai.suggest_hashtags(description)}
+async def hashtags_endpoint(description: str, current_user=Depends(get_current_user)):
+    return {"hashtags": await ai.suggest_hashtags(description)}
 
 @router.post("/summarize")
-def summarize_endpoint(description: str, current_user=Depends(get_current_user)):
-    return {"summary": ai.summarize_artwork(description)}
+async def summarize_endpoint(description: str, current_user=Depends(get_current_user)):
+    return {"summary": await ai.summarize_artwork(description)}
 
 from fastapi import UploadFile, File
 
+QUALITY_BATCH_MAX = 50
+
+@router.post("/quality/batch")
+async def quality_batch(files: list[UploadFile] = File(...), current_user=Depends(get_current_user)):
+    # Bulk pre-check for seller uploads: clear accepts/rejects are decided locally.
+    if len(files) > QUALITY_BATCH_MAX:
+        raise HTTPException(status_code=400, detail=f"At most {QUALITY_BATCH_MAX} images per batch")
+    images = [await f.read() for f in files]
+    results = await ai.check_image_quality_batch(images)
+    return {"results": [{"filename": f.filename, **r} for f, r in zip(files, results)]}
+
 @router.post("/voice")
 async def voice_artwork(file: UploadFile = File(...), lang: str = "hi-IN", current_user=Depends(get_current_user)):
     # If you had a voice pathway earlier, keep it or remove. Here we stub return to avoid crashes.
     return {"message": "Voice-to-design not implemented in this build."}
+
+from backend.app import ai_cache
+
+@router.get("/cache/stats")
+def cache_stats(current_user=Depends(get_current_user)):
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Only admins can view AI cache stats")
+    return ai_cache.cache.snapshot()
+
+@router.get("/providers")
+def provider_status(current_user=Depends(get_current_user)):
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Only admins can view AI provider status")
+    return ai.provider_status()
@@ -1,49 +1,149 @@
 # at top: remove direct GenerativeModel usage
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
-from sqlalchemy.orm import Session
-from backend.app.database import get_db
+from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException
+from fastapi.responses import FileResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.app.database import get_async_read_db
 from backend.dependencies import get_current_user
 import backend.app.models as models
 import backend.app.ai as ai
-import os, uuid, random, io
+from backend.app import storage
+from backend.app.disk_cache import DiskCache
+import os, re, asyncio, hashlib
 from pathlib import Path
 
 router = APIRouter(prefix="/ar", tags=["ar"])
 
-UPLOAD_DIR = Path("static/ar_uploads")
-UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+# How many locally ranked candidates the LLM may re-rank (0 disables re-ranking).
+AR_SHORTLIST = int(os.getenv("AR_SHORTLIST", "8"))
+AR_TOP_N = 3
+
+PREVIEW_DIR = Path("static/ar_previews")
+preview_cache = DiskCache(PREVIEW_DIR, max_bytes=int(os.getenv("AR_PREVIEW_CACHE_MB", "256")) * 1024 * 1024)
+
+async def _llm_rerank(wall_bytes: bytes, shortlist: list[models.Artwork]) -> list[int]:
+    info = "\n".join([f"{a.id}: {a.title} (₹{a.price}) - {a.description}" for a in shortlist])
+    prompt = f"""Analyze this wall photo and pick the {AR_TOP_N} artworks below that best match its colors/style.
+Candidates:
+{info}
+Return only the IDs, best first, comma-separated."""
+    text = await ai._get_text_response([wall_bytes, prompt])
+    allowed = {a.id for a in shortlist}
+    picked = []
+    for m in re.findall(r"\d+", text or ""):
+        art_id = int(m)
+        if art_id in allowed and art_id not in picked:
+            picked.append(art_id)
+    return picked
 
 @router.post("/suggest")
 async def suggest_art_for_wall(
     wall: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user=Depends(get_current_user),
 ):
+    from backend.app import image_features  # Pillow/NumPy load on first use
+
+    # Save wall image (streamed, content-addressed)
+    stored = await storage.save_upload(wall, "wall")
+
     try:
-        # Save wall image
-        filename = f"{uuid.uuid4()}_{wall.filename}"
-        dest = UPLOAD_DIR / filename
-        b = await wall.read()
-        with open(dest, "wb") as f:
-            f.write(b)
+        wall_vec = await asyncio.to_thread(image_features.compute_features, stored.path)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Could not read the wall image")
 
-        artworks = db.query(models.Artwork).all()
-        if not artworks:
-            raise HTTPException(status_code=404, detail="No artworks found in catalog")
+    # Rank the whole catalog locally by palette/histogram/brightness similarity.
+    await db.run_sync(image_features.index.sync)
+    ranked = image_features.index.rank(wall_vec, k=max(AR_SHORTLIST, AR_TOP_N))
+    if not ranked:
+        raise HTTPException(status_code=404, detail="No artworks found in catalog")
 
-        info = "\n".join([f"{a.id}: {a.title} (₹{a.price}) - {a.description}" for a in artworks])
+    scores = dict(ranked)
+    by_id = {a.id: a for a in (await db.scalars(select(models.Artwork).where(models.Artwork.id.in_(scores)))).all()}
+    shortlist = [by_id[i] for i, _ in ranked if i in by_id]
 
-        prompt = f"""Analyze this wall photo and suggest 3 artworks from the catalog that best match colors/style.
-Catalog:
-{info}
-Return only the IDs and titles of the top 3 recommendations."""
-        text = ai._get_text_response([b, prompt])
-
-        return {"wall_uploaded": f"/{dest.as_posix()}", "recommendations": (text or "").strip()}
-    except Exception as e:
-        random_picks = random.sample(db.query(models.Artwork).all(), k=min(3, db.query(models.Artwork).count()))
-        return {
-            "wall_uploaded": f"/{dest.as_posix()}" if 'dest' in locals() else None,
-            "recommendations": f"⚠️ AI failed. Showing random picks.",
-            "fallback": [{"id": art.id, "title": art.title, "price": art.price} for art in random_picks],
-        }
+    # The LLM only re-orders the small shortlist; local order is the fallback.
+    source = "local"
+    order = [a.id for a in shortlist]
+    if AR_SHORTLIST > AR_TOP_N:
+        picked = await _llm_rerank(await asyncio.to_thread(stored.path.read_bytes), shortlist)
+        if picked:
+            source = "llm_rerank"
+            order = picked + [i for i in order if i not in picked]
+
+    top = [by_id[i] for i in order[:AR_TOP_N]]
+    return {
+        "wall_uploaded": stored.url,
+        "wall_hash": stored.sha256,
+        "recommendations": "\n".join(f"{a.id}: {a.title}" for a in top),
+        "matches": [
+            {"id": a.id, "title": a.title, "price": a.price, "image_url": a.image_url, "score": round(scores[a.id], 4)}
+            for a in top
+        ],
+        "source": source,
+    }
+
+@router.post("/preview")
+async def preview_artwork_on_wall(
+    artwork_id: int = Form(...),
+    wall: UploadFile = File(None),
+    wall_hash: str = Form(None),
+    scale: float = Form(0.35),
+    cx: float = Form(0.5),
+    cy: float = Form(0.4),
+    tilt: float = Form(0.0),
+    quad: str = Form(None),
+    format: str = Form("webp"),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user=Depends(get_current_user),
+):
+    """
+    Composite an artwork onto a wall photo. Send the wall once (file) and
+    reuse the returned X-Wall-Hash for further previews; identical requests
+    are served from the on-disk render cache.
+    """
+    import numpy as np
+    from backend.app import image_features, ar_preview
+
+    if format not in ar_preview.FORMATS:
+        raise HTTPException(status_code=400, detail="format must be webp or png")
+    if not (0.05 <= scale <= 1.0 and 0 <= cx <= 1 and 0 <= cy <= 1 and -0.9 <= tilt <= 0.9):
+        raise HTTPException(status_code=400, detail="scale must be 0.05-1, cx/cy 0-1, tilt -0.9-0.9")
+    try:
+        corners = ar_preview.parse_quad(quad)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if wall is not None:
+        stored = await storage.save_upload(wall, "wall")
+    else:
+        stored = storage.find("wall", wall_hash)
+        if stored is None:
+            raise HTTPException(status_code=404, detail="Unknown wall_hash; upload the wall image")
+    wall_hash, wall_path = stored.sha256, stored.path
+
+    art = await db.get(models.Artwork, artwork_id)
+    if not art:
+        raise HTTPException(status_code=404, detail="Artwork not found")
+    art_path = image_features.local_image_path(art.image_url)
+    if art_path is None:
+        raise HTTPException(status_code=422, detail="Artwork has no local image to preview")
+
+    # image_url is part of the key so a replaced artwork image never serves a stale render.
+    params = f"{scale:.3f}|{cx:.3f}|{cy:.3f}|{tilt:.3f}|{quad or ''}"
+    key = hashlib.sha256(f"{wall_hash}|{art.id}|{art.image_url}|{params}".encode()).hexdigest()
+    _, media_type, ext = ar_preview.FORMATS[format]
+
+    cached = preview_cache.get(key, ext)
+    if cached is None:
+        try:
+            data = await asyncio.to_thread(
+                ar_preview.render_preview, wall_path, art_path, scale, cx, cy, tilt, corners, format
+            )
+        except np.linalg.LinAlgError:
+            raise HTTPException(status_code=400, detail="Placement is degenerate; pick four distinct corners")
+        cached = await asyncio.to_thread(preview_cache.put, key, ext, data)
+        status = "MISS"
+    else:
+        status = "HIT"
+    return FileResponse(cached, media_type=media_type, headers={"X-Cache": status, "X-Wall-Hash": wall_hash})
@@ -1,65 +1,167 @@
 # backend/routes/artworks.py
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from sqlalchemy.orm import Session
-from pathlib import Path
-from backend.app.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Literal, Optional
+from backend.app.database import get_async_db, get_async_read_db
 import backend.app.models as models
 import backend.app.schemas as schemas
-from backend.dependencies import get_current_user
-import backend.app.ai as ai
-from math import sin, cos, asin, sqrt, radians
+from backend.dependencies import get_current_user, get_optional_user
+from backend.app.catalog_index import index as catalog_index, PENDING, listed
+from backend.app import jobs, storage, resumable, geo
+from backend.app.pagination import encode_cursor, decode_cursor
 
 router = APIRouter(prefix="/artworks", tags=["artworks"])
 
-ART_DIR = Path("static/artworks")
-ART_DIR.mkdir(parents=True, exist_ok=True)
-
 @router.post("/", response_model=schemas.ArtworkResponse)
 async def create_artwork(
     title: str = Form(...),
     price: float = Form(0.0),
     description: str = Form(""),
-    image: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    image: UploadFile = File(None),
+    upload_id: str = Form(None),  # finalized resumable upload, instead of `image`
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user),
 ):
     if current_user.role != "seller":
         raise HTTPException(status_code=403, detail="Only sellers can post artworks")
 
-    # Read image
-    raw = await image.read()
-
-    # 1) Quality check; if bad -> auto-enhance -> recheck
-    qc = ai.check_image_quality(raw)
-    if qc == "REJECT_QUALITY_ISSUE":
-        improved = ai.enhance_image(raw)
-        qc2 = ai.check_image_quality(improved)
-        if qc2 == "REJECT_QUALITY_ISSUE":
-            raise HTTPException(status_code=400, detail="Image too unclear even after enhancement. Please upload a clearer, well-lit photo.")
-        final_bytes = improved
+    # Stream the upload to content-addressed storage (size-capped, bounded memory)
+    if upload_id:
+        stored = resumable.claim(upload_id, "artwork", current_user.id)
+    elif image is not None:
+        stored = await storage.save_upload(image, "artwork")
     else:
-        final_bytes = raw
+        raise HTTPException(status_code=400, detail="Provide an image file or an upload_id")
 
-    # 2) AI description/price if not provided
-    final_description = description or ai.generate_description(title)
-    final_price = float(price) if float(price) > 0 else ai.recommend_price(title, final_description)
+    # Quality check, enhancement, description, price, hashtags and image
+    # variants all run in the "enrich_artwork" job (app/enrichment.py); the
+    # row and its job commit together, so the upload costs one DB write.
+    try:
+        art = models.Artwork(
+            title=title,
+            description=description or None,
+            price=float(price) if float(price) > 0 else 0.0,
+            image_url=stored.url,
+            image_status="processing",
+            enrichment_status=PENDING,
+            quality_status="pending",
+            owner_id=current_user.id,
+        )
+        db.add(art)
+        await db.flush()
+        jobs.enqueue(db, "enrich_artwork", {"artwork_id": art.id})
+        await db.commit()
+    except Exception:
+        if upload_id:
+            resumable.release(upload_id)
+        raise
+    if upload_id:
+        resumable.consume(upload_id)
+    await db.refresh(art)
+    catalog_index.add(art.id, art.title, art.description, pending=True)
+    jobs.notify()
+    return art
 
-    # 3) Save image
-    filename = f"{current_user.id}_{image.filename}"
-    dest = ART_DIR / filename
-    with open(dest, "wb") as f:
-        f.write(final_bytes)
-    image_url = f"/static/artworks/{filename}"
+@router.get("/", response_model=schemas.ArtworkPage)
+async def list_artworks(
+    sort: Literal["newest", "price_asc", "price_desc"] = "newest",
+    owner_id: Optional[int] = None,
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    verified_seller: Optional[bool] = None,
+    limit: int = Query(24, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user=Depends(get_optional_user),
+):
+    """
+    Keyset-paginated catalog. Pass `next_cursor` back as `cursor` (with the
+    same sort) for the next page; each page is one index range scan, so
+    latency doesn't grow with the page number or table size. Artworks still
+    waiting for enrichment (or failed) are listed only to their owner.
+    """
+    Artwork = models.Artwork
+    q = select(Artwork).where(listed(current_user.id if current_user else None))
+    if owner_id is not None:
+        q = q.where(Artwork.owner_id == owner_id)
+    if min_price is not None:
+        q = q.where(Artwork.price >= min_price)
+    if max_price is not None:
+        q = q.where(Artwork.price <= max_price)
+    if verified_seller is not None:
+        q = q.join(models.User, models.User.id == Artwork.owner_id).where(models.User.is_verified == verified_seller)
 
-    art = models.Artwork(
-        title=title,
-        description=final_description,
-        price=final_price,
-        image_url=image_url,
-        owner_id=current_user.id,
+    key = decode_cursor(cursor, sort)
+    if sort == "newest":
+        if key:
+            q = q.where(Artwork.id < key["id"])
+        q = q.order_by(Artwork.id.desc())
+    else:
+        if key and not isinstance(key.get("price"), (int, float)):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        after = tuple_(Artwork.price, Artwork.id)
+        if sort == "price_asc":
+            if key:
+                q = q.where(after > tuple_(key["price"], key["id"]))
+            q = q.order_by(Artwork.price.asc(), Artwork.id.asc())
+        else:
+            if key:
+                q = q.where(after < tuple_(key["price"], key["id"]))
+            q = q.order_by(Artwork.price.desc(), Artwork.id.desc())
+
+    rows = (await db.scalars(q.limit(limit + 1))).all()
+    items, more = rows[:limit], len(rows) > limit
+    next_cursor = None
+    if more:
+        last = items[-1]
+        next_cursor = encode_cursor(sort=sort, id=last.id, price=last.price) if sort != "newest" else encode_cursor(sort=sort, id=last.id)
+    return {"items": items, "next_cursor": next_cursor}
+
+@router.get("/nearby", response_model=list[schemas.NearbyArtwork])
+async def nearby_artworks(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(10.0, gt=0, le=geo.NEARBY_MAX_RADIUS_KM),
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user=Depends(get_optional_user),
+):
+    """Artworks by sellers within radius_km of (lat, lon), nearest seller first."""
+    User = models.User
+    sellers = await db.run_sync(
+        lambda sync_db: geo.nearby_users(
+            sync_db, lat, lon, radius_km,
+            query=sync_db.query(User.id, User.latitude, User.longitude).filter(User.role == "seller"),
+        )
     )
-    db.add(art)
-    db.commit()
-    db.refresh(art)
+    # Walk sellers nearest-first and stop once the page is full, so a dense
+    # city doesn't load every artwork in the radius.
+    Artwork = models.Artwork
+    out = []
+    for start in range(0, len(sellers), 50):
+        batch = dict(sellers[start:start + 50])
+        arts = (
+            await db.scalars(
+                select(Artwork).where(
+                    Artwork.owner_id.in_(batch),
+                    listed(current_user.id if current_user else None),
+                )
+            )
+        ).all()
+        arts.sort(key=lambda a: (batch[a.owner_id], -a.id))
+        for a in arts:
+            a.distance_km = round(batch[a.owner_id], 3)  # read by the response model only
+        out.extend(arts)
+        if len(out) >= limit:
+            break
+    return out[:limit]
+
+@router.get("/{artwork_id}", response_model=schemas.ArtworkResponse)
+async def get_artwork(artwork_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    """Single artwork; sellers poll this until enrichment_status leaves "pending_enrichment"."""
+    art = await db.get(models.Artwork, artwork_id)
+    if not art:
+        raise HTTPException(status_code=404, detail="Artwork not found")
     return art
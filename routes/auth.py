@@ -1,18 +1,18 @@
 # backend/routes/auth.py
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
-from sqlalchemy.orm import Session
-from pathlib import Path
-from backend.app.database import get_db
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.app.database import get_async_db
 import backend.app.auth_utils as auth_utils
 import backend.app.models as models
 import backend.app.schemas as schemas
-import traceback, uuid
+from backend.app import storage, resumable
+from jose import JWTError, jwt
+from datetime import datetime, timezone
+import traceback
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
-PROOFS_DIR = Path("static/proofs")
-PROOFS_DIR.mkdir(parents=True, exist_ok=True)
-
 @router.post("/register", response_model=schemas.UserResponse)
 async def register(
     # Required core fields
@@ -26,21 +26,23 @@ async def register(
     longitude: float = Form(None),
     address: str = Form(None),
     file: UploadFile = File(None),
-    db: Session = Depends(get_db)
+    upload_id: str = Form(None),  # finalized resumable "proof" upload, instead of `file`
+    db: AsyncSession = Depends(get_async_db)
 ):
+    claimed = False
     try:
         # Enforce unique phone
-        existing = db.query(models.User).filter(models.User.phone_number == phone_number).first()
+        existing = await db.scalar(select(models.User).where(models.User.phone_number == phone_number))
         if existing:
             raise HTTPException(status_code=400, detail="Phone number already registered")
 
         proof_url = None
-        if file:
-            fname = f"{uuid.uuid4()}_{file.filename}"
-            dest = PROOFS_DIR / fname
-            with open(dest, "wb") as f:
-                f.write(await file.read())
-            proof_url = f"/static/proofs/{fname}"
+        if upload_id:
+            proof_url = resumable.claim(upload_id, "proof").url
+            claimed = True
+        elif file:
+            stored = await storage.save_upload(file, "proof")
+            proof_url = stored.url
 
         # OPTION C: Auto-detect GPS is required for seller (unless a document is uploaded)
         if role == "seller":
@@ -52,7 +54,7 @@ async def register(
                     detail="For sellers: Location (auto-detected GPS) or a proof document is required at registration."
                 )
 
-        hashed_pw = auth_utils.hash_password(password)
+        hashed_pw = await auth_utils.hash_password_async(password)
         new_user = models.User(
             username=username,
             phone_number=phone_number,
@@ -65,20 +67,88 @@ async def register(
             verification_status="pending" if role == "seller" else "verified",
         )
         db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
+        await db.commit()
+        if claimed:
+            resumable.consume(upload_id)
+            claimed = False
+        await db.refresh(new_user)
         return new_user
 
     except Exception as e:
         traceback.print_exc()
+        if claimed:
+            resumable.release(upload_id)
         if isinstance(e, HTTPException):
             raise e
         raise HTTPException(status_code=500, detail=f"Server error: {str(e)}")
 
+def _issue_tokens(db: AsyncSession, db_user: models.User) -> tuple[dict, str]:
+    """New access + refresh pair; the refresh row is added to `db` for the caller to commit."""
+    access = auth_utils.create_access_token({"sub": str(db_user.id), "role": db_user.role})
+    refresh, jti, expires = auth_utils.create_refresh_token(db_user.id)
+    db.add(models.RefreshToken(jti=jti, user_id=db_user.id, expires_at=expires))
+    tokens = {
+        "access_token": access,
+        "refresh_token": refresh,
+        "token_type": "bearer",
+        "expires_in": auth_utils.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    }
+    return tokens, jti
+
+def _refresh_claims(token: str) -> dict:
+    try:
+        claims = jwt.decode(token, auth_utils.SECRET_KEY, algorithms=[auth_utils.ALGORITHM])
+    except JWTError:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired refresh token")
+    if claims.get("type") != "refresh" or not claims.get("jti"):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not a refresh token")
+    return claims
+
 @router.post("/login")
-def login(user: schemas.UserLogin, db: Session = Depends(get_db)):
-    db_user = db.query(models.User).filter(models.User.phone_number == user.phone_number).first()
-    if not db_user or not auth_utils.verify_password(user.password, db_user.password):
+async def login(user: schemas.UserLogin, db: AsyncSession = Depends(get_async_db)):
+    db_user = await db.scalar(select(models.User).where(models.User.phone_number == user.phone_number))
+    if not db_user or not await auth_utils.verify_password_async(user.password, db_user.password):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
-    token = auth_utils.create_access_token({"sub": str(db_user.id), "role": db_user.role})
-    return {"access_token": token, "token_type": "bearer"}
+    tokens, _ = _issue_tokens(db, db_user)
+    await db.commit()
+    return tokens
+
+@router.post("/refresh")
+async def refresh(body: schemas.RefreshRequest, db: AsyncSession = Depends(get_async_db)):
+    """
+    Trade a refresh token for a new access + refresh pair (no password, no
+    bcrypt). Each refresh token works once; presenting a used one again
+    means it leaked, so every session of that user is revoked.
+    """
+    claims = _refresh_claims(body.refresh_token)
+    row = await db.get(models.RefreshToken, claims["jti"])
+    if row is None or row.expires_at < datetime.now(timezone.utc):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired refresh token")
+    db_user = await db.get(models.User, row.user_id)
+    if db_user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+
+    tokens, new_jti = _issue_tokens(db, db_user)
+    # Conditional UPDATE so two concurrent refreshes can't both rotate the same token
+    user_id = row.user_id
+    rotated = await db.execute(
+        update(models.RefreshToken)
+        .where(models.RefreshToken.jti == row.jti, models.RefreshToken.revoked == False)  # noqa: E712
+        .values(revoked=True, replaced_by=new_jti)
+        .execution_options(synchronize_session=False)
+    )
+    if not rotated.rowcount:
+        await db.rollback()
+        await db.execute(update(models.RefreshToken).where(models.RefreshToken.user_id == user_id).values(revoked=True))
+        await db.commit()
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token already used; please log in again")
+    await db.commit()
+    return tokens
+
+@router.post("/logout")
+async def logout(body: schemas.RefreshRequest, db: AsyncSession = Depends(get_async_db)):
+    """Revoke a refresh token (the short-lived access token simply expires)."""
+    claims = _refresh_claims(body.refresh_token)
+    await db.execute(update(models.RefreshToken).where(models.RefreshToken.jti == claims["jti"]).values(revoked=True))
+    await db.commit()
+    return {"message": "Logged out"}
@@ -1,15 +1,39 @@
+import asyncio
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from backend.app.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.app.database import get_async_read_db
 from backend.dependencies import get_current_user
+from backend.app.catalog_index import index as catalog_index, listed, refresh as refresh_catalog, CHATBOT_TOP_K
+from backend.app.streaming import sse_response
 import backend.app.ai as ai
 import backend.app.models as models
 
 router = APIRouter(prefix="/chatbot", tags=["chatbot"])
 
+async def _relevant_artworks(db: AsyncSession, question: str, viewer_id: int) -> list[models.Artwork]:
+    # Only the top-K matches go into the prompt, never the whole catalog.
+    # Usually a cheap id > last-seen catch-up; built at startup (see main.py).
+    await asyncio.to_thread(refresh_catalog)
+    ranked = [art_id for art_id, _ in catalog_index.search(question, k=CHATBOT_TOP_K)]
+    visible = select(models.Artwork).where(listed(viewer_id))
+    if not ranked:
+        # Nothing matched lexically (e.g. "hi"): show the newest pieces instead.
+        return (await db.scalars(visible.order_by(models.Artwork.id.desc()).limit(CHATBOT_TOP_K))).all()
+    by_id = {a.id: a for a in await db.scalars(visible.where(models.Artwork.id.in_(ranked)))}
+    return [by_id[i] for i in ranked if i in by_id]
+
 @router.post("/ask")
-def chatbot_ask(question: str, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
-    artworks = db.query(models.Artwork).all()
+async def chatbot_ask(
+    question: str,
+    stream: bool = False,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user=Depends(get_current_user),
+):
+    artworks = await _relevant_artworks(db, question, current_user.id)
     catalog = "\n".join([f"- {a.title}: {a.description} (₹{a.price})" for a in artworks])
-    answer = ai.chat_reply(question, catalog)
+    if stream:
+        # text/event-stream of delta/fallback/done events; JSON stays the default.
+        return sse_response(ai.stream_chat_reply(question, catalog))
+    answer = await ai.chat_reply(question, catalog)
     return {"answer": answer}
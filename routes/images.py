@@ -0,0 +1,83 @@
+# backend/routes/images.py
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import FileResponse
+from pathlib import Path
+from backend.app.disk_cache import DiskCache
+from functools import lru_cache
+import os, re, asyncio, hashlib
+
+router = APIRouter(prefix="/img", tags=["images"])
+
+STATIC_ROOT = Path("static").resolve()
+# Catalog and AR imagery only; proof documents are private to their seller and admins.
+ALLOWED_ROOTS = ("artworks", "ar_uploads", "ar_previews")
+SOURCE_EXTS = {".jpg", ".jpeg", ".png", ".webp"}
+MAX_DIM = 2048
+
+IMG_CACHE_DIR = os.getenv("IMG_CACHE_DIR", "cache/img")
+img_cache = DiskCache(IMG_CACHE_DIR, max_bytes=int(os.getenv("IMG_CACHE_MB", "512")) * 1024 * 1024)
+
+MEDIA_TYPES = {"avif": "image/avif", "webp": "image/webp", "jpeg": "image/jpeg"}
+
+@lru_cache(maxsize=None)
+def avif_supported() -> bool:
+    from PIL import features  # Pillow loads on the first image request
+
+    try:
+        return bool(features.check("avif"))
+    except ValueError:  # Pillow too old to know about AVIF
+        return False
+
+def _negotiate(accept: str) -> str:
+    accept = accept.lower()
+    if "image/avif" in accept and avif_supported():
+        return "avif"
+    if "image/webp" in accept:
+        return "webp"
+    return "jpeg"
+
+def _resolve(path: str) -> Path:
+    src = (STATIC_ROOT / path).resolve()
+    if not any(src.is_relative_to(STATIC_ROOT / root) for root in ALLOWED_ROOTS):
+        raise HTTPException(status_code=404, detail="Image not found")
+    if src.suffix.lower() not in SOURCE_EXTS:
+        raise HTTPException(status_code=415, detail="Only images can be resized")
+    if not src.is_file():
+        raise HTTPException(status_code=404, detail="Image not found")
+    return src
+
+@router.get("/{size}/{path:path}")
+async def resized_image(size: str, path: str, request: Request):
+    """
+    /img/320x320/artworks/<file> -> image resized to fit 320x320 (0 = any),
+    re-encoded as AVIF/WebP/JPEG per Accept, from a size-bounded disk cache.
+    """
+    m = re.fullmatch(r"(\d+)x(\d+)", size)
+    if not m:
+        raise HTTPException(status_code=400, detail="size must be <width>x<height>, e.g. 320x320")
+    w, h = int(m.group(1)), int(m.group(2))
+    if w > MAX_DIM or h > MAX_DIM or (w == 0 and h == 0):
+        raise HTTPException(status_code=400, detail=f"width/height must be 0-{MAX_DIM}, not both 0")
+
+    src = _resolve(path)
+    fmt = _negotiate(request.headers.get("accept", ""))
+    st = src.stat()
+    # The source's identity + params fully determine the bytes, so this is a strong ETag.
+    key = hashlib.sha256(f"{src}|{st.st_size}|{st.st_mtime_ns}|{w}x{h}|{fmt}".encode()).hexdigest()
+    etag = f'"{key[:32]}"'
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=86400", "Vary": "Accept"}
+
+    if etag in [t.strip() for t in request.headers.get("if-none-match", "").split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    ext = f".{fmt}"
+    cached = img_cache.get(key, ext)
+    if cached is None:
+        from backend.app import image_pipeline  # Pillow loads on the first miss
+
+        try:
+            data = await image_pipeline.run(image_pipeline.resize_image, str(src), w, h, fmt)
+        except Exception:
+            raise HTTPException(status_code=422, detail="Could not decode source image")
+        cached = await asyncio.to_thread(img_cache.put, key, ext, data)
+    return FileResponse(cached, media_type=MEDIA_TYPES[fmt], headers=headers)
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from backend.app.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.app.database import get_async_db, get_async_read_db
 import backend.app.models as models
 import backend.app.schemas as schemas
 from backend.dependencies import get_current_user
@@ -8,10 +9,10 @@ from backend.dependencies import get_current_user
 router = APIRouter(prefix="/notifications", tags=["notifications"])
 
 @router.post("/", response_model=schemas.NotificationResponse)
-def create_notification(
+async def create_notification(
     user_id: int,
     message: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user),
 ):
     if current_user.role != "admin":
@@ -19,13 +20,13 @@ def create_notification(
 
     new_note = models.Notification(user_id=user_id, message=message)
     db.add(new_note)
-    db.commit()
-    db.refresh(new_note)
+    await db.commit()
+    await db.refresh(new_note)
     return new_note
 
 @router.get("/my", response_model=list[schemas.NotificationResponse])
-def my_notifications(
-    db: Session = Depends(get_db),
+async def my_notifications(
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: models.User = Depends(get_current_user),
 ):
-    return db.query(models.Notification).filter(models.Notification.user_id == current_user.id).all()
+    return (await db.scalars(select(models.Notification).where(models.Notification.user_id == current_user.id))).all()
@@ -1,76 +1,200 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from backend.app.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select, update, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Literal, Optional
+from datetime import date, datetime, timedelta, timezone
+import os
+from backend.app.database import get_async_db, get_async_read_db
 import backend.app.models as models
 import backend.app.schemas as schemas
+from backend.app.pagination import encode_cursor, decode_cursor
+from backend.app import rollups
 from backend.dependencies import get_current_user
 
 router = APIRouter(prefix="/orders", tags=["orders"])
 
+SALES_REPORT_MAX_DAYS = int(os.getenv("SALES_REPORT_MAX_DAYS", "731"))
+
+OrderStatus = Literal["pending", "confirmed", "shipped", "delivered", "cancelled"]
+# Customers may only withdraw their own order; fulfilment is up to the seller.
+CUSTOMER_STATUSES = {"cancelled"}
+
 @router.post("/", response_model=schemas.OrderResponse)
-def create_order(
+async def create_order(
     artwork_id: int,
-    quantity: int = 1,
-    db: Session = Depends(get_db),
+    quantity: int = Query(1, ge=1),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user),
 ):
     if current_user.role != "customer":
         raise HTTPException(status_code=403, detail="Only customers can place orders")
 
-    artwork = db.query(models.Artwork).filter(models.Artwork.id == artwork_id).first()
+    artwork = await db.get(models.Artwork, artwork_id)
     if not artwork:
         raise HTTPException(status_code=404, detail="Artwork not found")
 
     new_order = models.Order(
         customer_id=current_user.id,
         artwork_id=artwork.id,
+        seller_id=artwork.owner_id,
         quantity=quantity,
         status="pending",
+        unit_price=artwork.price,
+        created_at=datetime.now(timezone.utc),
     )
     db.add(new_order)
-    db.commit()
-    db.refresh(new_order)
+    # Same transaction: the rollup counters commit (or roll back) with the order
+    rollup = rollups.order_created(new_order)
+    if rollup is not None:
+        await db.execute(rollup)
+    await db.commit()
+    await db.refresh(new_order)
     return new_order
 
-@router.get("/my", response_model=list[schemas.OrderResponse])
-def my_orders(
-    db: Session = Depends(get_db),
+async def _order_page(db: AsyncSession, owner_col, owner_id: int, limit: int, cursor: Optional[str]) -> dict:
+    """Newest-first keyset page of orders where owner_col == owner_id, on the (owner_col, id) index."""
+    q = select(models.Order).where(owner_col == owner_id)
+    key = decode_cursor(cursor, "newest")
+    if key:
+        q = q.where(models.Order.id < key["id"])
+    rows = (await db.scalars(q.order_by(models.Order.id.desc()).limit(limit + 1))).all()
+    items = rows[:limit]
+    next_cursor = encode_cursor(sort="newest", id=items[-1].id) if len(rows) > limit else None
+    return {"items": items, "next_cursor": next_cursor}
+
+@router.get("/my", response_model=schemas.OrderPage)
+async def my_orders(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: models.User = Depends(get_current_user),
 ):
     if current_user.role != "customer":
         raise HTTPException(status_code=403, detail="Only customers can view their orders")
-    return db.query(models.Order).filter(models.Order.customer_id == current_user.id).all()
+    return await _order_page(db, models.Order.customer_id, current_user.id, limit, cursor)
 
-@router.get("/sales", response_model=list[schemas.OrderResponse])
-def my_sales(
-    db: Session = Depends(get_db),
+@router.get("/sales", response_model=schemas.OrderPage)
+async def my_sales(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: models.User = Depends(get_current_user),
 ):
     if current_user.role != "seller":
         raise HTTPException(status_code=403, detail="Only sellers can view sales")
-    return (
-        db.query(models.Order)
-        .join(models.Artwork)
-        .filter(models.Artwork.owner_id == current_user.id)
-        .all()
-    )
+    return await _order_page(db, models.Order.seller_id, current_user.id, limit, cursor)
+
+def _totals(rows: list[dict]) -> dict:
+    return {
+        "orders": sum(r["orders"] for r in rows),
+        "units": sum(r["units"] for r in rows),
+        "revenue": round(sum(r["revenue"] for r in rows), 2),
+    }
+
+def _sums():
+    R = models.SalesRollup
+    return func.sum(R.orders), func.sum(R.units), func.sum(R.revenue)
+
+@router.get("/sales/summary", response_model=schemas.SalesSummary)
+async def sales_summary(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """Order count, units and revenue per status over all time, from the sales rollups."""
+    if current_user.role != "seller":
+        raise HTTPException(status_code=403, detail="Only sellers can view sales")
+    R = models.SalesRollup
+    orders, units, revenue = _sums()
+    rows = (
+        await db.execute(
+            select(R.status, orders, units, revenue)
+            .where(R.seller_id == current_user.id)
+            .group_by(R.status)
+            .having(orders > 0)
+            .order_by(R.status)
+        )
+    ).all()
+    by_status = [
+        {"status": status, "orders": n, "units": u, "revenue": round(rev, 2)}
+        for status, n, u, rev in rows
+    ]
+    return {"by_status": by_status, **_totals(by_status)}
+
+@router.get("/sales/report", response_model=schemas.SalesReport)
+async def sales_report(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    status: Optional[OrderStatus] = None,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """
+    Orders, units and revenue per day and per artwork for [start, end]
+    (UTC days the orders were placed; default the last 30), optionally for
+    one status. Read from the sales rollups, so the cost follows the number
+    of days in the range, not the number of orders.
+    """
+    if current_user.role != "seller":
+        raise HTTPException(status_code=403, detail="Only sellers can view sales")
+    end = end or datetime.now(timezone.utc).date()
+    start = start or end - timedelta(days=29)
+    if start > end or (end - start).days >= SALES_REPORT_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"start must be before end and the range at most {SALES_REPORT_MAX_DAYS} days")
+
+    R = models.SalesRollup
+    where = [R.seller_id == current_user.id, R.day >= start, R.day <= end]
+    if status is not None:
+        where.append(R.status == status)
+    orders, units, revenue = _sums()
+    by_day = (
+        await db.execute(select(R.day, orders, units, revenue).where(*where).group_by(R.day).having(orders > 0).order_by(R.day))
+    ).all()
+    by_artwork = (
+        await db.execute(
+            select(R.artwork_id, orders, units, revenue)
+            .where(*where)
+            .group_by(R.artwork_id)
+            .having(orders > 0)
+            .order_by(revenue.desc(), R.artwork_id)
+        )
+    ).all()
+    days = [{"day": d, "orders": n, "units": u, "revenue": round(rev, 2)} for d, n, u, rev in by_day]
+    artworks = [{"artwork_id": a, "orders": n, "units": u, "revenue": round(rev, 2)} for a, n, u, rev in by_artwork]
+    return {"start": start, "end": end, "days": days, "artworks": artworks, **_totals(days)}
 
 @router.post("/{order_id}/update_status", response_model=schemas.OrderResponse)
-def update_order_status(
+async def update_order_status(
     order_id: int,
-    status: str,
-    db: Session = Depends(get_db),
+    status: OrderStatus,
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user),
 ):
-    order = db.query(models.Order).filter(models.Order.id == order_id).first()
+    order = await db.get(models.Order, order_id)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
 
-    artwork = db.query(models.Artwork).filter(models.Artwork.id == order.artwork_id).first()
-    if current_user.role == "seller" and artwork.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="You cannot update this order")
+    # orders.seller_id saves the second lookup of the artwork's owner
+    if current_user.role != "admin" and order.seller_id != current_user.id:
+        if order.customer_id != current_user.id:
+            raise HTTPException(status_code=403, detail="You cannot update this order")
+        if status not in CUSTOMER_STATUSES:
+            raise HTTPException(status_code=403, detail="Customers can only cancel their orders")
 
-    order.status = status
-    db.commit()
-    db.refresh(order)
+    old_status = order.status
+    if status != old_status:
+        # Conditional UPDATE: of two concurrent changes from the same status,
+        # only one may move the order's rollup counters.
+        moved = await db.execute(
+            update(models.Order)
+            .where(models.Order.id == order.id, models.Order.status == old_status)
+            .values(status=status)
+        )
+        if not moved.rowcount:
+            await db.rollback()
+            raise HTTPException(status_code=409, detail="Order status changed concurrently; reload and retry")
+        rollup = rollups.status_changed(order, old_status)
+        if rollup is not None:
+            await db.execute(rollup)
+    await db.commit()
+    await db.refresh(order)
     return order
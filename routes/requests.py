@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from backend.app.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.app.database import get_async_db, get_async_read_db
 import backend.app.models as models
 import backend.app.schemas as schemas
 from backend.dependencies import get_current_user
@@ -8,9 +9,9 @@ from backend.dependencies import get_current_user
 router = APIRouter(prefix="/requests", tags=["requests"])
 
 @router.post("/", response_model=schemas.RequestResponse)
-def create_request(
+async def create_request(
     req: schemas.ArtworkBase,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user),
 ):
     if current_user.role != "customer":
@@ -22,10 +23,10 @@ def create_request(
         requester_id=current_user.id,
     )
     db.add(new_request)
-    db.commit()
-    db.refresh(new_request)
+    await db.commit()
+    await db.refresh(new_request)
     return new_request
 
 @router.get("/", response_model=list[schemas.RequestResponse])
-def list_requests(db: Session = Depends(get_db)):
-    return db.query(models.ArtRequest).all() 
+async def list_requests(db: AsyncSession = Depends(get_async_read_db)):
+    return (await db.scalars(select(models.ArtRequest))).all() 
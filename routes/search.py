@@ -0,0 +1,27 @@
+# backend/routes/search.py
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Literal
+from backend.app.database import get_async_read_db
+from backend.app import search as fts
+from backend.dependencies import get_optional_user
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+@router.get("/")
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    scope: Literal["all", "artworks", "requests"] = "all",
+    limit: int = Query(20, ge=1, le=50),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user=Depends(get_optional_user),
+):
+    """
+    Full-text search over artworks and art requests (SQLite FTS5).
+    All words must match, the last one as a prefix; results are bm25-ranked
+    and `title` / `snippet` are HTML-escaped with matches wrapped in <mark>.
+    """
+    if not fts.available:
+        raise HTTPException(status_code=503, detail="Full-text search is not available on this database")
+    viewer_id = current_user.id if current_user else None
+    return {"query": q, **await db.run_sync(fts.search, q, scope, limit, viewer_id)}
@@ -1,28 +1,33 @@
 # backend/routes/seed.py
 
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from backend.app.database import get_db
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.app.database import get_async_db
 import backend.app.models as models
 import backend.app.auth_utils as auth_utils
+from backend.app.user_cache import cache as user_cache
 
 router = APIRouter(prefix="/seed", tags=["seed"])
 
 @router.post("/")
-def seed_data(db: Session = Depends(get_db)):
+async def seed_data(db: AsyncSession = Depends(get_async_db)):
     # Clear existing data (optional for demo resets)
-    db.query(models.Order).delete()
-    db.query(models.Notification).delete()
-    db.query(models.ArtRequest).delete()
-    db.query(models.Artwork).delete()
-    db.query(models.User).delete()
-    db.commit()
+    # Refresh tokens and jobs go too: SQLite reuses the freed ids, so a stale
+    # token or enrich_artwork job would act on whichever new row gets the id.
+    for model in (
+        models.SalesRollup, models.Order, models.Notification, models.ArtRequest,
+        models.RefreshToken, models.Job, models.Artwork, models.User,
+    ):
+        await db.execute(delete(model))
+    await db.commit()
+    user_cache.clear()  # user ids get reused below
 
     # Create Admin
     admin = models.User(
         username="admin",
         email="admin@example.com",
-        password=auth_utils.hash_password("admin123"),
+        password=await auth_utils.hash_password_async("admin123"),
         role="admin",
         is_verified=True,
         verification_status="verified",
@@ -33,7 +38,7 @@ def seed_data(db: Session = Depends(get_db)):
     seller = models.User(
         username="seller",
         email="seller@example.com",
-        password=auth_utils.hash_password("seller123"),
+        password=await auth_utils.hash_password_async("seller123"),
         role="seller",
         is_verified=True,
         verification_status="verified",
@@ -49,7 +54,7 @@ def seed_data(db: Session = Depends(get_db)):
     customer = models.User(
         username="customer",
         email="customer@example.com",
-        password=auth_utils.hash_password("customer123"),
+        password=await auth_utils.hash_password_async("customer123"),
         role="customer",
         is_verified=True,
         verification_status="verified",
@@ -60,10 +65,7 @@ def seed_data(db: Session = Depends(get_db)):
     )
 
     db.add_all([admin, seller, customer])
-    db.commit()
-    db.refresh(admin)
-    db.refresh(seller)
-    db.refresh(customer)
+    await db.commit()
 
     # Add Artwork for seller
     artwork = models.Artwork(
@@ -84,9 +86,7 @@ def seed_data(db: Session = Depends(get_db)):
     )
     
     db.add_all([artwork, artwork2])
-    db.commit()
-    db.refresh(artwork)
-    db.refresh(artwork2)
+    await db.commit()
 
     return {
         "message": "Seed data created!",
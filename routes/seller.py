@@ -1,31 +1,75 @@
 # backend/routes/seller.py
 
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException
-from sqlalchemy.orm import Session
-from backend.app.database import get_db
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.app.database import get_async_db, get_async_read_db
 import backend.app.models as models
 from backend.dependencies import get_current_user
+import backend.app.schemas as schemas
+from backend.app import storage, resumable, geo
+from backend.app.user_cache import cache as user_cache
 
 router = APIRouter(prefix="/seller", tags=["seller"])
 
 @router.post("/upload_additional_proof") # 👈 RENAMED ENDPOINT
 async def upload_additional_proof(
-    file: UploadFile = File(...),
+    file: UploadFile = File(None),
+    upload_id: str = Form(None),  # finalized resumable "proof" upload, instead of `file`
     proof_type: str = "Additional Document",
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_user),
 ):
     if current_user.role != "seller":
         raise HTTPException(status_code=403, detail="Only sellers can upload proof")
 
-    # ⚠️ Placeholder: In production, save the file and get a secure URL.
     # The registration proof_url is for GST/PAN. This overwrites it for simplicity.
-    fake_url = f"/static/proofs/{current_user.id}_{proof_type.replace(' ', '_')}_{file.filename}"
-    
-    current_user.proof_url = fake_url 
-    current_user.verification_status = "pending"
+    if upload_id:
+        stored = resumable.claim(upload_id, "proof", current_user.id)
+    elif file is not None:
+        stored = await storage.save_upload(file, "proof")
+    else:
+        raise HTTPException(status_code=400, detail="Provide a file or an upload_id")
 
-    db.commit()
-    db.refresh(current_user)
+    try:
+        # current_user is a cached read-only snapshot; update the row itself
+        seller = await db.get(models.User, current_user.id)
+        seller.proof_url = stored.url
+        seller.verification_status = "pending"
+        await db.commit()
+    except Exception:
+        if upload_id:
+            resumable.release(upload_id)
+        raise
+    if upload_id:
+        resumable.consume(upload_id)
+    user_cache.invalidate_user(seller.id)
 
-    return {"message": f"{proof_type} proof uploaded, awaiting verification", "proof_url": fake_url}
\ No newline at end of file
+    return {"message": f"{proof_type} proof uploaded, awaiting verification", "proof_url": stored.url}
+
+@router.get("/nearby", response_model=list[schemas.NearbySeller])
+async def nearby_sellers(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(10.0, gt=0, le=geo.NEARBY_MAX_RADIUS_KM),
+    verified_only: bool = True,
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """Sellers within radius_km of (lat, lon), nearest first (exact coordinates are not returned)."""
+    User = models.User
+    def candidates(sync_db):
+        q = sync_db.query(User.id, User.latitude, User.longitude).filter(User.role == "seller")
+        if verified_only:
+            q = q.filter(User.is_verified == True)  # noqa: E712
+        return geo.nearby_users(sync_db, lat, lon, radius_km, query=q)[:limit]
+
+    found = await db.run_sync(candidates)
+    if not found:
+        return []
+    by_id = {u.id: u for u in await db.scalars(select(User).where(User.id.in_([uid for uid, _ in found])))}
+    return [
+        {"id": uid, "username": by_id[uid].username, "address": by_id[uid].address,
+         "is_verified": by_id[uid].is_verified, "distance_km": round(dist, 3)}
+        for uid, dist in found if uid in by_id
+    ]
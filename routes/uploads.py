@@ -0,0 +1,33 @@
+# backend/routes/uploads.py
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import BaseModel
+from typing import Optional
+from backend.dependencies import get_optional_user
+from backend.app import resumable
+
+router = APIRouter(prefix="/uploads", tags=["uploads"])
+
+class UploadSessionCreate(BaseModel):
+    kind: str  # "artwork" | "proof" | "wall"
+    filename: str
+    size: Optional[int] = None  # total bytes, if known; finalize then checks it
+
+@router.post("/")
+def create_upload(body: UploadSessionCreate, current_user=Depends(get_optional_user)):
+    # Proofs are uploaded during registration, before the user has a token.
+    if current_user is None and body.kind != "proof":
+        raise HTTPException(status_code=401, detail="Login required for this upload kind")
+    return resumable.create(body.kind, body.filename, body.size, current_user.id if current_user else None)
+
+@router.get("/{upload_id}")
+def upload_status(upload_id: str):
+    return resumable.status(upload_id)
+
+@router.put("/{upload_id}")
+async def upload_chunk(upload_id: str, offset: int, request: Request):
+    """Raw request body is the chunk; `offset` must equal the current offset."""
+    return await resumable.append(upload_id, offset, request.stream())
+
+@router.post("/{upload_id}/finalize")
+async def finalize_upload(upload_id: str):
+    return await resumable.finalize(upload_id)
@@ -0,0 +1,63 @@
+# backend/tests/conftest.py
+"""
+Point the app at a throwaway SQLite file and working directory before any
+backend module is imported: DATABASE_URL is read at import time, and
+static/ and cache/ are relative paths.
+"""
+import itertools
+import os
+import tempfile
+
+_tmp = tempfile.mkdtemp(prefix="localartist-tests-")
+os.chdir(_tmp)
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}/test.db"
+os.environ.pop("READ_DATABASE_URL", None)
+os.environ["JOB_WORKERS"] = "0"
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+import backend.app.models as models  # noqa: E402
+from backend.app import auth_utils  # noqa: E402
+from backend.app.database import SessionLocal  # noqa: E402
+
+
+_ids = itertools.count(1)
+
+
+@pytest.fixture(scope="session")
+def client():
+    from backend.main import app
+
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def db(client):
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def make_user(client):
+    """make_user(role, **columns) -> (user, auth headers); usernames and phones are unique."""
+    def make(role="customer", **kw):
+        n = next(_ids)
+        kw.setdefault("username", f"{role}{n}")
+        kw.setdefault("phone_number", f"+9100000{n:05d}")
+        kw.setdefault("is_verified", True)
+        kw.setdefault("verification_status", "verified")
+        with SessionLocal() as s:
+            user = models.User(password=auth_utils.hash_password("pw"), role=role, **kw)
+            s.add(user)
+            s.commit()
+            s.refresh(user)
+            s.expunge(user)
+        token = auth_utils.create_access_token({"sub": str(user.id), "role": role})
+        return user, {"Authorization": f"Bearer {token}"}
+
+    return make
@@ -0,0 +1,101 @@
+# backend/tests/test_ai_batch.py
+import asyncio
+import json
+
+import pytest
+
+from backend.app import ai
+from backend.app.ai_batch import MicroBatcher, build_batch_prompt, parse_batch_answer
+
+
+def test_build_batch_prompt_numbers_tasks():
+    prompt = build_batch_prompt(["describe A", "describe B"])
+    assert "2 independent tasks" in prompt
+    assert prompt.index("### Task 1\ndescribe A") < prompt.index("### Task 2\ndescribe B")
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('["one", "two"]', ["one", "two"]),
+    ('```json\n["one", "two"]\n```', ["one", "two"]),
+    ('Sure! Here you go: ["one", "two"] Hope that helps.', ["one", "two"]),
+    ('[["#clay", "#lamp"], 1499]', ["#clay, #lamp", "1499"]),
+    ('["one", ""]', ["one", None]),
+    ('["one", null]', ["one", None]),
+    ('["one", true]', ["one", None]),
+])
+def test_parse_batch_answer(text, expected):
+    assert parse_batch_answer(text, 2) == expected
+
+
+@pytest.mark.parametrize("text", ["", "no json here", '["one"]', '["a", "b", "c"]', '{"1": "a", "2": "b"}', '["a", "b"'])
+def test_misaligned_answers_are_all_dropped(text):
+    assert parse_batch_answer(text, 2) == [None, None]
+
+
+def test_microbatcher_groups_concurrent_prompts():
+    calls = []
+
+    async def run_batch(prompts):
+        calls.append(prompts)
+        return [p.upper() for p in prompts]
+
+    async def scenario():
+        batcher = MicroBatcher("t", run_batch, window=0.01, max_batch=3)
+        answers = await asyncio.gather(*[batcher.submit(p) for p in ["a", "b", "c", "d"]])
+        return batcher, answers
+
+    batcher, answers = asyncio.run(scenario())
+    assert answers == ["A", "B", "C", "D"]
+    assert calls == [["a", "b", "c"], ["d"]]  # max_batch flushes early, the window flushes the rest
+    assert batcher.stats == {"batches": 2, "items": 4, "unparsed_items": 0}
+
+
+def test_microbatcher_resolves_failures_to_none():
+    async def short(prompts):
+        return ["only one"]
+
+    async def broken(prompts):
+        raise RuntimeError("provider down")
+
+    async def scenario(run_batch):
+        batcher = MicroBatcher("t", run_batch, window=0.01)
+        return await asyncio.gather(*[batcher.submit(p) for p in ["a", "b"]])
+
+    assert asyncio.run(scenario(short)) == ["only one", None]
+    assert asyncio.run(scenario(broken)) == [None, None]
+
+
+def test_unparsed_items_retry_alone(monkeypatch):
+    prompts_seen = []
+
+    async def fake_response(parts, timeout=None, hedge=False):
+        prompts_seen.append(parts[0])
+        if "### Task 2" in parts[0]:
+            return json.dumps(["batched A", ""])  # second answer is unusable
+        return f"single {parts[0]}"
+
+    monkeypatch.setattr(ai, "AI_MICROBATCH", True)
+    monkeypatch.setattr(ai, "_get_text_response", fake_response)
+    monkeypatch.setitem(ai._batchers, "generate_description", MicroBatcher("t", ai._run_prompt_batch, window=0.01))
+
+    async def scenario():
+        return await asyncio.gather(
+            ai._batched_text_response("generate_description", ["A"]),
+            ai._batched_text_response("generate_description", ["B"]),
+        )
+
+    assert asyncio.run(scenario()) == ["batched A", "single B"]
+    assert len(prompts_seen) == 2
+
+
+def test_provider_failure_skips_per_item_retry(monkeypatch):
+    calls = []
+
+    async def down(parts, timeout=None, hedge=False):
+        calls.append(parts)
+        return ""
+
+    monkeypatch.setattr(ai, "_get_text_response", down)
+
+    assert asyncio.run(ai._run_prompt_batch(["a", "b", "c"])) == ["", "", ""]
+    assert len(calls) == 1
@@ -0,0 +1,20 @@
+# backend/tests/test_ar_preview.py
+import pytest
+
+from backend.app.ar_preview import parse_quad
+
+
+def test_parse_quad_accepts_perspective_quad():
+    assert parse_quad("0.1,0.1,0.9,0.2,0.85,0.8,0.1,0.9") == [(0.1, 0.1), (0.9, 0.2), (0.85, 0.8), (0.1, 0.9)]
+
+
+@pytest.mark.parametrize("quad", [
+    "0,0,0,0,0,0,0,0",                  # all zeros
+    "0.1,0.1,0.5,0.1,0.9,0.1,0.2,0.1",  # collinear
+    "0.1,0.1,0.1,0.1,0.9,0.9,0.1,0.9",  # repeated point
+    "0.1,0.1,0.9,0.1,0.1,0.9,0.9,0.9",  # self-intersecting
+    "0.1,0.1,0.9,0.1,0.5,0.3,0.1,0.9",  # non-convex
+])
+def test_parse_quad_rejects_degenerate(quad):
+    with pytest.raises(ValueError):
+        parse_quad(quad)
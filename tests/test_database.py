@@ -0,0 +1,48 @@
+# backend/tests/test_database.py
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from backend.app import database
+
+
+def _pragma(conn, name):
+    return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def test_write_engine_profile(client):
+    with database.engine.connect() as conn:
+        assert _pragma(conn, "journal_mode") == "wal"
+        assert _pragma(conn, "synchronous") == 1  # NORMAL
+        assert _pragma(conn, "busy_timeout") == database.SQLITE_BUSY_TIMEOUT_MS
+        assert _pragma(conn, "query_only") == 0
+
+
+def test_read_engine_rejects_writes(client):
+    with database.read_engine.connect() as conn:
+        assert _pragma(conn, "query_only") == 1
+        assert conn.execute(text("SELECT COUNT(*) FROM users")).scalar() >= 0
+        with pytest.raises(OperationalError, match="readonly"):
+            conn.execute(text("INSERT INTO art_requests (title) VALUES ('nope')"))
+        with pytest.raises(OperationalError, match="readonly"):
+            conn.execute(text("DELETE FROM users"))
+
+
+def test_async_read_session_rejects_writes(client):
+    async def scenario():
+        async with database.AsyncReadSessionLocal() as db:
+            assert (await db.execute(text("PRAGMA query_only"))).scalar() == 1
+            with pytest.raises(OperationalError, match="readonly"):
+                await db.execute(text("UPDATE artworks SET price = 0"))
+            await db.rollback()
+
+    asyncio.run(scenario())
+
+
+def test_read_engine_sees_committed_writes(client):
+    with database.engine.begin() as conn:
+        conn.execute(text("INSERT INTO art_requests (title) VALUES ('read-after-write')"))
+    with database.read_engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM art_requests WHERE title = 'read-after-write'")).scalar() == 1
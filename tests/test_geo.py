@@ -0,0 +1,87 @@
+# backend/tests/test_geo.py
+import math
+import random
+
+import numpy as np
+import pytest
+
+from backend.app import geo
+
+
+_H5 = geo.cell_size(5)[0]
+
+
+def _destination(lat, lon, bearing_deg, dist_km):
+    """Point dist_km from (lat, lon) along bearing_deg (spherical earth, same radius as geo)."""
+    d = dist_km / geo.EARTH_RADIUS_KM
+    b, p1, l1 = math.radians(bearing_deg), math.radians(lat), math.radians(lon)
+    p2 = math.asin(math.sin(p1) * math.cos(d) + math.cos(p1) * math.sin(d) * math.cos(b))
+    l2 = l1 + math.atan2(math.sin(b) * math.sin(d) * math.cos(p1), math.cos(d) - math.sin(p1) * math.sin(p2))
+    return math.degrees(p2), (math.degrees(l2) + 540.0) % 360.0 - 180.0
+
+
+def _assert_covered(lat, lon, radius_km, points):
+    cells = geo.cover(lat, lon, radius_km)
+    assert len(cells) <= geo.MAX_COVER_CELLS
+    for plat, plon in points:
+        dist = geo.haversine_km(lat, lon, np.array([plat]), np.array([plon]))[0]
+        if dist <= radius_km:
+            h = geo.encode(plat, plon)
+            assert any(h.startswith(c) for c in cells), (lat, lon, radius_km, plat, plon)
+
+
+def _ring(lat, lon, radius_km, n=72):
+    # Just inside the radius, all the way round: the points most likely to fall outside the cover.
+    return [_destination(lat, lon, 360.0 * i / n, radius_km * 0.999) for i in range(n)]
+
+
+def test_encode_known_values():
+    assert geo.encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    assert geo.encode(-25.382708, -49.265506, 8) == "6gkzwgjz"
+
+
+@pytest.mark.parametrize("lat, lon", [
+    (0.0, 0.0),                            # corner shared by four top-level cells
+    (45.0, 22.5),                          # on a precision-1 and -2 boundary
+    (math.floor(12.97 / _H5) * _H5, 77.59),  # on a precision-5 row edge
+    (-33.86, 151.2),
+])
+@pytest.mark.parametrize("radius_km", [0.05, 1.0, 10.0, 75.0, 200.0])
+def test_cover_contains_every_point_in_radius_at_cell_edges(lat, lon, radius_km):
+    _assert_covered(lat, lon, radius_km, _ring(lat, lon, radius_km))
+
+
+@pytest.mark.parametrize("lon", [179.999, -179.999, 180.0 - 1e-9, 179.5])
+@pytest.mark.parametrize("radius_km", [0.5, 5.0, 50.0, 200.0])
+def test_cover_wraps_the_antimeridian(lon, radius_km):
+    _assert_covered(-17.0, lon, radius_km, _ring(-17.0, lon, radius_km))
+
+
+def test_cover_near_the_poles():
+    for lat in (89.9, -89.95, 80.0):
+        for radius_km in (1.0, 50.0, 200.0):
+            _assert_covered(lat, 10.0, radius_km, _ring(lat, 10.0, radius_km))
+
+
+def test_cover_random_points():
+    rnd = random.Random(19)
+    for _ in range(300):
+        lat, lon = rnd.uniform(-85, 85), rnd.uniform(-180, 180)
+        radius_km = rnd.choice([0.2, 3.0, 25.0, 150.0])
+        points = [_destination(lat, lon, rnd.uniform(0, 360), radius_km * rnd.uniform(0.0, 1.0)) for _ in range(20)]
+        _assert_covered(lat, lon, radius_km, points)
+
+
+def test_nearby_sellers_across_the_antimeridian(client, make_user):
+    east, _ = make_user("seller", latitude=-16.5, longitude=179.99, address="Taveuni east")
+    west, _ = make_user("seller", latitude=-16.5, longitude=-179.99, address="Taveuni west")
+    far, _ = make_user("seller", latitude=-16.5, longitude=-179.5, address="Lau")
+    make_user("customer", latitude=-16.5, longitude=-179.995)  # not a seller
+
+    r = client.get("/seller/nearby", params={"lat": -16.5, "lon": 179.995, "radius_km": 5})
+    assert r.status_code == 200
+    found = {s["id"]: s["distance_km"] for s in r.json()}
+    assert set(found) == {east.id, west.id}
+    assert found[east.id] == pytest.approx(0.533, abs=0.01)
+    assert found[west.id] == pytest.approx(1.599, abs=0.01)
+    assert far.id not in found
@@ -0,0 +1,80 @@
+# backend/tests/test_image_quality.py
+import asyncio
+import io
+
+import numpy as np
+import pytest
+from PIL import Image, ImageFilter
+
+from backend.app import ai, image_quality
+
+
+def _png(im: Image.Image) -> bytes:
+    buf = io.BytesIO()
+    im.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def _texture(side: int, low: int = 40, high: int = 215, seed: int = 1) -> Image.Image:
+    """Mid-grey noise: lots of edges, no clipping."""
+    px = np.random.default_rng(seed).integers(low, high, size=(side, side, 3), dtype=np.uint8)
+    return Image.fromarray(px, "RGB")
+
+
+SHARP = _png(_texture(800))
+BLURRED = _png(_texture(800).filter(ImageFilter.GaussianBlur(12)))
+DARK = _png(_texture(800, 0, 12))
+BLOWN_OUT = _png(_texture(800, 248, 256))
+TINY = _png(_texture(150))
+MEDIUM = _png(_texture(400))
+
+
+@pytest.mark.parametrize("image, decision, reason", [
+    (SHARP, "accept", None),
+    (BLURRED, "reject", "blurry"),
+    (DARK, "reject", "too dark"),
+    (BLOWN_OUT, "reject", "overexposed"),
+    (TINY, "reject", "resolution too low"),
+    (MEDIUM, "borderline", None),
+])
+def test_assess_thresholds(image, decision, reason):
+    report = image_quality.assess(image)
+    assert report["decision"] == decision
+    if reason:
+        assert reason in report["reasons"]
+    else:
+        assert report["reasons"] == []
+
+
+def test_metrics_track_the_thresholds():
+    sharp, blurred = image_quality.assess(SHARP), image_quality.assess(BLURRED)
+    assert sharp["blur_variance"] >= image_quality.BLUR_ACCEPT
+    assert blurred["blur_variance"] < image_quality.BLUR_REJECT
+    assert sharp["score"] > image_quality.assess(MEDIUM)["score"] > blurred["score"]
+    assert (sharp["width"], sharp["height"]) == (800, 800)
+
+
+def test_check_image_quality_decides_clear_cases_locally(monkeypatch):
+    async def no_model(*args, **kwargs):
+        raise AssertionError("clear cases must not reach the model")
+
+    monkeypatch.setattr(ai, "_get_text_response", no_model)
+    assert asyncio.run(ai.check_image_quality(SHARP)) == "APPROVE"
+    assert asyncio.run(ai.check_image_quality(BLURRED)) == "REJECT_QUALITY_ISSUE"
+    # Bytes that don't decode as an image are rejected, not waved through.
+    assert asyncio.run(ai.check_image_quality(b"not an image")) == "REJECT_QUALITY_ISSUE"
+
+
+def test_borderline_falls_back_to_local_score(monkeypatch):
+    async def unavailable(*args, **kwargs):
+        return ""
+
+    monkeypatch.setattr(ai, "_get_text_response", unavailable)
+    expected = "APPROVE" if image_quality.assess(MEDIUM)["score"] >= 0.5 else "REJECT_QUALITY_ISSUE"
+    assert asyncio.run(ai.check_image_quality(MEDIUM)) == expected
+
+
+def test_assess_many_marks_unreadable_images():
+    reports = image_quality.assess_many([SHARP, b"garbage", DARK])
+    assert [r["decision"] for r in reports] == ["accept", "reject", "reject"]
+    assert reports[1]["reasons"] == ["unreadable image"]
@@ -0,0 +1,57 @@
+# backend/tests/test_images.py
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+
+@pytest.fixture
+def artwork_image(client):
+    for d, name in (("artworks", "img-test.jpg"), ("proofs", "img-test-proof.jpg")):
+        Path("static", d).mkdir(parents=True, exist_ok=True)
+        Image.new("RGB", (400, 300), (200, 80, 40)).save(Path("static", d, name))
+    return "artworks/img-test.jpg"
+
+
+def test_resize_and_format_negotiation(client, artwork_image):
+    r = client.get(f"/img/100x100/{artwork_image}")
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "image/jpeg"
+    assert r.headers["vary"] == "Accept"
+    assert r.content[:3] == b"\xff\xd8\xff"
+
+    r = client.get(f"/img/100x0/{artwork_image}", headers={"Accept": "image/webp,image/*"})
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "image/webp"
+    assert r.content[:4] == b"RIFF" and r.content[8:12] == b"WEBP"
+
+
+def test_etag_revalidation(client, artwork_image):
+    first = client.get(f"/img/64x64/{artwork_image}")
+    etag = first.headers["etag"]
+    again = client.get(f"/img/64x64/{artwork_image}", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["etag"] == etag and not again.content
+    # A different size or format is a different representation.
+    assert client.get(f"/img/32x32/{artwork_image}", headers={"If-None-Match": etag}).status_code == 200
+    webp = client.get(f"/img/64x64/{artwork_image}", headers={"If-None-Match": etag, "Accept": "image/webp"})
+    assert webp.status_code == 200 and webp.headers["etag"] != etag
+
+
+@pytest.mark.parametrize("path", [
+    "proofs/img-test-proof.jpg",
+    "artworks/%2E%2E/proofs/img-test-proof.jpg",
+    "artworks/..%2Fproofs/img-test-proof.jpg",
+    "%2E%2E/%2E%2E/etc/passwd.jpg",
+    "artworks/missing.jpg",
+])
+def test_only_catalog_images_are_served(client, artwork_image, path):
+    assert client.get(f"/img/100x100/{path}").status_code == 404
+
+
+def test_rejects_bad_sizes_and_non_images(client, artwork_image):
+    Path("static/artworks/notes.txt").write_text("hi")
+    assert client.get(f"/img/abc/{artwork_image}").status_code == 400
+    assert client.get(f"/img/0x0/{artwork_image}").status_code == 400
+    assert client.get(f"/img/9999x10/{artwork_image}").status_code == 400
+    assert client.get("/img/100x100/artworks/notes.txt").status_code == 415
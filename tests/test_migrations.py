@@ -0,0 +1,83 @@
+# backend/tests/test_migrations.py
+import pytest
+from sqlalchemy import text
+
+from backend.app import database, migrations
+
+# Schema as created by the original create_all(), before schema_version existed.
+LEGACY_SCHEMA = [
+    "CREATE TABLE users (id INTEGER PRIMARY KEY, username VARCHAR NOT NULL, email VARCHAR, "
+    "password VARCHAR NOT NULL, role VARCHAR)",
+    "CREATE TABLE artworks (id INTEGER PRIMARY KEY, title VARCHAR NOT NULL, description TEXT, "
+    "price FLOAT NOT NULL, image_url VARCHAR, owner_id INTEGER REFERENCES users(id))",
+    "CREATE TABLE orders (id INTEGER PRIMARY KEY, customer_id INTEGER REFERENCES users(id), "
+    "artwork_id INTEGER REFERENCES artworks(id), quantity INTEGER, status VARCHAR)",
+    "INSERT INTO users (id, username, password, role) VALUES (1, 'maker', 'x', 'seller'), (2, 'buyer', 'x', 'customer')",
+    "INSERT INTO artworks (id, title, description, price, image_url, owner_id) VALUES "
+    "(1, 'Madhubani peacock', 'hand painted', 40.0, '/static/artworks/a.jpg', 1), "
+    "(2, 'Clay lamp', NULL, 5.0, 'https://example.com/b.jpg', 1)",
+    "INSERT INTO orders (customer_id, artwork_id, quantity, status) VALUES (2, 1, 2, 'pending'), (2, 2, 3, 'shipped')",
+]
+
+
+@pytest.fixture
+def legacy_engine(tmp_path, monkeypatch):
+    engine = database._make_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        for stmt in LEGACY_SCHEMA:
+            conn.execute(text(stmt))
+    monkeypatch.setattr(migrations, "engine", engine)
+    yield engine
+    engine.dispose()
+
+
+def _indexes(conn, table):
+    return {r[1] for r in conn.execute(text(f"PRAGMA index_list({table})"))}
+
+
+def test_upgrade_legacy_database(legacy_engine):
+    assert migrations.current_version() == 0
+    assert migrations.upgrade() == [v for v, _, _ in migrations.STEPS]
+    assert migrations.current_version() == migrations.LATEST
+
+    with legacy_engine.connect() as conn:
+        assert {"phone_number", "geohash", "verification_status"} <= migrations._columns(conn, "users")
+        assert {"enrichment_status", "visual_features"} <= migrations._columns(conn, "artworks")
+        orders = conn.execute(
+            text("SELECT artwork_id, seller_id, unit_price, created_at FROM orders ORDER BY artwork_id")
+        ).all()
+        assert [(o.artwork_id, o.seller_id, o.unit_price) for o in orders] == [(1, 1, 40.0), (2, 1, 5.0)]
+        assert all(o.created_at for o in orders)
+        rollup = conn.execute(
+            text("SELECT status, SUM(orders), SUM(units), SUM(revenue) FROM sales_rollups GROUP BY status ORDER BY status")
+        ).all()
+        assert [tuple(r) for r in rollup] == [("pending", 1, 2, 80.0), ("shipped", 1, 3, 15.0)]
+        hits = conn.execute(text("SELECT rowid FROM artworks_fts WHERE artworks_fts MATCH 'peacock'")).all()
+        assert [r[0] for r in hits] == [1]
+        # Only the local image gets a feature backfill job.
+        jobs = conn.execute(text("SELECT kind, payload FROM jobs")).all()
+        assert [j.kind for j in jobs] == ["artwork_features"] and '"artwork_id":1' in jobs[0].payload.replace(" ", "")
+
+
+def test_upgrade_is_a_noop_when_current(legacy_engine):
+    migrations.upgrade()
+    with legacy_engine.connect() as conn:
+        applied = conn.execute(text("SELECT version, applied_at FROM schema_version ORDER BY version")).all()
+        jobs = conn.execute(text("SELECT COUNT(*) FROM jobs")).scalar()
+
+    assert migrations.upgrade() == []
+    with legacy_engine.connect() as conn:
+        assert conn.execute(text("SELECT version, applied_at FROM schema_version ORDER BY version")).all() == applied
+        assert conn.execute(text("SELECT COUNT(*) FROM jobs")).scalar() == jobs
+
+
+def test_sales_rollups_step_drops_summary_index(legacy_engine):
+    migrations.upgrade(target=8)
+    with legacy_engine.connect() as conn:
+        assert "ix_orders_seller_summary" in _indexes(conn, "orders")
+
+    assert migrations.upgrade() == [9, 10]
+    with legacy_engine.connect() as conn:
+        indexes = _indexes(conn, "orders")
+    assert "ix_orders_seller_summary" not in indexes
+    assert {"ix_orders_seller_id_id", "ix_orders_customer_id_id"} <= indexes
@@ -0,0 +1,71 @@
+# backend/tests/test_pagination.py
+import base64
+import json
+
+import pytest
+
+import backend.app.models as models
+from backend.app.pagination import encode_cursor
+
+PRICES = [5.0, 10.0, 5.0, 2.0, 5.0, 10.0, 5.0, 2.0, 5.0, 10.0]
+
+
+@pytest.fixture
+def catalog(db, make_user):
+    seller, _ = make_user("seller")
+    arts = [models.Artwork(title=f"tie {i}", price=p, owner_id=seller.id) for i, p in enumerate(PRICES)]
+    db.add_all(arts)
+    db.commit()
+    return seller.id, [(a.id, a.price) for a in arts]
+
+
+def _walk(client, owner_id, sort, limit):
+    ids, cursor, pages = [], None, 0
+    while True:
+        params = {"owner_id": owner_id, "sort": sort, "limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        r = client.get("/artworks/", params=params)
+        assert r.status_code == 200
+        body = r.json()
+        ids += [a["id"] for a in body["items"]]
+        pages += 1
+        cursor = body["next_cursor"]
+        if not cursor:
+            return ids, pages
+
+
+@pytest.mark.parametrize("sort", ["price_asc", "price_desc"])
+def test_price_ties_across_page_boundaries(client, catalog, sort):
+    owner_id, rows = catalog
+    desc = sort == "price_desc"
+    expected = [i for i, _ in sorted(rows, key=lambda r: (r[1], r[0]), reverse=desc)]
+    # Page size 3 cuts through the run of five 5.0 prices twice.
+    ids, pages = _walk(client, owner_id, sort, limit=3)
+    assert ids == expected
+    assert pages == 4
+
+
+def test_newest_pages_cover_every_row_once(client, catalog):
+    owner_id, rows = catalog
+    ids, _ = _walk(client, owner_id, "newest", limit=4)
+    assert ids == sorted((i for i, _ in rows), reverse=True)
+
+
+def _b64(obj) -> str:
+    return base64.urlsafe_b64encode(json.dumps(obj).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("sort, cursor", [
+    ("newest", "not-a-cursor!"),
+    ("newest", _b64([1, 2])),
+    ("newest", _b64({"sort": "newest", "id": "7"})),
+    ("newest", encode_cursor(sort="price_asc", id=3, price=5.0)),
+    ("price_asc", encode_cursor(sort="price_desc", id=3, price=5.0)),
+    ("price_desc", encode_cursor(sort="newest", id=3)),
+    ("price_asc", encode_cursor(sort="price_asc", id=3)),
+    ("price_asc", encode_cursor(sort="price_asc", id=3, price="5")),
+])
+def test_tampered_or_mismatched_cursor_is_rejected(client, sort, cursor):
+    r = client.get("/artworks/", params={"sort": sort, "cursor": cursor})
+    assert r.status_code == 400
@@ -0,0 +1,100 @@
+# backend/tests/test_resilience.py
+import time
+import asyncio
+import threading
+
+from backend.app import ai
+from backend.app.resilience import CircuitBreaker, HALF_OPEN, OPEN
+
+
+def _half_open(breaker: CircuitBreaker):
+    breaker.state = OPEN
+    breaker.opened_at = time.monotonic() - breaker.reset_timeout
+
+
+def test_cancelled_half_open_probe_is_released(monkeypatch):
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.05)
+    monkeypatch.setattr(ai, "_provider", lambda: "web")
+    monkeypatch.setitem(ai._breakers, "web", breaker)
+
+    async def hang(provider, parts, timeout):
+        await asyncio.sleep(60)
+
+    monkeypatch.setattr(ai, "_attempt", hang)
+
+    async def scenario():
+        _half_open(breaker)
+        task = asyncio.create_task(ai._get_text_response(["hi"], timeout=30))
+        await asyncio.sleep(0.01)
+        assert breaker.state == HALF_OPEN and breaker._probing
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(scenario())
+    assert breaker.state == HALF_OPEN
+    time.sleep(breaker.reset_timeout)
+    assert breaker.allow() is True
+
+
+def test_probe_verdicts_still_apply():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.0)
+    _half_open(breaker)
+    assert breaker.allow() is True
+    assert breaker.allow() is False
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.allow() is True
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_abandoned_stream_releases_probe(monkeypatch):
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.05)
+    monkeypatch.setattr(ai, "_provider", lambda: "web")
+    monkeypatch.setitem(ai._breakers, "web", breaker)
+
+    def slow_stream(provider, parts, timeout, emit, stop):
+        emit("partial")
+        stop.wait(5)
+
+    monkeypatch.setattr(ai, "_stream_sync", slow_stream)
+
+    async def scenario():
+        _half_open(breaker)
+        stream = ai._stream_text_response(["hi"], timeout=5)
+        assert await stream.__anext__() == "partial"
+        assert breaker._probing
+        await stream.aclose()  # what Starlette does when the SSE client disconnects
+
+    asyncio.run(scenario())
+    assert breaker.state == HALF_OPEN
+    time.sleep(breaker.reset_timeout)
+    assert breaker.allow() is True
+
+
+def test_timed_out_call_holds_slot_until_thread_returns(monkeypatch):
+    monkeypatch.setattr(ai, "_provider", lambda: "web")
+    monkeypatch.setitem(ai._breakers, "web", CircuitBreaker("test", failure_threshold=5))
+    monkeypatch.setitem(ai._semaphores, "web", asyncio.Semaphore(1))
+    done = threading.Event()
+
+    def stuck(provider, parts, timeout):
+        done.wait(5)
+        return "late"
+
+    monkeypatch.setattr(ai, "_generate_sync", stuck)
+
+    async def scenario():
+        assert await ai._get_text_response(["hi"], timeout=0.05) == ""
+        assert ai._semaphores["web"].locked()  # worker thread is still running
+        done.set()
+        for _ in range(100):
+            if not ai._semaphores["web"].locked():
+                break
+            await asyncio.sleep(0.01)
+        assert not ai._semaphores["web"].locked()
+
+    asyncio.run(scenario())
@@ -0,0 +1,77 @@
+# backend/tests/test_rollups.py
+import random
+
+from sqlalchemy import text
+
+import backend.app.models as models
+from backend.app import rollups
+from backend.app.database import engine
+
+
+def _snapshot(seller_ids):
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text(
+                "SELECT seller_id, day, artwork_id, status, orders, units, revenue FROM sales_rollups "
+                "WHERE seller_id IN (:a, :b) AND (orders != 0 OR units != 0)"
+            ),
+            dict(zip("ab", seller_ids)),
+        )
+        return sorted((*r[:6], round(r[6], 6)) for r in rows)
+
+
+def test_incremental_rollups_match_rebuild(client, db, make_user):
+    seller1, h1 = make_user("seller")
+    seller2, h2 = make_user("seller")
+    _, customer = make_user("customer")
+    arts = [
+        models.Artwork(title="a", price=10.0, owner_id=seller1.id),
+        models.Artwork(title="b", price=25.5, owner_id=seller1.id),
+        models.Artwork(title="c", price=7.0, owner_id=seller2.id),
+    ]
+    db.add_all(arts)
+    db.commit()
+    owner_headers = {seller1.id: h1, seller2.id: h2}
+
+    rnd = random.Random(7)
+    orders = []
+    for _ in range(40):
+        art = rnd.choice(arts)
+        r = client.post(f"/orders/?artwork_id={art.id}&quantity={rnd.randint(1, 4)}", headers=customer)
+        assert r.status_code == 200
+        orders.append((r.json()["id"], owner_headers[art.owner_id]))
+
+    # A later price change must not touch orders already placed.
+    arts[0].price = 99.0
+    db.commit()
+
+    for order_id, headers in rnd.sample(orders, 10):
+        assert client.post(f"/orders/{order_id}/update_status?status=cancelled", headers=customer).status_code == 200
+    for _ in range(60):
+        order_id, headers = rnd.choice(orders)
+        status = rnd.choice(["pending", "confirmed", "shipped", "delivered", "cancelled"])
+        assert client.post(f"/orders/{order_id}/update_status?status={status}", headers=headers).status_code == 200
+
+    incremental = _snapshot((seller1.id, seller2.id))
+    assert incremental
+    with engine.begin() as conn:
+        rollups.rebuild(conn)
+    assert _snapshot((seller1.id, seller2.id)) == incremental
+
+
+def test_customer_cannot_move_rollups_beyond_cancel(client, make_user, db):
+    seller, _ = make_user("seller")
+    _, customer = make_user("customer")
+    art = models.Artwork(title="d", price=5.0, owner_id=seller.id)
+    db.add(art)
+    db.commit()
+    order_id = client.post(f"/orders/?artwork_id={art.id}&quantity=2", headers=customer).json()["id"]
+
+    assert client.post(f"/orders/{order_id}/update_status?status=delivered", headers=customer).status_code == 403
+    assert client.post(f"/orders/?artwork_id={art.id}&quantity=0", headers=customer).status_code == 422
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text("SELECT status, orders, units, revenue FROM sales_rollups WHERE seller_id = :s AND orders != 0"),
+            {"s": seller.id},
+        ).all()
+    assert [tuple(r) for r in rows] == [("pending", 1, 2, 10.0)]
@@ -0,0 +1,78 @@
+# backend/tests/test_search.py
+import backend.app.models as models
+from backend.app import search as fts
+
+
+def _hits(client, q, scope="artworks", headers=None):
+    r = client.get("/search/", params={"q": q, "scope": scope}, headers=headers or {})
+    assert r.status_code == 200
+    return r.json()[scope]
+
+
+def test_match_expression():
+    assert fts.match_expression("blue terra") == '"blue" "terra"*'
+    assert fts.match_expression("pot of") == '"pot" "of"'
+    assert fts.match_expression('"; DROP TABLE artworks --') == '"DROP" "TABLE" "artworks"*'
+    assert fts.match_expression("  !!  ") is None
+
+
+def test_triggers_follow_insert_update_delete(client, db):
+    art = models.Artwork(title="Zarbino peacock", description="hand painted on silk", price=12.0)
+    db.add(art)
+    db.commit()
+    assert [h["id"] for h in _hits(client, "zarbino")] == [art.id]
+    assert _hits(client, "zarb")[0]["id"] == art.id  # last word is a prefix
+
+    art.title = "Quendril peacock"
+    db.commit()
+    assert _hits(client, "zarbino") == []
+    assert [h["id"] for h in _hits(client, "quendril")] == [art.id]
+
+    # Columns outside the index don't disturb it.
+    art.price = 15.0
+    art.image_status = "ready"
+    db.commit()
+    assert [h["id"] for h in _hits(client, "quendril silk")] == [art.id]
+
+    db.delete(art)
+    db.commit()
+    assert _hits(client, "quendril") == []
+
+
+def test_highlight_and_snippet_are_escaped(client, db):
+    art = models.Artwork(
+        title="<b>Velmora</b> café lamp",
+        description="A lamp shaped by hand. " * 5 + "Glazed in velmora blue & gold.",
+        price=30.0,
+    )
+    db.add(art)
+    db.commit()
+
+    (hit,) = _hits(client, "velmora cafe")  # diacritics are folded
+    assert hit["title"] == "&lt;b&gt;<mark>Velmora</mark>&lt;/b&gt; <mark>café</mark> lamp"
+    assert "<mark>velmora</mark> blue &amp; gold" in hit["snippet"]
+    assert "…" in hit["snippet"]
+
+
+def test_title_hits_rank_above_description_hits(client, db):
+    in_title = models.Artwork(title="Ostrivan bowl", description="clay", price=1.0)
+    in_text = models.Artwork(title="Plain bowl", description="an ostrivan glaze", price=1.0)
+    db.add_all([in_text, in_title])
+    db.commit()
+    assert [h["id"] for h in _hits(client, "ostrivan")] == [in_title.id, in_text.id]
+
+
+def test_requests_index_and_pending_artworks(client, db, make_user):
+    seller, seller_h = make_user("seller")
+    req = models.ArtRequest(title="Need a Brindlewick mural", description="for a cafe wall")
+    art = models.Artwork(title="Brindlewick mural", price=5.0, owner_id=seller.id, enrichment_status="pending_enrichment")
+    db.add_all([req, art])
+    db.commit()
+
+    assert [h["id"] for h in _hits(client, "brindlewick", "requests")] == [req.id]
+    assert _hits(client, "brindlewick") == []
+    assert [h["id"] for h in _hits(client, "brindlewick", headers=seller_h)] == [art.id]
+
+    req.description = "for a bakery wall"
+    db.commit()
+    assert _hits(client, "brindlewick bakery", "requests")[0]["snippet"].count("<mark>") == 1
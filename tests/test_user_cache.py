@@ -0,0 +1,89 @@
+# backend/tests/test_user_cache.py
+import io
+import time
+
+from PIL import Image
+
+from backend.app.user_cache import UserCache, UserSnapshot, cache as user_cache
+
+
+def _snapshot(user_id: int, **kw) -> UserSnapshot:
+    fields = dict(
+        id=user_id, username=f"u{user_id}", role="seller", is_verified=False, verification_status="pending",
+        phone_number=None, email=None, preferred_language="en", proof_url=None,
+        latitude=None, longitude=None, address=None,
+    )
+    return UserSnapshot(**{**fields, **kw})
+
+
+def test_entries_expire_with_ttl_or_token():
+    cache = UserCache(ttl=60)
+    cache.put("long", _snapshot(1))
+    cache.put("short", _snapshot(1), token_exp=time.time() - 1)
+    assert cache.get("long").id == 1
+    assert cache.get("short") is None
+    assert cache.stats["expired"] == 1
+
+
+def test_invalidate_user_drops_all_their_tokens():
+    cache = UserCache()
+    cache.put("a", _snapshot(1))
+    cache.put("b", _snapshot(1))
+    cache.put("c", _snapshot(2))
+    cache.invalidate_user(1)
+    assert cache.get("a") is None and cache.get("b") is None
+    assert cache.get("c").id == 2
+
+
+def test_lru_eviction():
+    cache = UserCache(max_entries=2)
+    cache.put("a", _snapshot(1))
+    cache.put("b", _snapshot(2))
+    cache.get("a")
+    cache.put("c", _snapshot(3))
+    assert cache.get("b") is None
+    assert cache.get("a") and cache.get("c")
+    assert cache.stats["evictions"] == 1
+
+
+def _token(headers) -> str:
+    return headers["Authorization"].split(" ", 1)[1]
+
+
+def _cached(client, headers) -> UserSnapshot:
+    client.get("/orders/sales", headers=headers)
+    return user_cache.get(_token(headers))
+
+
+def test_admin_verify_and_reject_invalidate(client, make_user):
+    seller, seller_h = make_user("seller", is_verified=False, verification_status="pending")
+    _, admin_h = make_user("admin")
+    assert _cached(client, seller_h).is_verified is False
+
+    assert client.post(f"/admin/verify/{seller.id}", headers=admin_h).status_code == 200
+    assert user_cache.get(_token(seller_h)) is None
+    snap = _cached(client, seller_h)
+    assert (snap.is_verified, snap.verification_status) == (True, "verified")
+
+    assert client.post(f"/admin/reject/{seller.id}", headers=admin_h).status_code == 200
+    assert user_cache.get(_token(seller_h)) is None
+    snap = _cached(client, seller_h)
+    assert (snap.is_verified, snap.verification_status) == (False, "rejected")
+
+
+def test_proof_upload_invalidates(client, make_user):
+    seller, seller_h = make_user("seller")
+    assert _cached(client, seller_h).proof_url is None
+
+    buf = io.BytesIO()
+    Image.new("RGB", (32, 32), (10, 120, 200)).save(buf, format="PNG")
+    r = client.post(
+        "/seller/upload_additional_proof",
+        headers=seller_h,
+        files={"file": ("gst.png", buf.getvalue(), "image/png")},
+    )
+    assert r.status_code == 200
+    assert user_cache.get(_token(seller_h)) is None
+    snap = _cached(client, seller_h)
+    assert snap.proof_url == r.json()["proof_url"]
+    assert snap.verification_status == "pending"
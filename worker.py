@@ -0,0 +1,34 @@
+# backend/worker.py
+"""
+Standalone background-job worker:
+
+    python -m backend.worker [--concurrency N]
+
+Runs the same handlers as the in-process workers started by main.py; set
+JOB_WORKERS=0 on the API when running these instead. Several worker
+processes can share one database: leases keep them from doubling up.
+"""
+import argparse
+import asyncio
+import logging
+import signal
+
+from backend.app import jobs, migrations, enrichment  # noqa: F401  (enrichment registers job handlers)
+
+
+async def main(concurrency: int):
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    logging.info("job worker started with %d slot(s); handlers: %s", concurrency, ", ".join(jobs.HANDLERS))
+    await asyncio.gather(*(jobs.work(stop) for _ in range(concurrency)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run background jobs from the jobs table")
+    parser.add_argument("--concurrency", type=int, default=4, help="jobs run at the same time")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    migrations.upgrade()  # no-op unless this worker starts before the API has migrated
+    asyncio.run(main(args.concurrency))